@@ -1,21 +1,30 @@
 import pygame
 import os
+import math
 import random
+from collections import OrderedDict
 from config import *
 
 class AssetManager:
     def __init__(self):
+        # Original images, never drawn directly
         self.characters = {}
         self.theme_assets = {}
         self.sounds = {}
         self.ui_images = {}
         self.items = {}
         
-    def load_all_assets(self):
+        # Sprite sets scaled for a tile size, most recently used last
+        self.sprite_cache = OrderedDict()
+        self.tile_size = TILE_SIZE
+        self.sprites = None
+        
+    def load_all_assets(self, tile_size=TILE_SIZE):
         self.load_characters()
         self.load_ui_images()
         self.load_sounds()
         self.load_items()
+        self.set_tile_size(tile_size)
         
     def load_characters(self):
         if not os.path.exists(CHARACTERS_DIR):
@@ -25,10 +34,7 @@ class AssetManager:
             if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
                 try:
                     path = os.path.join(CHARACTERS_DIR, filename)
-                    img = pygame.image.load(path).convert_alpha()
-                    # Scale to fit tile size
-                    img = pygame.transform.scale(img, (TILE_SIZE-10, TILE_SIZE-10))
-                    self.characters[filename] = img
+                    self.characters[filename] = pygame.image.load(path).convert_alpha()
                 except Exception as e:
                     print(f"Error loading character {filename}: {e}")
                     
@@ -42,8 +48,7 @@ class AssetManager:
         try:
             star_path = os.path.join(theme_path, "star.png")
             if os.path.exists(star_path):
-                star_img = pygame.image.load(star_path)
-                assets['star'] = pygame.transform.scale(star_img, (30, 30))
+                assets['star'] = pygame.image.load(star_path).convert_alpha()
             else:
                 star_surface = pygame.Surface((30, 30), pygame.SRCALPHA)
                 pygame.draw.circle(star_surface, (255, 215, 0), (15, 15), 12)
@@ -66,6 +71,7 @@ class AssetManager:
             pygame.draw.circle(star_surface, (255, 215, 0), (15, 15), 12)
             assets['star'] = star_surface
             assets['music'] = None
+            assets['items'] = []
         
         self.theme_assets[theme_name] = assets
         return assets
@@ -122,26 +128,111 @@ class AssetManager:
             if not os.path.exists(items_path):
                 continue
             item_images = []
-            for filename in os.listdir(items_path):
+            for filename in sorted(os.listdir(items_path)):
                 if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
                     try:
                         path = os.path.join(items_path, filename)
-                        img = pygame.image.load(path).convert_alpha()
-                        img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-                        item_images.append(img)
+                        item_images.append(pygame.image.load(path).convert_alpha())
                     except Exception as e:
                         print(f"Error loading item {filename} for theme {theme_name}: {e}")
             self.items[theme_name] = item_images       
 
+    def set_tile_size(self, tile_size):
+        # Called on window size changes only, never from the render path
+        self.tile_size = tile_size
+        if tile_size in self.sprite_cache:
+            self.sprite_cache.move_to_end(tile_size)
+        else:
+            self.sprite_cache[tile_size] = self.build_sprite_set(tile_size)
+            while len(self.sprite_cache) > DisplaySettings.SPRITE_CACHE_SIZE:
+                self.sprite_cache.popitem(last=False)
+        self.sprites = self.sprite_cache[tile_size]
+        return self.sprites
+    
+    def build_sprite_set(self, tile_size):
+        character_size = tile_size - max(2, tile_size // 8)
+        sprites = {
+            'characters': {name: pygame.transform.smoothscale(img, (character_size, character_size))
+                           for name, img in self.characters.items()},
+            'items': {theme_name: [pygame.transform.smoothscale(img, (tile_size, tile_size)) for img in images]
+                      for theme_name, images in self.items.items()},
+            'stars': {},
+            'walls': {},
+        }
+        for theme_name in THEMES:
+            sprites['stars'][theme_name] = self.build_star_frames(theme_name, tile_size)
+            sprites['walls'][theme_name] = self.build_wall_tiles(theme_name, tile_size)
+        return sprites
+    
+    def build_wall_tiles(self, theme_name, tile_size):
+        # One tile per neighbour bitmask: sides without a wall neighbour get a
+        # shaded edge, and corners between two such sides are rounded
+        theme = THEMES[theme_name]
+        blend = DisplaySettings.WALL_EDGE_BLEND
+        edge_color = tuple(int(w + (p - w) * blend) for w, p in zip(theme["wall"], theme["path"]))
+        border = max(1, tile_size // 10)
+        radius = tile_size // 3
+        tiles = []
+        for mask in range(WallEdge.TILE_COUNT):
+            north = not mask & WallEdge.NORTH
+            east = not mask & WallEdge.EAST
+            south = not mask & WallEdge.SOUTH
+            west = not mask & WallEdge.WEST
+            corners = {
+                'border_top_left_radius': radius if north and west else 0,
+                'border_top_right_radius': radius if north and east else 0,
+                'border_bottom_left_radius': radius if south and west else 0,
+                'border_bottom_right_radius': radius if south and east else 0,
+            }
+            surface = pygame.Surface((tile_size, tile_size))
+            surface.fill(theme["path"])
+            pygame.draw.rect(surface, edge_color, surface.get_rect(), **corners)
+            left, top = border * west, border * north
+            inner = pygame.Rect(left, top, tile_size - left - border * east, tile_size - top - border * south)
+            inner_corners = {name: max(0, value - border) if value else 0 for name, value in corners.items()}
+            pygame.draw.rect(surface, theme["wall"], inner, **inner_corners)
+            tiles.append(surface)
+        return tiles
+    
+    def build_star_frames(self, theme_name, tile_size):
+        # The pulsing star animation, pre-scaled once per tile size
+        star_img = self.get_theme_assets(theme_name)['star']
+        frames = []
+        for i in range(DisplaySettings.STAR_FRAMES):
+            scale_factor = 0.5 + 0.1 * math.sin(2 * math.pi * i / DisplaySettings.STAR_FRAMES)
+            size = max(1, int(tile_size * scale_factor))
+            frames.append(pygame.transform.smoothscale(star_img, (size, size)))
+        return frames
+    
+    def get_star_frame(self, theme_name, ticks):
+        frames = self.sprites['stars'][theme_name]
+        phase = (ticks * 0.01) % (2 * math.pi) / (2 * math.pi)
+        return frames[int(phase * len(frames)) % len(frames)]
+
+    def get_wall_tiles(self, theme_name):
+        return self.sprites['walls'][theme_name]
+
+    def get_item(self, theme_name, index):
+        return self.sprites['items'][theme_name][index]
+    
+    def get_item_count(self, theme_name):
+        return len(self.items.get(theme_name, []))
+
     def get_character(self, filename=None):
-        if not self.characters:
+        characters = self.sprites['characters'] if self.sprites else {}
+        if not characters:
             return None
             
-        if filename and filename in self.characters:
-            return self.characters[filename]
+        if filename and filename in characters:
+            return characters[filename]
         
         # Random character
-        return random.choice(list(self.characters.values()))
+        return random.choice(list(characters.values()))
+    
+    def get_random_character_name(self):
+        if not self.characters:
+            return None
+        return random.choice(list(self.characters))
     
     def get_all_characters(self):
         return [(img, name) for name, img in self.characters.items()]
@@ -170,4 +261,4 @@ class AssetManager:
                 return True
             except Exception as e:
                 print(f"Error playing music: {e}")
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,102 @@
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CameraSettings, HandGestureSettings
+from controllers.blob_tracker import INDEX_FINGER_TIP
+from controllers.gesture_prediction import evaluate_trace, combine
+from game.replay import InputReplayer
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+def load_trace(filename, width, height):
+    # Fingertip per camera frame from a log recorded with --record-landmarks;
+    # ticks of the same frame share a timestamp and are folded together
+    points = []
+    last_timestamp = None
+    for frame_input in InputReplayer(filename):
+        if frame_input.timestamp == last_timestamp:
+            continue
+        last_timestamp = frame_input.timestamp
+        if frame_input.landmarks:
+            x, y, _ = frame_input.landmarks[INDEX_FINGER_TIP]
+            points.append((frame_input.timestamp, x * width, y * height))
+        else:
+            points.append(None)
+    return points
+
+
+def synthetic_trace(rng, width, height, gestures=200, fps=CameraSettings.FPS, jitter=3.0):
+    # Minimum-jerk reaches out of the center and back, with some feints that
+    # stop short of the threshold and should never produce a move
+    points = []
+    t = 0.0
+    frame_time = 1.0 / fps
+    threshold = HandGestureSettings.MOVEMENT_THRESHOLD
+
+    def segment(start, end, duration):
+        nonlocal t
+        steps = max(1, int(duration * fps))
+        for i in range(1, steps + 1):
+            s = i / steps
+            ease = 10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5
+            x = start[0] + (end[0] - start[0]) * ease + rng.gauss(0, jitter)
+            y = start[1] + (end[1] - start[1]) * ease + rng.gauss(0, jitter)
+            t += frame_time
+            points.append((t, width / 2 + x, height / 2 + y))
+
+    rest = (0.0, 0.0)
+    segment(rest, rest, 0.5)
+    for _ in range(gestures):
+        dx, dy = rng.choice(DIRECTIONS)
+        feint = rng.random() < 0.2
+        reach = threshold * (rng.uniform(0.4, 0.8) if feint else rng.uniform(1.8, 3.0))
+        target = (dx * reach + rng.gauss(0, 10), dy * reach + rng.gauss(0, 10))
+        segment(rest, target, rng.uniform(0.2, 0.45))
+        segment(target, target, rng.uniform(0.1, 0.4))
+        segment(target, rest, rng.uniform(0.25, 0.5))
+        segment(rest, rest, rng.uniform(0.3, 0.6))
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency saved and false moves of predictive gesture input")
+    parser.add_argument("logs", nargs="*", help="input logs recorded with --record --record-landmarks")
+    parser.add_argument("--width", type=int, default=CameraSettings.WIDTH, help="camera width used when recording")
+    parser.add_argument("--height", type=int, default=CameraSettings.HEIGHT, help="camera height used when recording")
+    parser.add_argument("--gestures", type=int, default=200, help="synthetic gestures when no log is given")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    args = parser.parse_args()
+
+    if args.logs:
+        traces = {log: load_trace(log, args.width, args.height) for log in args.logs}
+    else:
+        rng = random.Random(args.seed)
+        traces = {"synthetic": synthetic_trace(rng, args.width, args.height, args.gestures)}
+
+    results = {}
+    predictors = []
+    for name, points in traces.items():
+        predictor = evaluate_trace(points, args.width, args.height)
+        predictors.append(predictor)
+        results[name] = predictor.get_stats()
+    if len(predictors) > 1:
+        results["total"] = combine(predictors).get_stats()
+
+    for name, stats in results.items():
+        print(f"{name}: {stats['confirmed']}/{stats['reactive_commits']} moves predicted, "
+              f"{stats['mean_saved_ms']:.0f} ms saved on average (p50 {stats['p50_saved_ms']:.0f} ms), "
+              f"false-move rate {stats['false_move_rate'] * 100:.1f}%")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
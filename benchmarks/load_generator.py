@@ -0,0 +1,165 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import NetworkSettings, MAZE_FILE
+from net import protocol
+from net.server import GameServer
+
+DIRECTIONS = [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+class BotStats:
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.bytes_in = defaultdict(int)
+        self.bytes_out = 0
+        self.snapshots = 0
+
+
+async def run_bot(host, port, stats, deadline, rng, input_interval):
+    # A bot wanders randomly, changing direction every input_interval seconds
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    join = protocol.encode_join()
+    writer.write(join)
+    stats.bytes_out += len(join)
+
+    async def send_inputs():
+        while True:
+            data = protocol.encode_input(*rng.choice(DIRECTIONS))
+            writer.write(data)
+            stats.bytes_out += len(data)
+            await asyncio.sleep(input_interval * (0.5 + rng.random()))
+
+    sender = asyncio.create_task(send_inputs())
+    room_id = None
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            header = await asyncio.wait_for(reader.readexactly(protocol.FRAME.size), remaining)
+            (length,) = protocol.FRAME.unpack(header)
+            payload = await reader.readexactly(length)
+            if payload[:1] == protocol.WELCOME_TAG:
+                room_id = protocol.WELCOME.unpack(payload)[2]
+            elif payload[:1] == protocol.SNAPSHOT_TAG:
+                stats.snapshots += 1
+            if room_id is not None:
+                stats.bytes_in[room_id] += len(header) + length
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        sender.cancel()
+        writer.close()
+
+
+async def run_load(args):
+    server = None
+    server_task = None
+    host, port = args.host, args.port
+    if not args.external:
+        server = GameServer(host, 0, args.mazes)
+        server_task = asyncio.create_task(server.serve(report=False))
+        await server.started.wait()
+        port = server.port
+
+    stats = BotStats()
+    rng = random.Random(args.seed)
+    ramp_end = time.perf_counter() + args.ramp
+    deadline = ramp_end + args.duration
+    bots = []
+    for i in range(args.bots):
+        bots.append(asyncio.create_task(run_bot(host, port, stats, deadline, random.Random(rng.random()),
+                                                args.input_interval)))
+        # Spread connects over the ramp so accepts don't all land at once
+        await asyncio.sleep(args.ramp / args.bots)
+
+    # Measure only once every bot is in
+    measure_start = time.perf_counter()
+    bytes_at_start = sum(stats.bytes_in.values())
+    server_bytes_at_start = server.get_stats()["bytes_sent"] if server else 0
+    for room in (server.rooms.values() if server else []):
+        room.tick_ms.clear()
+    await asyncio.gather(*bots)
+    elapsed = time.perf_counter() - measure_start
+
+    report = {
+        "bots": args.bots,
+        "connected": stats.connected,
+        "failed": stats.failed,
+        "seconds": elapsed,
+        "snapshots_received": stats.snapshots,
+        "rooms_seen": len(stats.bytes_in),
+        "downstream_bytes_per_s": (sum(stats.bytes_in.values()) - bytes_at_start) / elapsed,
+        "upstream_bytes_per_s": stats.bytes_out / (elapsed + args.ramp),
+    }
+    if stats.bytes_in:
+        report["downstream_bytes_per_room_per_s"] = report["downstream_bytes_per_s"] / len(stats.bytes_in)
+    if server:
+        server_stats = server.get_stats()
+        report["server"] = server_stats
+        report["server_bytes_per_room_per_s"] = ((server_stats["bytes_sent"] - server_bytes_at_start)
+                                                 / max(1, server_stats["rooms"]) / elapsed)
+        server_task.cancel()
+    return report
+
+
+def raise_file_limit(needed):
+    # Every bot costs one descriptor, two when the server runs in-process
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate bot clients against the race server")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to measure after the ramp")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which bots connect")
+    parser.add_argument("--input-interval", type=float, default=0.5, help="mean seconds between bot inputs")
+    parser.add_argument("--external", action="store_true", help="use a running server instead of an in-process one")
+    parser.add_argument("--host", default=NetworkSettings.HOST)
+    parser.add_argument("--port", type=int, default=NetworkSettings.PORT)
+    parser.add_argument("--mazes", default=MAZE_FILE)
+    parser.add_argument("--output", metavar="FILE", help="write the report as JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    raise_file_limit(args.bots * 2 + 64)
+    report = asyncio.run(run_load(args))
+
+    print(f"{report['connected']}/{report['bots']} bots connected over {report['seconds']:.1f} s, "
+          f"{report['rooms_seen']} rooms")
+    if "downstream_bytes_per_room_per_s" in report:
+        print(f"downstream {report['downstream_bytes_per_s'] / 1024:.1f} KiB/s total, "
+              f"{report['downstream_bytes_per_room_per_s'] / 1024:.2f} KiB/s per room; "
+              f"upstream {report['upstream_bytes_per_s'] / 1024:.1f} KiB/s")
+    if "server" in report:
+        server = report["server"]
+        print(f"server tick {server['room_tick_ms_mean']:.3f} ms/room mean, {server['room_tick_ms_max']:.3f} ms max, "
+              f"{server['late_ticks']} late ticks")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# Benchmarks never need a real window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pygame
+from config import TileType, THEMES, WIDTH, HEIGHT, CameraSettings
+from game.maze import Maze, MazeLoader
+from game.particles import ParticleSystem
+from game.ui import UI
+from assets.asset_manager import AssetManager
+
+DRAW_SIZES = [(10, 9), (100, 100), (1000, 1000)]
+
+
+def generate_maze_data(width, height, rng):
+    data = [[TileType.WALL] * width for _ in range(height)]
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            roll = rng.random()
+            if roll < 0.05:
+                data[y][x] = TileType.STAR
+            elif roll < 0.7:
+                data[y][x] = TileType.PATH
+    data[1][1] = TileType.START
+    data[height - 2][width - 2] = TileType.GOAL
+    return data
+
+
+def write_maze_pack(filename, count, width, height, rng):
+    with open(filename, "w") as f:
+        for _ in range(count):
+            f.write("#\n")
+            for row in generate_maze_data(width, height, rng):
+                f.write(" ".join(map(str, row)) + "\n")
+            f.write("\n")
+
+
+def measure(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples, ops_per_sample=1):
+    ms = np.array(samples) * 1000.0
+    return {
+        "samples": len(samples),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "ops_per_second": float(ops_per_sample * len(samples) / (ms.sum() / 1000.0)) if ms.sum() > 0 else None,
+    }
+
+
+def bench_draw_maze(results, rng, quick):
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    asset_manager = AssetManager()
+    asset_manager.load_all_assets()
+    ui = UI(screen, asset_manager)
+    theme_name = "forest"
+    theme = THEMES[theme_name]
+    
+    for width, height in DRAW_SIZES:
+        maze = Maze(generate_maze_data(width, height, rng))
+        maze.generate_item_positions(theme_name, asset_manager, rng)
+        cells = width * height
+        repeat = 3 if cells >= 1000000 else (20 if cells >= 10000 else 200)
+        if quick:
+            repeat = max(2, repeat // 10)
+        results[f"draw_maze_{width}x{height}"] = summarize(
+            measure(lambda: ui.draw_maze(maze, theme, theme_name), repeat, warmup=0 if cells >= 1000000 else 1))
+
+
+def bench_load_mazes(results, rng, quick):
+    count, size = (50, 40) if quick else (500, 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "pack.txt")
+        write_maze_pack(filename, count, size, size, rng)
+        results[f"load_mazes_{count}x{size}x{size}"] = summarize(
+            measure(lambda: MazeLoader.load_mazes_from_file(filename), 3 if quick else 10))
+
+
+def bench_maze_queries(results, rng, quick):
+    maze = Maze(generate_maze_data(200, 200, rng))
+    coords = [(rng.randrange(-1, 201), rng.randrange(-1, 201)) for _ in range(10000)]
+    repeat = 5 if quick else 50
+    
+    def can_move():
+        can_move_to = maze.can_move_to
+        for x, y in coords:
+            can_move_to(x, y)
+    
+    def has_star():
+        has_star_at = maze.has_star_at
+        for x, y in coords:
+            has_star_at(x, y)
+    
+    results["maze_can_move_to_x10000"] = summarize(measure(can_move, repeat), len(coords))
+    results["maze_has_star_at_x10000"] = summarize(measure(has_star, repeat), len(coords))
+
+
+def bench_particles(results, quick):
+    screen = pygame.display.get_surface()
+    particles = ParticleSystem(capacity=10000)
+    while particles.alive_count < particles.capacity:
+        particles.emit(1000, WIDTH // 2, HEIGHT // 2, life=(1000.0, 1000.0))
+    repeat = 20 if quick else 200
+    
+    results["particles_update_10k"] = summarize(measure(lambda: particles.update(1 / 60), repeat))
+    results["particles_draw_10k"] = summarize(measure(lambda: particles.draw(screen), repeat))
+
+
+def synthetic_results(rng, count):
+    hands = []
+    for _ in range(count):
+        tip = SimpleNamespace(x=rng.random(), y=rng.random(), z=0.0)
+        hands.append(SimpleNamespace(landmark=[tip] * 21))
+    return [SimpleNamespace(multi_hand_landmarks=[hand]) for hand in hands]
+
+
+def load_frames(frames_dir, rng):
+    from controllers.frame_sources import ImageDirectorySource, SyntheticSource
+    if frames_dir:
+        source = ImageDirectorySource(frames_dir, paced=False)
+    else:
+        source = SyntheticSource(paced=False, frames=60, seed=rng.randrange(2**32))
+    frames = list(source)
+    source.stop_camera()
+    return frames
+
+
+def bench_pipeline(results, controller, quick):
+    # End to end over a synthetic source: throughput, capture-to-inference
+    # latency and how often the reported direction matches the rendered one
+    from controllers.frame_sources import SyntheticSource
+    source = SyntheticSource(paced=False, frames=240 if quick else 1200)
+    samples = []
+    latencies = []
+    matches = 0
+    for stamp, direction in controller.iter_directions(source):
+        samples.append(time.perf_counter() - stamp.capture_start)
+        latencies.append(stamp.inferred - stamp.capture_start)
+        matches += direction == source.expected_direction
+    source.stop_camera()
+    results["pipeline_synthetic"] = summarize(samples)
+    results["pipeline_synthetic"]["capture_to_inference_p50_ms"] = float(np.percentile(latencies, 50) * 1000.0)
+    results["pipeline_synthetic"]["direction_accuracy"] = matches / len(samples)
+
+
+def bench_gesture(results, skipped, rng, quick, frames_dir):
+    try:
+        from controllers.hand_controller import HandGestureController
+        controller = HandGestureController()
+    except Exception as e:
+        skipped["gesture"] = f"HandGestureController unavailable: {e}"
+        return
+    
+    synthetic = synthetic_results(rng, 1000)
+    
+    def get_directions():
+        for result in synthetic:
+            controller.get_direction(result, CameraSettings.WIDTH, CameraSettings.HEIGHT)
+    
+    results["get_direction_x1000"] = summarize(measure(get_directions, 5 if quick else 50), len(synthetic))
+    
+    frames = load_frames(frames_dir, rng)
+    samples = []
+    for _ in range(1 if quick else 5):
+        for frame in frames:
+            start = time.perf_counter()
+            controller.process_frame(frame)
+            samples.append(time.perf_counter() - start)
+    results["process_frame"] = summarize(samples)
+    controller.close()
+    
+    fallback = HandGestureController(backend="opencv")
+    samples = []
+    for _ in range(1 if quick else 5):
+        for frame in frames:
+            start = time.perf_counter()
+            fallback.process_frame(frame)
+            samples.append(time.perf_counter() - start)
+    results["process_frame_opencv"] = summarize(samples)
+    bench_pipeline(results, fallback, quick)
+    fallback.close()
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"\n{'benchmark':34} {'baseline p50':>13} {'current p50':>12} {'change':>8}")
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        change = (stats["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        marker = "  REGRESSION" if change > threshold else ""
+        print(f"{name:34} {base['p50_ms']:13.3f} {stats['p50_ms']:12.3f} {change:+7.1f}%{marker}")
+        if marker:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maze Adventure hot-path benchmarks")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a stored JSON baseline")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p50 regression threshold in percent")
+    parser.add_argument("--frames", metavar="DIR", help="directory of stored camera frames for process_frame")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    pygame.init()
+    rng = random.Random(args.seed)
+    results = {}
+    skipped = {}
+    
+    bench_draw_maze(results, rng, args.quick)
+    bench_particles(results, args.quick)
+    bench_load_mazes(results, rng, args.quick)
+    bench_maze_queries(results, rng, args.quick)
+    bench_gesture(results, skipped, rng, args.quick, args.frames)
+    pygame.quit()
+    
+    print(f"{'benchmark':34} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>14}")
+    for name, stats in results.items():
+        ops = f"{stats['ops_per_second']:14,.0f}" if stats["ops_per_second"] else f"{'-':>14}"
+        print(f"{name:34} {stats['p50_ms']:10.3f} {stats['p95_ms']:10.3f} {stats['p99_ms']:10.3f} {ops}")
+    for name, reason in skipped.items():
+        print(f"skipped {name}: {reason}")
+    
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+        "skipped": skipped,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,13 @@ GRID_HEIGHT = 9
 WIDTH = GRID_WIDTH * TILE_SIZE
 HEIGHT = GRID_HEIGHT * TILE_SIZE
 
+class DisplaySettings:
+    RESIZABLE = True
+    MIN_TILE_SIZE = 24
+    SPRITE_CACHE_SIZE = 3  # Sprite sets kept for recently used tile sizes
+    STAR_FRAMES = 16  # Pre-scaled frames of the pulsing star animation
+    WALL_EDGE_BLEND = 0.5  # Exposed wall edges are shaded this far towards the path color
+
 # Colors
 class Colors:
     BLACK = (0, 0, 0)
@@ -21,8 +28,11 @@ class Colors:
 
 # Game Settings
 class GameSettings:
-    FPS = 30
+    FPS = 120  # Render cap, 0 renders as fast as the display allows
+    TICK_RATE = 60  # Fixed simulation steps per second
+    MAX_FRAME_TIME = 0.25  # Clamp for long frames so the simulation never spirals
     MOVE_DELAY = 0.2
+    MOVE_DELAY_TICKS = round(MOVE_DELAY * TICK_RATE)
     STAR_POINTS = 10
     LEVEL_COMPLETE_POINTS = 50
 
@@ -113,6 +123,22 @@ class HandGestureSettings:
     CENTER_ZONE = 50
     MIN_DETECTION_CONFIDENCE = 0.7
     MIN_TRACKING_CONFIDENCE = 0.7
+    MAX_NUM_HANDS = 1
+    TWO_PLAYER_ASSIGNMENT = "side"  # "side" or "handedness"
+    BACKEND = "auto"  # "auto", "mediapipe" or "opencv"
+    INFERENCE_BUDGET_MS = 25.0
+    INFERENCE_EMA_ALPHA = 0.1
+    BACKEND_WARMUP_FRAMES = 30
+    FALLBACK_PROCESS_WIDTH = 160
+    FALLBACK_HSV_LOWER = (0, 40, 60)  # skin tones; narrow it to track a coloured marker
+    FALLBACK_HSV_UPPER = (25, 255, 255)
+    FALLBACK_MIN_AREA = 1500  # in full-frame pixels
+    PREDICTION_ENABLED = False
+    PREDICTION_HISTORY = 6  # Raw fingertip samples in the velocity fit
+    PREDICTION_MIN_SPEED = 300  # Pixels per second
+    PREDICTION_LOOKAHEAD = 0.08  # Seconds the trajectory is projected ahead
+    PREDICTION_CONFIDENCE = 0.8  # Straightness x fit quality needed to commit early
+    PREDICTION_CONFIRM_TIME = 0.3  # Unconfirmed predictions are rolled back after this
 
 # Camera Settings
 class CameraSettings:
@@ -121,6 +147,129 @@ class CameraSettings:
     FPS = 30
     PREVIEW_WIDTH = 200
     PREVIEW_HEIGHT = 150
+    DEVICE = 0
+    AUTO_TUNE = True
+    PROBE_FOURCCS = ["MJPG", "YUYV"]
+    PROBE_RESOLUTIONS = [(640, 480), (320, 240)]
+    PROBE_BUFFER_SIZES = [1, 4]
+    PROBE_WARMUP_FRAMES = 5
+    PROBE_FRAMES = 20
+    MIN_PROBE_FPS = 20  # The tracker needs at least this many real frames per second
+    MIN_PROBE_WIDTH = 640  # Gesture thresholds are in capture pixels, so keep the frame this wide
+    PROFILE_FILE = os.path.join(BASE_DIR, "camera_profiles.json")
+
+# Particle Settings
+class ParticleSettings:
+    CAPACITY = 10000
+    PALETTE = [(255, 215, 0), (255, 20, 147), (0, 191, 255), (255, 255, 255), (255, 140, 0)]
+    SIZES = [2, 3, 4]
+    FADE_LEVELS = 4
+    GRAVITY = 180.0  # pixels per second squared
+    STAR_BURST = 40
+    FIREWORK_BURSTS = 5
+    FIREWORK_PARTICLES = 120
+    PLAYER_TRAIL = 3
+
+# Idle Scheduler Settings
+class IdleSettings:
+    ENABLED = True
+    ANIMATION_FPS = 30
+    UNFOCUSED_ANIMATION_FPS = 5
+    IDLE_TIMEOUT_MS = 500
+
+# Gesture Latency Settings
+class LatencySettings:
+    HISTORY = 500
+    SUMMARY_FILE = os.path.join(BASE_DIR, "latency_summary.json")
+
+# Profiler Settings
+class ProfilerSettings:
+    HISTORY_FRAMES = 300
+    TRACE_EVENTS = 100000
+    OVERLAY_REFRESH_FRAMES = 10
+    EXPORT_DIR = os.path.join(BASE_DIR, "profiles")
+
+# Fog of War Settings
+class FogSettings:
+    ENABLED = False
+    RADIUS = 6  # Sight range in tiles
+    EXPLORED_ALPHA = 170  # Darkness over explored tiles out of sight
+    UNEXPLORED_ALPHA = 255
+
+# Enemy Settings
+class EnemySettings:
+    COUNT = 0  # Enemies per level, 0 disables them
+    MOVE_DELAY_TICKS = 20  # A little slower than the player
+    FIELD_RADIUS = 64  # Enemies further away than this many steps stand still
+    SPAWN_MIN_DISTANCE = 6
+    COLLISION_PENALTY = 20
+    COLOR = (220, 40, 40)
+
+# Level Editor Settings
+class EditorSettings:
+    NEW_WIDTH = 15
+    NEW_HEIGHT = 15
+    ZOOM_LEVELS = [8, 12, 16, 24, 32, 48, 80]
+    PAN_SPEED = 600  # Pixels per second
+    UNDO_LIMIT = 500
+    UNREACHABLE_COLOR = (255, 60, 60, 90)
+
+# Minimap Settings
+class MinimapSettings:
+    ENABLED = True  # Shown only while the maze is larger than the window
+    MAX_SIZE = 160  # Longest side in pixels
+    TOP = 110
+    MARGIN = 10
+    STAR_COLOR = (255, 215, 0)
+    UNEXPLORED_COLOR = (0, 0, 0)
+    PLAYER_COLOR = (255, 255, 255)
+    VIEW_COLOR = (255, 255, 255)
+
+# Video Recording Settings
+class VideoSettings:
+    FPS = 30
+    SCALE = 1.0  # Output size relative to the window
+    QUEUE_SIZE = 16  # Frames waiting for the encoder before new ones are dropped
+    FOURCC = "mp4v"
+
+# Telemetry Settings
+class TelemetrySettings:
+    ENABLED = True
+    DIRECTORY = os.path.join(BASE_DIR, "telemetry")
+    FILE_NAME = "events.ndjson"
+    CAPACITY = 4096  # Ring buffer slots; older unwritten events are dropped
+    FLUSH_INTERVAL = 0.5  # Seconds between background writes
+    MAX_BYTES = 5 * 1024 * 1024  # Rotate the log past this size
+    BACKUP_COUNT = 3
+    ECHO = True  # Also print level and star messages, from the writer thread
+    SPIKE_MS = 50  # Frames taking longer than this are logged
+
+# Hot Reload Settings
+class HotReloadSettings:
+    POLL_INTERVAL = 0.1  # Seconds between checks of the maze file
+    SETTLE_TIME = 0.5  # Seconds a shorter file must stay unchanged before levels are dropped
+
+# Endless Mode Settings
+class EndlessSettings:
+    CHUNK_SIZE = 16  # Tiles per side; must be even
+    MAX_CHUNKS = 64  # Loaded chunks kept before the least recently used go
+    LOOKAHEAD = 3  # Chunks generated past the view along the heading
+    INSTALL_BUDGET = 4  # Finished chunks taken from the worker per tick
+    MAX_DOORS = 2  # Openings per chunk seam
+    LOOP_CHANCE = 0.08  # Extra wall openings, so there are alternative routes
+    STAR_CHANCE = 0.08
+    WORLD_CHUNKS = 1 << 16  # Chunks per side of the world
+
+# Network Settings
+class NetworkSettings:
+    HOST = "127.0.0.1"
+    PORT = 5555
+    ROOM_SIZE = 8
+    SNAPSHOT_INTERVAL = 3  # Server ticks between state broadcasts
+    MAX_WRITE_BUFFER = 64 * 1024  # Clients this far behind are dropped
+    STATS_INTERVAL = 5.0
+    STATS_HISTORY = 600
+    CONNECT_TIMEOUT = 5.0
 
 # Maze Tile Types
 class TileType:
@@ -128,4 +277,12 @@ class TileType:
     PATH = 1
     START = 2
     GOAL = 3
-    STAR = 4
\ No newline at end of file
+    STAR = 4
+
+# Wall autotile bits: set when the neighbour on that side is also a wall
+class WallEdge:
+    NORTH = 1
+    EAST = 2
+    SOUTH = 4
+    WEST = 8
+    TILE_COUNT = 16
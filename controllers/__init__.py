@@ -1,6 +1,14 @@
 from .hand_controller import HandGestureController
+from .blob_tracker import BlobTracker
+from .frame_sources import (FrameSource, CameraManager, VideoFileSource,
+                            ImageDirectorySource, SyntheticSource)
 
 __all__ = [
     'HandGestureController',
+    'BlobTracker',
+    'FrameSource',
+    'CameraManager',
+    'VideoFileSource',
+    'ImageDirectorySource',
+    'SyntheticSource',
 ]
-
@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+from types import SimpleNamespace
+from config import HandGestureSettings
+
+INDEX_FINGER_TIP = 8
+LANDMARK_COUNT = 21
+
+
+def make_results(points):
+    # Shapes the tracked points like MediaPipe's output so the controller can
+    # treat both backends the same way
+    if not points:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    hands = []
+    for x, y in points:
+        tip = SimpleNamespace(x=x, y=y, z=0.0)
+        hands.append(SimpleNamespace(landmark=[tip] * LANDMARK_COUNT))
+    return SimpleNamespace(multi_hand_landmarks=hands, multi_handedness=None)
+
+
+class BlobTracker:
+    # Cheap fallback: threshold a skin (or marker) colour range on a small
+    # copy of the frame and report the centroid of the largest blobs
+    def __init__(self, max_num_hands=1):
+        self.max_num_hands = max_num_hands
+        self.process_width = HandGestureSettings.FALLBACK_PROCESS_WIDTH
+        self.lower = np.array(HandGestureSettings.FALLBACK_HSV_LOWER, dtype=np.uint8)
+        self.upper = np.array(HandGestureSettings.FALLBACK_HSV_UPPER, dtype=np.uint8)
+        self.min_area = HandGestureSettings.FALLBACK_MIN_AREA
+        self.kernel = np.ones((3, 3), np.uint8)
+        self.last_contours = []
+        self.last_scale = 1.0
+
+    def process(self, rgb):
+        h, w = rgb.shape[:2]
+        scale = min(1.0, self.process_width / w)
+        small = cv2.resize(rgb, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else rgb
+
+        hsv = cv2.cvtColor(small, cv2.COLOR_RGB2HSV)
+        mask = cv2.inRange(hsv, self.lower, self.upper)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self.min_area * scale * scale
+        contours = sorted((c for c in contours if cv2.contourArea(c) >= min_area),
+                          key=cv2.contourArea, reverse=True)[:self.max_num_hands]
+
+        sh, sw = mask.shape
+        points = []
+        for contour in contours:
+            moments = cv2.moments(contour)
+            if moments["m00"]:
+                points.append((moments["m10"] / moments["m00"] / sw, moments["m01"] / moments["m00"] / sh))
+
+        self.last_contours = contours
+        self.last_scale = scale
+        return make_results(points)
+
+    def draw(self, frame):
+        if not self.last_contours:
+            return
+        inverse = 1.0 / self.last_scale
+        for contour in self.last_contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            cv2.rectangle(frame, (int(x * inverse), int(y * inverse)),
+                          (int((x + w) * inverse), int((y + h) * inverse)), (0, 255, 0), 2)
+
+    def close(self):
+        self.last_contours = []
@@ -0,0 +1,142 @@
+import cv2
+import json
+import time
+from config import CameraSettings
+
+
+def fourcc_code(name):
+    return cv2.VideoWriter_fourcc(*name)
+
+
+def fourcc_name(code):
+    code = int(code)
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+
+
+def apply_mode(cap, mode):
+    if mode.get("fourcc"):
+        cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(mode["fourcc"]))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, mode["width"])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, mode["height"])
+    cap.set(cv2.CAP_PROP_FPS, CameraSettings.FPS)
+    if mode.get("buffer_size"):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, mode["buffer_size"])
+
+
+def device_key(device):
+    return str(device)
+
+
+class CameraProbe:
+    # Tries capture modes on a device, measures what it actually delivers and
+    # remembers the best one so later starts can skip probing
+    def __init__(self, profile_file=CameraSettings.PROFILE_FILE):
+        self.profile_file = profile_file
+        self.profiles = self.load_profiles()
+        self.aborted = False
+
+    def load_profiles(self):
+        try:
+            with open(self.profile_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_profiles(self):
+        try:
+            with open(self.profile_file, "w") as f:
+                json.dump(self.profiles, f, indent=2)
+        except OSError as e:
+            print(f"Could not save camera profile: {e}")
+
+    def get_cached_mode(self, device):
+        return self.profiles.get(device_key(device))
+
+    def forget(self, device):
+        if self.profiles.pop(device_key(device), None) is not None:
+            self.save_profiles()
+
+    def candidate_modes(self):
+        for fourcc in CameraSettings.PROBE_FOURCCS:
+            for width, height in CameraSettings.PROBE_RESOLUTIONS:
+                for buffer_size in CameraSettings.PROBE_BUFFER_SIZES:
+                    yield {"fourcc": fourcc, "width": width, "height": height, "buffer_size": buffer_size}
+
+    def measure_mode(self, device, mode, on_frame=None):
+        # on_frame sees every frame read; returning False stops the probe
+        cap = cv2.VideoCapture(device)
+        try:
+            if not cap.isOpened():
+                return None
+            apply_mode(cap, mode)
+            for _ in range(CameraSettings.PROBE_WARMUP_FRAMES):
+                ret, frame = cap.read()
+                if not ret:
+                    return None
+                if on_frame and on_frame(frame) is False:
+                    self.aborted = True
+                    return None
+
+            read_times = []
+            frame = None
+            start = time.perf_counter()
+            for _ in range(CameraSettings.PROBE_FRAMES):
+                read_start = time.perf_counter()
+                ret, frame = cap.read()
+                if not ret:
+                    return None
+                read_times.append(time.perf_counter() - read_start)
+                if on_frame and on_frame(frame) is False:
+                    self.aborted = True
+                    return None
+            elapsed = time.perf_counter() - start
+
+            fps = len(read_times) / elapsed if elapsed > 0 else 0.0
+            buffer_size = int(cap.get(cv2.CAP_PROP_BUFFERSIZE)) or 1
+            read_ms = sum(read_times) / len(read_times) * 1000.0
+            # Every extra buffered frame is one more frame interval of age
+            frame_ms = 1000.0 / fps if fps else 0.0
+            return {
+                "fourcc": fourcc_name(cap.get(cv2.CAP_PROP_FOURCC)) or mode["fourcc"],
+                "requested_fourcc": mode["fourcc"],
+                "width": frame.shape[1],
+                "height": frame.shape[0],
+                "buffer_size": buffer_size,
+                "fps": fps,
+                "read_ms": read_ms,
+                "latency_ms": read_ms + max(buffer_size - 1, 0) * frame_ms,
+            }
+        finally:
+            cap.release()
+
+    def probe(self, device, on_frame=None):
+        measured = []
+        self.aborted = False
+        for mode in self.candidate_modes():
+            result = self.measure_mode(device, mode, on_frame)
+            if self.aborted:
+                return []
+            if result:
+                measured.append(result)
+                print(f"Camera mode {result['fourcc']} {result['width']}x{result['height']} "
+                      f"buffer {result['buffer_size']}: {result['fps']:.1f} fps, ~{result['latency_ms']:.1f} ms")
+        return measured
+
+    def choose(self, measured):
+        usable = [m for m in measured
+                  if m["fps"] >= CameraSettings.MIN_PROBE_FPS and m["width"] >= CameraSettings.MIN_PROBE_WIDTH]
+        if not usable:
+            usable = measured
+        if not usable:
+            return None
+        return min(usable, key=lambda m: (m["latency_ms"], -m["fps"]))
+
+    def find_best_mode(self, device, on_frame=None):
+        cached = self.get_cached_mode(device)
+        if cached:
+            return cached
+        best = self.choose(self.probe(device, on_frame))
+        if best and not self.aborted:
+            self.profiles[device_key(device)] = best
+            self.save_profiles()
+        return best
@@ -0,0 +1,278 @@
+import cv2
+import math
+import os
+import threading
+import time
+import numpy as np
+from config import CameraSettings
+from controllers.camera_probe import CameraProbe, apply_mode
+from controllers.latency import FrameStamp
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    # Common interface for anything that feeds frames to the gesture pipeline.
+    # Paced sources deliver frames at their own rate, unpaced ones as fast as
+    # they are asked; timestamp is the frame's position in source time.
+    def __init__(self, fps=CameraSettings.FPS, paced=True):
+        self.fps = fps
+        self.paced = paced
+        self.is_active = False
+        self.last_stamp = None
+        self.timestamp = None
+        self.frame_index = 0
+        self.start_time = None
+
+    def open(self):
+        return True
+
+    def read_frame(self):
+        return None
+
+    def release(self):
+        pass
+
+    def frame_time(self):
+        return self.frame_index / self.fps
+
+    def start_camera(self):
+        if not self.open():
+            return False
+        self.frame_index = 0
+        self.start_time = time.perf_counter()
+        self.is_active = True
+        return True
+
+    def stop_camera(self):
+        self.release()
+        self.is_active = False
+        self.last_stamp = None
+
+    def toggle_camera(self):
+        if self.is_active:
+            self.stop_camera()
+            return False
+        return self.start_camera()
+
+    def get_frame(self):
+        if not self.is_active:
+            return None
+
+        if self.paced:
+            delay = self.start_time + self.frame_time() - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        capture_start = time.perf_counter()
+        frame = self.read_frame()
+        if frame is None:
+            self.last_stamp = None
+            return None
+        self.last_stamp = FrameStamp(capture_start, time.perf_counter())
+        self.timestamp = self.frame_time()
+        self.frame_index += 1
+        return frame
+
+    def __iter__(self):
+        if not self.is_active and not self.start_camera():
+            return
+        while self.is_active:
+            frame = self.get_frame()
+            if frame is None:
+                break
+            yield frame
+
+
+class CameraManager(FrameSource):
+    # The webcam paces itself, so frames are timestamped on arrival
+    def __init__(self, device=CameraSettings.DEVICE):
+        super().__init__(CameraSettings.FPS, paced=False)
+        self.cap = None
+        self.device = device
+        self.probe = CameraProbe()
+        self.mode = None
+        self.probe_thread = None
+        self.probe_cancel = None
+        self.probe_frame = None
+        self.probe_failed = False  # Read by the game thread, which turns the camera off
+
+    def open(self):
+        if not CameraSettings.AUTO_TUNE:
+            return self.open_capture(None)
+        mode = self.probe.get_cached_mode(self.device)
+        if mode is None:
+            self.start_probe()
+            return True
+        return self.open_capture(mode)
+
+    def start_probe(self):
+        # Probing takes seconds, so it runs off the game thread. The device
+        # can only be opened once, so the frames the probe reads are what
+        # the game gets until the chosen mode is opened.
+        self.probe_frame = None
+        self.probe_failed = False
+        self.probe_cancel = threading.Event()
+        self.probe_thread = threading.Thread(target=self.run_probe, args=(self.probe_cancel,),
+                                             name="camera-probe", daemon=True)
+        self.probe_thread.start()
+
+    def run_probe(self, cancel):
+        def forward(frame):
+            self.probe_frame = frame
+            return not cancel.is_set()
+
+        mode = self.probe.find_best_mode(self.device, forward)
+        if cancel.is_set():
+            return
+        if not self.open_capture(mode):
+            print("Could not open the camera")
+            self.probe_failed = True
+
+    def open_capture(self, mode):
+        try:
+            cap = cv2.VideoCapture(self.device)
+            if not cap.isOpened():
+                return False
+            if mode is None:
+                mode = {"fourcc": None, "width": CameraSettings.WIDTH, "height": CameraSettings.HEIGHT}
+            apply_mode(cap, mode)
+            self.check_delivered_mode(cap, mode)
+            # Set last: after a probe the game thread reads as soon as it is there
+            self.cap = cap
+            return True
+        except Exception as e:
+            print(f"Error starting camera: {e}")
+            self.cap = None
+            return False
+
+    def check_delivered_mode(self, cap, mode):
+        # Drivers silently fall back to other modes, so report what we got and
+        # drop a cached profile the device no longer honours
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.mode = dict(mode, delivered_width=width, delivered_height=height,
+                         delivered_fps=cap.get(cv2.CAP_PROP_FPS))
+        if (width, height) != (mode["width"], mode["height"]):
+            print(f"Camera delivered {width}x{height} instead of {mode['width']}x{mode['height']}")
+            self.probe.forget(self.device)
+
+    def frame_time(self):
+        return time.perf_counter() - self.start_time
+
+    def read_frame(self):
+        if not self.cap:
+            # Still probing: hand over the newest probe frame, once
+            frame, self.probe_frame = self.probe_frame, None
+            return frame
+        ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def release(self):
+        if self.probe_thread:
+            self.probe_cancel.set()
+            self.probe_thread.join()
+            self.probe_thread = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+    def __del__(self):
+        """Cleanup when object is destroyed"""
+        if self.cap:
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, paced=True, loop=False):
+        super().__init__(CameraSettings.FPS, paced)
+        self.path = path
+        self.loop = loop
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            print(f"Could not open video {self.path}")
+            self.cap = None
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or self.fps
+        return True
+
+    def read_frame(self):
+        if not self.cap:
+            return None
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        return frame if ret else None
+
+    def release(self):
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirectorySource(FrameSource):
+    def __init__(self, directory, fps=CameraSettings.FPS, paced=True, loop=False):
+        super().__init__(fps, paced)
+        self.directory = directory
+        self.loop = loop
+        self.files = []
+
+    def open(self):
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError as e:
+            print(f"Could not open image directory {self.directory}: {e}")
+            return False
+        self.files = [os.path.join(self.directory, name) for name in names
+                      if name.lower().endswith(IMAGE_EXTENSIONS)]
+        return bool(self.files)
+
+    def read_frame(self):
+        if self.frame_index >= len(self.files):
+            if not self.loop or not self.files:
+                return None
+        return cv2.imread(self.files[self.frame_index % len(self.files)])
+
+
+class SyntheticSource(FrameSource):
+    # Renders a skin-coloured fingertip that holds still in the center and
+    # then sweeps out in each direction, so the expected direction of every
+    # frame is known
+    SEQUENCE = [(0, 0), (1, 0), (0, 0), (-1, 0), (0, 0), (0, -1), (0, 0), (0, 1)]
+
+    def __init__(self, width=CameraSettings.WIDTH, height=CameraSettings.HEIGHT, fps=CameraSettings.FPS,
+                 paced=True, frames=None, hold_frames=30, seed=0):
+        super().__init__(fps, paced)
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.hold_frames = hold_frames
+        self.radius = max(12, width // 16)
+        rng = np.random.default_rng(seed)
+        self.background = rng.integers(0, 40, (height, width, 3), dtype=np.uint8)
+        self.position = (width // 2, height // 2)
+        self.expected_direction = (0, 0)
+
+    def target(self, index):
+        step = index // self.hold_frames
+        dx, dy = self.SEQUENCE[step % len(self.SEQUENCE)]
+        # Ease out over the first half of each hold so the fingertip moves
+        progress = min(1.0, (index % self.hold_frames) / max(1, self.hold_frames // 2))
+        ease = math.sin(progress * math.pi / 2)
+        reach = min(self.width, self.height) * 0.35
+        # Drawn mirrored like a webcam image, so the expected direction is
+        # the one the controller reports after flipping the frame
+        return (int(self.width // 2 - dx * reach * ease),
+                int(self.height // 2 + dy * reach * ease)), (dx, dy)
+
+    def read_frame(self):
+        if self.frames is not None and self.frame_index >= self.frames:
+            return None
+        self.position, self.expected_direction = self.target(self.frame_index)
+        frame = self.background.copy()
+        cv2.circle(frame, self.position, self.radius, (120, 160, 220), -1)
+        return frame
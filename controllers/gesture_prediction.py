@@ -0,0 +1,169 @@
+from collections import deque
+from config import HandGestureSettings
+
+
+class GesturePredictor:
+    # Commits a direction before the smoothed fingertip crosses the movement
+    # threshold, when a straight, fast trajectory is clearly leaving the
+    # center. A prediction stays unconfirmed until the regular path reports
+    # the same direction; it is rolled back if that does not happen in time
+    # or the fingertip turns around.
+    def __init__(self, history=HandGestureSettings.PREDICTION_HISTORY):
+        self.samples = deque(maxlen=history)
+        self.velocity = None
+        self.fit_quality = (0.0, 0.0)
+        self.pending = None
+        self.pending_time = 0.0
+        self.last_reactive = (0, 0)
+        self.predictions = 0
+        self.confirmed = 0
+        self.rolled_back = 0
+        self.reactive_commits = 0
+        self.saved_ms = []
+
+    def reset(self):
+        self.samples.clear()
+        self.velocity = None
+        self.pending = None
+        self.last_reactive = (0, 0)
+
+    def fit(self):
+        # Least-squares line through the recent offsets: slope is the
+        # velocity, r squared says how straight the motion was
+        n = len(self.samples)
+        if n < 4:
+            return None
+        mean_t = sum(s[0] for s in self.samples) / n
+        mean_x = sum(s[1] for s in self.samples) / n
+        mean_y = sum(s[2] for s in self.samples) / n
+        stt = sxx = syy = stx = sty = 0.0
+        for t, x, y in self.samples:
+            dt, dx, dy = t - mean_t, x - mean_x, y - mean_y
+            stt += dt * dt
+            sxx += dx * dx
+            syy += dy * dy
+            stx += dt * dx
+            sty += dt * dy
+        if stt <= 0.0:
+            return None
+        r2_x = stx * stx / (stt * sxx) if sxx > 0.0 else 0.0
+        r2_y = sty * sty / (stt * syy) if syy > 0.0 else 0.0
+        self.fit_quality = (r2_x, r2_y)
+        return stx / stt, sty / stt
+
+    def predict(self, classify_offset):
+        if self.velocity is None:
+            return (0, 0), 0.0
+        vx, vy = self.velocity
+        speed = abs(vx) + abs(vy)
+        if speed < HandGestureSettings.PREDICTION_MIN_SPEED:
+            return (0, 0), 0.0
+
+        if abs(vx) > abs(vy):
+            heading = (1 if vx > 0 else -1, 0)
+            axis_speed, r2 = abs(vx), self.fit_quality[0]
+        else:
+            heading = (0, 1 if vy > 0 else -1)
+            axis_speed, r2 = abs(vy), self.fit_quality[1]
+
+        # Only a fingertip that has been getting further from the center on
+        # this side, and will be past the threshold shortly, is leaving it;
+        # a hand swinging back through the center is not
+        _, x, y = self.samples[-1]
+        _, first_x, first_y = self.samples[0]
+        outward = x * heading[0] + y * heading[1]
+        if outward <= 0 or outward <= first_x * heading[0] + first_y * heading[1]:
+            return (0, 0), 0.0
+        # Projected with the latest speed, so a hand already braking (a feint
+        # that stops short) does not look like it will cross
+        recent_t, recent_x, recent_y = self.samples[-3]
+        elapsed = self.samples[-1][0] - recent_t
+        if elapsed <= 0.0:
+            return (0, 0), 0.0
+        recent_vx = (x - recent_x) / elapsed
+        recent_vy = (y - recent_y) / elapsed
+        lookahead = HandGestureSettings.PREDICTION_LOOKAHEAD
+        if classify_offset(x + recent_vx * lookahead, y + recent_vy * lookahead) != heading:
+            return (0, 0), 0.0
+
+        straightness = 2.0 * axis_speed / speed - 1.0
+        return heading, r2 * straightness
+
+    def opposes(self, direction):
+        if self.velocity is None:
+            return False
+        along = self.velocity[0] * direction[0] + self.velocity[1] * direction[1]
+        return along < -HandGestureSettings.PREDICTION_MIN_SPEED
+
+    def update(self, x, y, current_time, reactive, classify_offset):
+        # x, y: raw fingertip offset from the center; reactive: the direction
+        # the threshold and hold logic produced for this frame
+        self.samples.append((current_time, x, y))
+        self.velocity = self.fit()
+
+        if reactive != self.last_reactive and reactive != (0, 0):
+            self.reactive_commits += 1
+        self.last_reactive = reactive
+
+        if reactive != (0, 0):
+            if self.pending is not None:
+                if reactive == self.pending:
+                    self.confirmed += 1
+                    self.saved_ms.append((current_time - self.pending_time) * 1000.0)
+                else:
+                    self.rolled_back += 1
+                self.pending = None
+            return reactive
+
+        if self.pending is not None:
+            if (current_time - self.pending_time > HandGestureSettings.PREDICTION_CONFIRM_TIME or
+                    self.opposes(self.pending)):
+                self.rolled_back += 1
+                self.pending = None
+                return 0, 0
+            return self.pending
+
+        direction, confidence = self.predict(classify_offset)
+        if direction != (0, 0) and confidence >= HandGestureSettings.PREDICTION_CONFIDENCE:
+            self.pending = direction
+            self.pending_time = current_time
+            self.predictions += 1
+            return direction
+        return 0, 0
+
+    def get_stats(self):
+        resolved = self.confirmed + self.rolled_back
+        saved = sorted(self.saved_ms)
+        return {
+            "reactive_commits": self.reactive_commits,
+            "predictions": self.predictions,
+            "confirmed": self.confirmed,
+            "rolled_back": self.rolled_back,
+            "false_move_rate": self.rolled_back / resolved if resolved else 0.0,
+            "predicted_share": self.confirmed / self.reactive_commits if self.reactive_commits else 0.0,
+            "mean_saved_ms": sum(saved) / len(saved) if saved else 0.0,
+            "p50_saved_ms": saved[len(saved) // 2] if saved else 0.0,
+        }
+
+
+def evaluate_trace(points, width, height):
+    # Feeds a recorded fingertip trace, (time, x, y) per camera frame or None
+    # while no hand was seen, through a predicting tracker
+    from controllers.hand_controller import HandTracker
+    tracker = HandTracker(predict=True)
+    for point in points:
+        if point is not None:
+            t, x, y = point
+            tracker.update(x, y, width // 2, height // 2, t)
+    return tracker.predictor
+
+
+def combine(predictors):
+    total = GesturePredictor()
+    for predictor in predictors:
+        total.predictions += predictor.predictions
+        total.confirmed += predictor.confirmed
+        total.rolled_back += predictor.rolled_back
+        total.reactive_commits += predictor.reactive_commits
+        total.saved_ms.extend(predictor.saved_ms)
+    return total
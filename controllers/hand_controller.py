@@ -1,10 +1,20 @@
 import cv2
-import mediapipe as mp
 import time
+from collections import deque
 from config import HandGestureSettings, CameraSettings
+from controllers.blob_tracker import BlobTracker, INDEX_FINGER_TIP
+from controllers.gesture_prediction import GesturePredictor, combine
 
-class HandGestureController:
-    def __init__(self):
+try:
+    import mediapipe as mp
+    MEDIAPIPE_AVAILABLE = hasattr(mp, "solutions")
+except ImportError:
+    mp = None
+    MEDIAPIPE_AVAILABLE = False
+
+class HandTracker:
+    # Smoothing history and direction state for one hand
+    def __init__(self, predict=HandGestureSettings.PREDICTION_ENABLED):
         self.last_positions = []
         self.position_history_size = HandGestureSettings.POSITION_HISTORY_SIZE
         self.movement_threshold = HandGestureSettings.MOVEMENT_THRESHOLD
@@ -12,16 +22,7 @@ class HandGestureController:
         self.direction_hold_time = HandGestureSettings.DIRECTION_HOLD_TIME
         self.last_direction_time = 0
         self.center_zone = HandGestureSettings.CENTER_ZONE
-        
-        # MediaPipe setup
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=HandGestureSettings.MIN_DETECTION_CONFIDENCE,
-            min_tracking_confidence=HandGestureSettings.MIN_TRACKING_CONFIDENCE
-        )
+        self.predictor = GesturePredictor() if predict else None
         
     def add_position(self, x, y):
         self.last_positions.append((x, y))
@@ -36,131 +37,285 @@ class HandGestureController:
         avg_y = sum(pos[1] for pos in self.last_positions) / len(self.last_positions)
         return avg_x, avg_y
     
-    def get_direction(self, results, frame_width, frame_height):
+    def classify_offset(self, dx, dy):
+        if abs(dx) < self.center_zone and abs(dy) < self.center_zone:
+            return 0, 0
+        if abs(dx) > abs(dy):
+            if abs(dx) > self.movement_threshold:
+                return 1 if dx > 0 else -1, 0
+        elif abs(dy) > self.movement_threshold:
+            return 0, 1 if dy > 0 else -1
+        return 0, 0
+    
+    def update(self, x, y, center_x, center_y, current_time):
+        self.add_position(x, y)
+        direction = self.update_direction(center_x, center_y, current_time)
+        if self.predictor:
+            direction = self.predictor.update(x - center_x, y - center_y, current_time, direction,
+                                              self.classify_offset)
+        return direction
+    
+    def update_direction(self, center_x, center_y, current_time):
+        smoothed_pos = self.get_smoothed_position()
+        if not smoothed_pos:
+            return 0, 0
+        
+        smooth_x, smooth_y = smoothed_pos
+        
+        dx = smooth_x - center_x
+        dy = smooth_y - center_y
+        
+        if abs(dx) < self.center_zone and abs(dy) < self.center_zone:
+            return 0, 0
+        
+        new_direction = self.classify_offset(dx, dy)
+        
+        if (new_direction != self.last_direction and 
+            current_time - self.last_direction_time < self.direction_hold_time):
+            return self.last_direction
+        
+        if new_direction != (0, 0):
+            self.last_direction = new_direction
+            self.last_direction_time = current_time
+        
+        return new_direction
+
+
+class HandGestureController:
+    def __init__(self, max_num_hands=HandGestureSettings.MAX_NUM_HANDS, backend=HandGestureSettings.BACKEND,
+                 predict=HandGestureSettings.PREDICTION_ENABLED):
+        self.max_num_hands = max_num_hands
+        self.trackers = [HandTracker(predict) for _ in range(max_num_hands)]
+        self.center_zone = HandGestureSettings.CENTER_ZONE
+        self.emitted_direction = (0, 0)
+        self.raw_direction = (0, 0)
+        self.onset_stamp = None
+        self.committed_stamp = None
+        
+        # Inference time keyed by how many hands were found, and the extra
+        # per-hand cost of turning landmarks into a direction
+        self.inference_ms = {count: deque(maxlen=300) for count in range(max_num_hands + 1)}
+        self.hand_cost_ms = [deque(maxlen=300) for _ in range(max_num_hands)]
+        
+        # Running inference cost of the active backend; "auto" drops to the
+        # OpenCV tracker once MediaPipe stays over budget after warm-up
+        self.auto_switch = backend == "auto"
+        self.inference_ema = None
+        self.backend_frames = 0
+        self.fallback = BlobTracker(max_num_hands)
+        self.hands = None
+        
+        if backend != "opencv" and MEDIAPIPE_AVAILABLE:
+            self.mp_hands = mp.solutions.hands
+            self.mp_drawing = mp.solutions.drawing_utils
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=max_num_hands,
+                min_detection_confidence=HandGestureSettings.MIN_DETECTION_CONFIDENCE,
+                min_tracking_confidence=HandGestureSettings.MIN_TRACKING_CONFIDENCE
+            )
+            self.backend = "mediapipe"
+        else:
+            if backend == "mediapipe":
+                print("MediaPipe hand tracking unavailable, using the OpenCV tracker")
+            self.backend = "opencv"
+        
+    def add_position(self, x, y):
+        self.trackers[0].add_position(x, y)
+    
+    def get_smoothed_position(self):
+        return self.trackers[0].get_smoothed_position()
+    
+    def classify_offset(self, dx, dy):
+        return self.trackers[0].classify_offset(dx, dy)
+    
+    def get_fingertip(self, hand_landmarks, frame_width, frame_height):
+        index_tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
+        return int(index_tip.x * frame_width), int(index_tip.y * frame_height)
+    
+    def get_direction(self, results, frame_width, frame_height, stamp=None):
+        direction = self.compute_direction(results, frame_width, frame_height)
+        if stamp is not None:
+            self.track_latency(results, direction, stamp, frame_width, frame_height)
+        self.emitted_direction = direction
+        return direction
+    
+    def track_latency(self, results, direction, stamp, frame_width, frame_height):
+        last_positions = self.trackers[0].last_positions
+        if results.multi_hand_landmarks and last_positions:
+            raw_x, raw_y = last_positions[-1]
+            raw_direction = self.classify_offset(raw_x - frame_width // 2, raw_y - frame_height // 2)
+        else:
+            raw_direction = (0, 0)
+        
+        if raw_direction != self.raw_direction:
+            self.raw_direction = raw_direction
+            self.onset_stamp = stamp if raw_direction != (0, 0) else None
+        
+        if direction != (0, 0) and direction != self.emitted_direction:
+            stamp.direction_time = time.perf_counter()
+            if self.onset_stamp is not None and self.raw_direction == direction:
+                stamp.onset = self.onset_stamp
+            self.committed_stamp = stamp
+        elif direction == (0, 0):
+            self.committed_stamp = None
+    
+    def pop_committed_stamp(self):
+        stamp = self.committed_stamp
+        self.committed_stamp = None
+        return stamp
+    
+    def compute_direction(self, results, frame_width, frame_height):
         if not results.multi_hand_landmarks:
             return 0, 0
         
-        current_time = time.time()
+        x, y = self.get_fingertip(results.multi_hand_landmarks[0], frame_width, frame_height)
+        return self.trackers[0].update(x, y, frame_width // 2, frame_height // 2, time.time())
+    
+    def assign_hands(self, results, frame_width, frame_height):
+        # Maps each detected hand to a player: by handedness when both labels
+        # are distinct, otherwise by which half of the screen it is in
+        hands = []
+        for i, hand_landmarks in enumerate(results.multi_hand_landmarks[:self.max_num_hands]):
+            x, y = self.get_fingertip(hand_landmarks, frame_width, frame_height)
+            label = None
+            if results.multi_handedness and i < len(results.multi_handedness):
+                label = results.multi_handedness[i].classification[0].label
+            hands.append((x, y, label))
         
-        for hand_landmarks in results.multi_hand_landmarks:
-            index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-            x = int(index_tip.x * frame_width)
-            y = int(index_tip.y * frame_height)
-            
-            self.add_position(x, y)
-            
-            smoothed_pos = self.get_smoothed_position()
-            if not smoothed_pos:
-                return 0, 0
-            
-            smooth_x, smooth_y = smoothed_pos
-            
-            center_x, center_y = frame_width // 2, frame_height // 2
-            
-            dx = smooth_x - center_x
-            dy = smooth_y - center_y
-            
-            if abs(dx) < self.center_zone and abs(dy) < self.center_zone:
-                return 0, 0
-            
-            new_direction = (0, 0)
-            
-            if abs(dx) > abs(dy): 
-                if abs(dx) > self.movement_threshold:
-                    new_direction = (1 if dx > 0 else -1, 0)
-            else:
-                if abs(dy) > self.movement_threshold:
-                    new_direction = (0, 1 if dy > 0 else -1)
-            
-            if (new_direction != self.last_direction and 
-                current_time - self.last_direction_time < self.direction_hold_time):
-                return self.last_direction
-            
-            if new_direction != (0, 0):
-                self.last_direction = new_direction
-                self.last_direction_time = current_time
-            
-            return new_direction
+        if HandGestureSettings.TWO_PLAYER_ASSIGNMENT == "handedness":
+            labels = [label for _, _, label in hands]
+            if len(set(labels)) == len(labels) and None not in labels:
+                return [(0 if label == "Left" else 1, x, y) for x, y, label in hands]
         
-        return 0, 0
+        assigned = []
+        for x, y, _ in hands:
+            player = 0 if x < frame_width // 2 else 1
+            if any(p == player for p, _, _ in assigned):
+                player = 1 - player
+            assigned.append((player, x, y))
+        return assigned
+    
+    def get_directions(self, results, frame_width, frame_height):
+        # Two-player mode: each half of the frame is one player's joystick
+        directions = [(0, 0)] * self.max_num_hands
+        if not results.multi_hand_landmarks:
+            return directions
+        
+        current_time = time.time()
+        center_y = frame_height // 2
+        for player, x, y in self.assign_hands(results, frame_width, frame_height):
+            start = time.perf_counter()
+            center_x = frame_width // 4 if player == 0 else frame_width * 3 // 4
+            directions[player] = self.trackers[player].update(x, y, center_x, center_y, current_time)
+            self.hand_cost_ms[player].append((time.perf_counter() - start) * 1000.0)
+        return directions
+    
+    def get_cost_summary(self):
+        summary = {"backend": self.backend, "inference_ms_by_hands": {}, "direction_ms_by_player": {}}
+        for count, samples in self.inference_ms.items():
+            if samples:
+                summary["inference_ms_by_hands"][count] = sum(samples) / len(samples)
+        for player, samples in enumerate(self.hand_cost_ms):
+            if samples:
+                summary["direction_ms_by_player"][player] = sum(samples) / len(samples)
+        return summary
     
-    def process_frame(self, frame):
+    def process_frame(self, frame, stamp=None):
         frame = cv2.flip(frame, 1)
         frame = cv2.GaussianBlur(frame, (5, 5), 0)
         
         rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb)
+        if stamp is not None:
+            stamp.preprocessed = time.perf_counter()
+        inference_start = time.perf_counter()
+        if self.backend == "mediapipe":
+            results = self.hands.process(rgb)
+        else:
+            results = self.fallback.process(rgb)
+        inference_end = time.perf_counter()
+        if stamp is not None:
+            stamp.inferred = inference_end
+        inference_ms = (inference_end - inference_start) * 1000.0
+        hand_count = len(results.multi_hand_landmarks) if results.multi_hand_landmarks else 0
+        self.inference_ms[min(hand_count, self.max_num_hands)].append(inference_ms)
+        self.update_backend(inference_ms)
+        
+        if results.multi_hand_landmarks and self.backend == "opencv":
+            self.fallback.draw(frame)
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    self.mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
-                )
+                if self.backend == "mediapipe":
+                    self.mp_drawing.draw_landmarks(
+                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                        self.mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                        self.mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
+                    )
                 
-                index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
+                index_tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
                 h, w, _ = frame.shape
                 tip_x, tip_y = int(index_tip.x * w), int(index_tip.y * h)
                 cv2.circle(frame, (tip_x, tip_y), 10, (255, 255, 0), -1)
                 
-                center_x, center_y = w // 2, h // 2
-                cv2.rectangle(frame, 
-                             (center_x - self.center_zone, center_y - self.center_zone), 
-                             (center_x + self.center_zone, center_y + self.center_zone), 
-                             (0, 255, 255), 2)
+                centers = [w // 2] if self.max_num_hands == 1 else [w // 4, w * 3 // 4]
+                center_y = h // 2
+                for center_x in centers:
+                    cv2.rectangle(frame, 
+                                 (center_x - self.center_zone, center_y - self.center_zone), 
+                                 (center_x + self.center_zone, center_y + self.center_zone), 
+                                 (0, 255, 255), 2)
         
         return frame, results
     
-    def close(self):
-        self.hands.close()
-
-
-class CameraManager:
-    def __init__(self):
-        self.cap = None
-        self.is_active = False
-        
-    def start_camera(self):
-        try:
-            self.cap = cv2.VideoCapture(0)
-            if self.cap.isOpened():
-                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CameraSettings.WIDTH)
-                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CameraSettings.HEIGHT)
-                self.cap.set(cv2.CAP_PROP_FPS, CameraSettings.FPS)
-                self.is_active = True
-                return True
-            else:
-                self.cap = None
-                return False
-        except Exception as e:
-            print(f"Error starting camera: {e}")
-            self.cap = None
+    def iter_directions(self, source, limit=None):
+        # Runs the whole pipeline over any frame source, yielding the stamp
+        # and direction of each frame
+        count = 0
+        for frame in source:
+            stamp = source.last_stamp
+            _, results = self.process_frame(frame, stamp)
+            yield stamp, self.get_direction(results, frame.shape[1], frame.shape[0], stamp)
+            count += 1
+            if limit is not None and count >= limit:
+                break
+    
+    def update_backend(self, inference_ms):
+        alpha = HandGestureSettings.INFERENCE_EMA_ALPHA
+        if self.inference_ema is None:
+            self.inference_ema = inference_ms
+        else:
+            self.inference_ema += alpha * (inference_ms - self.inference_ema)
+        self.backend_frames += 1
+        
+        # The first MediaPipe frames include model start-up, so give it a
+        # warm-up window before judging it against the budget
+        if (self.auto_switch and self.backend == "mediapipe" and
+                self.backend_frames > HandGestureSettings.BACKEND_WARMUP_FRAMES and
+                self.inference_ema > HandGestureSettings.INFERENCE_BUDGET_MS):
+            print(f"Hand tracking at {self.inference_ema:.1f} ms per frame, "
+                  f"over the {HandGestureSettings.INFERENCE_BUDGET_MS:.0f} ms budget: switching to the OpenCV tracker")
+            self.set_backend("opencv")
+    
+    def set_backend(self, backend):
+        if backend == "mediapipe" and self.hands is None:
             return False
-            
-    def stop_camera(self):
-        if self.cap:
-            self.cap.release()
-            self.cap = None
-        self.is_active = False
-        
-    def get_frame(self):
-        if not self.is_active or not self.cap:
+        self.backend = backend
+        self.inference_ema = None
+        self.backend_frames = 0
+        for tracker in self.trackers:
+            tracker.last_positions = []
+            if tracker.predictor:
+                tracker.predictor.reset()
+        return True
+    
+    def get_prediction_stats(self):
+        predictors = [tracker.predictor for tracker in self.trackers if tracker.predictor]
+        if not predictors:
             return None
-            
-        ret, frame = self.cap.read()
-        if ret:
-            return frame
-        return None
-        
-    def toggle_camera(self):
-        if self.is_active:
-            self.stop_camera()
-            return False
-        else:
-            return self.start_camera()
-            
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        if self.cap:
-            self.cap.release()
\ No newline at end of file
+        return combine(predictors).get_stats()
+    
+    def close(self):
+        if self.hands:
+            self.hands.close()
+        self.fallback.close()
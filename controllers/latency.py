@@ -0,0 +1,73 @@
+import json
+import time
+from collections import deque
+import numpy as np
+from config import LatencySettings
+
+STAGES = ["capture", "preprocess", "inference", "smoothing_hold", "direction", "move_wait", "total"]
+
+
+class FrameStamp:
+    __slots__ = ("capture_start", "captured", "preprocessed", "inferred", "direction_time", "onset")
+    
+    def __init__(self, capture_start, captured):
+        self.capture_start = capture_start
+        self.captured = captured
+        self.preprocessed = None
+        self.inferred = None
+        self.direction_time = None
+        # Stamp of the frame in which the raw fingertip first crossed into the
+        # committed direction, before smoothing and hold delayed it
+        self.onset = None
+
+
+class LatencyTracker:
+    def __init__(self, history=LatencySettings.HISTORY):
+        self.samples = {stage: deque(maxlen=history) for stage in STAGES}
+        self.count = 0
+        
+    def record_move(self, stamp, move_time=None):
+        if stamp.inferred is None or stamp.direction_time is None:
+            return
+        move_time = move_time if move_time is not None else time.perf_counter()
+        onset = stamp.onset or stamp
+        
+        durations = {
+            "capture": stamp.captured - stamp.capture_start,
+            "preprocess": stamp.preprocessed - stamp.captured,
+            "inference": stamp.inferred - stamp.preprocessed,
+            "smoothing_hold": stamp.captured - onset.captured,
+            "direction": stamp.direction_time - stamp.inferred,
+            "move_wait": move_time - stamp.direction_time,
+            "total": move_time - onset.capture_start,
+        }
+        for stage, seconds in durations.items():
+            self.samples[stage].append(seconds * 1000.0)
+        self.count += 1
+    
+    def get_summary(self):
+        summary = {"moves": self.count}
+        for stage, values in self.samples.items():
+            if not values:
+                continue
+            ms = np.array(values)
+            summary[stage] = {
+                "last_ms": float(ms[-1]),
+                "mean_ms": float(ms.mean()),
+                "p50_ms": float(np.percentile(ms, 50)),
+                "p95_ms": float(np.percentile(ms, 95)),
+            }
+        return summary
+    
+    def get_live_text(self):
+        total = self.samples["total"]
+        if not total:
+            return None
+        return f"Gesture latency: {total[-1]:.0f} ms (p50 {np.percentile(total, 50):.0f} ms)"
+    
+    def write_summary(self, filename=LatencySettings.SUMMARY_FILE):
+        if not self.count:
+            return None
+        with open(filename, "w") as f:
+            json.dump(self.get_summary(), f, indent=2)
+        return filename
@@ -3,6 +3,8 @@ from .maze import Maze, MazeLoader
 from .player import Player
 from .ui import UI, CharacterSelection
 from .game import Game
+from .headless import HeadlessEnv
+from .batch_env import BatchEnv
 
 __all__ = [
     'GameState',
@@ -11,5 +13,7 @@ __all__ = [
     'Player',
     'UI',
     'CharacterSelection', 
-    'Game'
+    'Game',
+    'HeadlessEnv',
+    'BatchEnv'
 ]
@@ -0,0 +1,50 @@
+import numpy as np
+from config import TileType, WallEdge
+
+# (bit, dx, dy) for each side a wall can connect through
+SIDES = [
+    (WallEdge.NORTH, 0, -1),
+    (WallEdge.EAST, 1, 0),
+    (WallEdge.SOUTH, 0, 1),
+    (WallEdge.WEST, -1, 0),
+]
+
+
+def compute_wall_masks(data):
+    # Whole-grid bitmasks from shifted copies of a wall grid padded with
+    # walls, so the border connects outwards instead of drawing an edge
+    return masks_from_padded(np.pad(np.array(data) == TileType.WALL, 1, constant_values=True))
+
+
+def masks_from_padded(walls):
+    # walls: boolean wall grid with a one-tile border of neighbouring tiles
+    inner = walls[1:-1, 1:-1]
+    masks = np.zeros(inner.shape, dtype=np.uint8)
+    for bit, dx, dy in SIDES:
+        neighbour = walls[1 + dy:walls.shape[0] - 1 + dy, 1 + dx:walls.shape[1] - 1 + dx]
+        masks |= np.where(neighbour, bit, 0).astype(np.uint8)
+    masks[~inner] = 0
+    # Plain lists keep the per-tile lookup in draw_maze cheap
+    return masks.tolist()
+
+
+def wall_mask_at(data, x, y):
+    if data[y][x] != TileType.WALL:
+        return 0
+    height, width = len(data), len(data[0])
+    mask = 0
+    for bit, dx, dy in SIDES:
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < width and 0 <= ny < height) or data[ny][nx] == TileType.WALL:
+            mask |= bit
+    return mask
+
+
+def update_wall_masks(masks, data, x, y):
+    # A changed tile only affects its own mask and its four neighbours'
+    height, width = len(data), len(data[0])
+    masks[y][x] = wall_mask_at(data, x, y)
+    for _, dx, dy in SIDES:
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < width and 0 <= ny < height:
+            masks[ny][nx] = wall_mask_at(data, nx, ny)
@@ -0,0 +1,258 @@
+import os
+import pygame
+import time
+from config import *
+from game.layout import Layout
+from game.maze import Maze, MazeLoader
+from game.reachability import Reachability
+from game.ui import UI
+from assets.asset_manager import AssetManager
+
+BRUSHES = {
+    pygame.K_0: TileType.WALL,
+    pygame.K_1: TileType.PATH,
+    pygame.K_2: TileType.START,
+    pygame.K_3: TileType.GOAL,
+    pygame.K_4: TileType.STAR,
+}
+BRUSH_NAMES = {
+    TileType.WALL: "Wall",
+    TileType.PATH: "Path",
+    TileType.START: "Start",
+    TileType.GOAL: "Goal",
+    TileType.STAR: "Star",
+}
+
+
+def blank_maze_data(width, height):
+    data = [[TileType.WALL] * width for _ in range(height)]
+    for y in range(1, height - 1):
+        for x in range(1, width - 1):
+            data[y][x] = TileType.PATH
+    data[1][1] = TileType.START
+    data[height - 2][width - 2] = TileType.GOAL
+    return data
+
+
+class LevelEditor:
+    # Paint tiles with the mouse; every edit re-checks which stars and goals
+    # the start can reach, touching only the distances the edit changed
+    def __init__(self, maze_file=MAZE_FILE):
+        pygame.init()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Maze Adventure - Level Editor")
+        self.maze_file = maze_file
+        self.layout = Layout(WIDTH, HEIGHT)
+        self.asset_manager = AssetManager()
+        self.asset_manager.load_all_assets(self.layout.tile_size)
+        self.ui = UI(self.screen, self.asset_manager, self.layout)
+        self.clock = pygame.time.Clock()
+        self.theme_name = list(THEMES.keys())[0]
+
+        self.mazes = MazeLoader.load_mazes_from_file(maze_file)
+        if not self.mazes:
+            self.mazes = [Maze(blank_maze_data(EditorSettings.NEW_WIDTH, EditorSettings.NEW_HEIGHT))]
+        self.level = 0
+        self.dirty = False
+        self.message = ""
+        self.running = True
+        self.brush = TileType.PATH
+        self.load_level(0)
+
+    def load_level(self, level):
+        self.level = level % len(self.mazes)
+        self.maze = self.mazes[self.level]
+        self.reachability = Reachability(self.maze)
+        self.undo_stack = []
+        self.redo_stack = []
+        self.stroke = None
+        self.check_ms = 0.0
+        self.camera_x = (self.maze.get_width() - 1) / 2
+        self.camera_y = (self.maze.get_height() - 1) / 2
+
+    def set_zoom(self, step):
+        levels = EditorSettings.ZOOM_LEVELS
+        current = min(range(len(levels)), key=lambda i: abs(levels[i] - self.layout.tile_size))
+        self.layout.tile_size = levels[max(0, min(len(levels) - 1, current + step))]
+        self.asset_manager.set_tile_size(self.layout.tile_size)
+
+    def mouse_tile(self, pos):
+        x = (pos[0] + self.layout.view_x) // self.layout.tile_size
+        y = (pos[1] + self.layout.view_y) // self.layout.tile_size
+        if 0 <= x < self.maze.get_width() and 0 <= y < self.maze.get_height():
+            return x, y
+        return None
+
+    def apply(self, x, y, tile):
+        old = self.maze.data[y][x]
+        start = time.perf_counter()
+        if self.reachability.set_tile(x, y, tile):
+            self.check_ms = (time.perf_counter() - start) * 1000.0
+            self.stroke.append((x, y, old, tile))
+            self.dirty = True
+
+    def paint(self, pos, tile):
+        position = self.mouse_tile(pos)
+        if position is None or self.stroke is None:
+            return
+        x, y = position
+        # A level has one start: painting a new one turns the old into path
+        if tile == TileType.START and self.reachability.start is not None:
+            old_x = self.reachability.start % self.maze.get_width()
+            old_y = self.reachability.start // self.maze.get_width()
+            if (old_x, old_y) != (x, y):
+                self.apply(old_x, old_y, TileType.PATH)
+        self.apply(x, y, tile)
+
+    def begin_stroke(self):
+        self.stroke = []
+
+    def end_stroke(self):
+        if self.stroke:
+            self.undo_stack.append(self.stroke)
+            del self.undo_stack[:-EditorSettings.UNDO_LIMIT]
+            self.redo_stack = []
+        self.stroke = None
+
+    def undo(self):
+        if not self.undo_stack:
+            return
+        stroke = self.undo_stack.pop()
+        for x, y, old, _ in reversed(stroke):
+            self.reachability.set_tile(x, y, old)
+        self.redo_stack.append(stroke)
+        self.dirty = True
+
+    def redo(self):
+        if not self.redo_stack:
+            return
+        stroke = self.redo_stack.pop()
+        for x, y, _, new in stroke:
+            self.reachability.set_tile(x, y, new)
+        self.undo_stack.append(stroke)
+        self.dirty = True
+
+    def save(self):
+        MazeLoader.save_mazes_to_file(self.mazes, self.maze_file)
+        self.dirty = False
+        self.message = f"Saved {len(self.mazes)} levels to {os.path.basename(self.maze_file)}"
+
+    def new_level(self):
+        self.mazes.append(Maze(blank_maze_data(EditorSettings.NEW_WIDTH, EditorSettings.NEW_HEIGHT)))
+        self.dirty = True
+        self.load_level(len(self.mazes) - 1)
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                self.handle_key(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                self.begin_stroke()
+                self.paint(event.pos, self.brush if event.button == 1 else TileType.WALL)
+            elif event.type == pygame.MOUSEMOTION and self.stroke is not None:
+                if event.buttons[0] or event.buttons[2]:
+                    self.paint(event.pos, self.brush if event.buttons[0] else TileType.WALL)
+            elif event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):
+                self.end_stroke()
+            elif event.type == pygame.MOUSEWHEEL:
+                self.set_zoom(1 if event.y > 0 else -1)
+
+    def handle_key(self, event):
+        ctrl = event.mod & pygame.KMOD_CTRL
+        if event.key == pygame.K_ESCAPE:
+            self.running = False
+        elif ctrl and event.key == pygame.K_z:
+            if event.mod & pygame.KMOD_SHIFT:
+                self.redo()
+            else:
+                self.undo()
+        elif ctrl and event.key == pygame.K_y:
+            self.redo()
+        elif ctrl and event.key == pygame.K_s:
+            self.save()
+        elif ctrl and event.key == pygame.K_n:
+            self.new_level()
+        elif event.key == pygame.K_PAGEUP:
+            self.load_level(self.level - 1)
+        elif event.key == pygame.K_PAGEDOWN:
+            self.load_level(self.level + 1)
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
+            self.set_zoom(1)
+        elif event.key == pygame.K_MINUS:
+            self.set_zoom(-1)
+        elif event.key in BRUSHES:
+            self.brush = BRUSHES[event.key]
+
+    def update_camera(self, dt):
+        keys = pygame.key.get_pressed()
+        speed = EditorSettings.PAN_SPEED * dt / self.layout.tile_size
+        self.camera_x += (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * speed
+        self.camera_y += (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * speed
+        self.camera_x = max(0, min(self.maze.get_width() - 1, self.camera_x))
+        self.camera_y = max(0, min(self.maze.get_height() - 1, self.camera_y))
+        self.layout.follow(self.camera_x, self.camera_y, self.maze.get_width(), self.maze.get_height())
+
+    def draw_unreachable(self):
+        # Tint walkable tiles the start cannot reach, on screen only
+        tile_size = self.layout.tile_size
+        tint = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+        tint.fill(EditorSettings.UNREACHABLE_COLOR)
+        reach = self.reachability
+        x0, y0, x1, y1 = self.layout.get_visible_tiles(self.maze.get_width(), self.maze.get_height())
+        blits = []
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                i = y * reach.width + x
+                if reach.dist[i] == -1 and reach.is_walkable(i):
+                    blits.append((tint, self.layout.tile_to_screen(x, y)))
+        self.screen.blits(blits, doreturn=False)
+
+    def draw_status(self):
+        reach = self.reachability
+        goal = reach.goal_distance()
+        missing_stars = len(reach.unreachable_stars())
+        if reach.start is None:
+            status, color = "No start tile", Colors.RED
+        elif goal is None:
+            status, color = "Goal unreachable", Colors.RED
+        elif missing_stars:
+            status, color = f"Goal in {goal} steps, {missing_stars} stars unreachable", (255, 200, 0)
+        else:
+            status, color = f"Solvable: goal in {goal} steps, all {len(reach.stars)} stars reachable", Colors.GREEN
+
+        lines = [
+            (f"Level {self.level + 1}/{len(self.mazes)}  {self.maze.get_width()}x{self.maze.get_height()}"
+             f"{'  *unsaved*' if self.dirty else ''}", Colors.WHITE),
+            (f"Brush: {BRUSH_NAMES[self.brush]} (0-4)  check {self.check_ms:.2f} ms", Colors.WHITE),
+            (status, color),
+        ]
+        if self.message:
+            lines.append((self.message, Colors.TEXT_COLOR))
+        panel = pygame.Surface((self.layout.width, 26 * len(lines) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        self.screen.blit(panel, (0, 0))
+        for i, (text, color) in enumerate(lines):
+            self.screen.blit(self.ui.font_medium.render(text, True, color), (10, 8 + i * 26))
+
+        hint = "LMB paint  RMB wall  arrows pan  wheel zoom  Ctrl+Z/Y undo/redo  Ctrl+S save  Ctrl+N new  PgUp/PgDn level"
+        self.screen.blit(self.ui.font_small.render(hint, True, Colors.TEXT_COLOR), (10, self.layout.height - 24))
+
+    def render(self):
+        theme = THEMES[self.theme_name]
+        self.screen.fill(theme["bg"])
+        self.ui.draw_maze(self.maze, theme, self.theme_name)
+        self.draw_unreachable()
+        self.draw_status()
+
+    def run(self):
+        while self.running:
+            dt = self.clock.tick(60) / 1000.0
+            self.handle_events()
+            self.update_camera(dt)
+            self.render()
+            pygame.display.update()
+        if self.dirty:
+            print("Level editor closed with unsaved changes (Ctrl+S saves)")
+        pygame.quit()
@@ -0,0 +1,333 @@
+import math
+import queue
+import random
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import TileType, EndlessSettings
+from game.autotile import masks_from_padded
+from game.maze import Maze
+
+WALKABLE_TILES = (TileType.PATH, TileType.GOAL, TileType.STAR)
+
+
+def seam_doors(seed, kind, cx, cy, size):
+    # Openings in a chunk's west ("v") or north ("h") wall. Both chunks on a
+    # seam derive them from the same seed, so they always line up.
+    rng = random.Random(f"{seed}:{kind}:{cx}:{cy}")
+    cells = list(range(1, size, 2))
+    return rng.sample(cells, rng.randint(1, min(EndlessSettings.MAX_DOORS, len(cells))))
+
+
+def generate_chunk(seed, cx, cy, size=EndlessSettings.CHUNK_SIZE):
+    # Row 0 and column 0 are the chunk's north and west seam walls; cells sit
+    # on odd coordinates, so the east and south seams belong to the
+    # neighbours. Each chunk is a connected maze on its own and every seam
+    # has a door, which keeps the whole world connected.
+    rng = random.Random(f"{seed}:{cx}:{cy}")
+    tiles = [[TileType.WALL] * size for _ in range(size)]
+    cells = range(1, size, 2)
+
+    # Randomised depth-first carving over the cell grid
+    start = (rng.choice(cells), rng.choice(cells))
+    tiles[start[1]][start[0]] = TileType.PATH
+    stack = [start]
+    while stack:
+        x, y = stack[-1]
+        options = [(x + dx, y + dy, dx, dy) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                   if 0 < x + dx < size and 0 < y + dy < size and tiles[y + dy][x + dx] == TileType.WALL]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny, dx, dy = rng.choice(options)
+        tiles[y + dy // 2][x + dx // 2] = TileType.PATH
+        tiles[ny][nx] = TileType.PATH
+        stack.append((nx, ny))
+
+    # A few extra openings so there is more than one way through
+    for y in range(1, size):
+        for x in range(1, size):
+            if (x + y) % 2 and rng.random() < EndlessSettings.LOOP_CHANCE:
+                tiles[y][x] = TileType.PATH
+
+    for y in seam_doors(seed, "v", cx, cy, size):
+        tiles[y][0] = TileType.PATH
+    for x in seam_doors(seed, "h", cx, cy, size):
+        tiles[0][x] = TileType.PATH
+
+    for y in cells:
+        for x in cells:
+            if rng.random() < EndlessSettings.STAR_CHANCE:
+                tiles[y][x] = TileType.STAR
+    return tiles
+
+
+class Chunk:
+    # Built on the worker thread, including the wall grid the masks need
+    __slots__ = ("tiles", "walls", "stars", "masks")
+
+    def __init__(self, tiles):
+        self.tiles = tiles
+        self.walls = np.array(tiles) == TileType.WALL
+        self.stars = {(x, y) for y, row in enumerate(tiles) for x, tile in enumerate(row) if tile == TileType.STAR}
+        self.masks = None
+
+
+class ChunkRow:
+    # maze.data[y][x] and wall_masks[y][x] across chunks, so draw_maze works
+    # unchanged; tiles that are not loaded yet read as solid wall
+    __slots__ = ("chunks", "size", "chunk_y", "local_y", "field", "default")
+
+    def __init__(self, maze, y, field, default):
+        self.chunks = maze.chunks
+        self.size = maze.chunk_size
+        self.chunk_y, self.local_y = divmod(y, maze.chunk_size)
+        self.field = field
+        self.default = default
+
+    def __getitem__(self, x):
+        chunk_x, local_x = divmod(x, self.size)
+        chunk = self.chunks.get((chunk_x, self.chunk_y))
+        if chunk is None:
+            return self.default
+        values = getattr(chunk, self.field)
+        return values[self.local_y][local_x] if values is not None else self.default
+
+
+class ChunkRows:
+    def __init__(self, maze, field, default):
+        self.maze = maze
+        self.field = field
+        self.default = default
+
+    def __getitem__(self, y):
+        return ChunkRow(self.maze, y, self.field, self.default)
+
+
+class ChunkWorker:
+    # Generates requested chunks off the game thread
+    def __init__(self, seed, size):
+        self.seed = seed
+        self.size = size
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="chunk-worker", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                break
+            self.results.put((key, Chunk(generate_chunk(self.seed, *key, self.size))))
+
+    def close(self):
+        if not self.thread.is_alive():
+            return
+        self.requests.put(None)
+        self.thread.join()
+
+
+class EndlessMaze(Maze):
+    # An unbounded maze built from fixed-size chunks around the players.
+    # Chunks ahead of where the players are heading are generated in the
+    # background; the least recently needed ones are dropped past
+    # MAX_CHUNKS. Collected stars are remembered, so a chunk that comes back
+    # is the same as when it was left.
+    bounded = False
+
+    def __init__(self, seed, chunk_size=EndlessSettings.CHUNK_SIZE, max_chunks=EndlessSettings.MAX_CHUNKS):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()
+        self.collected = {}
+        self.requested = set()
+        self.discovered = set()
+        self.discovered_stars = 0
+        self.window = None
+        self.keep = set()
+        self.generated_in_background = 0
+        self.generated_on_demand = 0
+        self.evicted = 0
+        self.item_positions = {}
+        self.version = 0
+        self.data = ChunkRows(self, "tiles", TileType.WALL)
+        self.wall_masks = ChunkRows(self, "masks", 0b1111)
+        self.worker = ChunkWorker(seed, chunk_size)
+
+        # The world is far larger than anyone will walk, with the start in
+        # the middle so coordinates stay positive in every direction
+        self.origin = EndlessSettings.WORLD_CHUNKS // 2
+        self.start = (self.origin * chunk_size + 1, self.origin * chunk_size + 1)
+        self.load_chunk((self.origin, self.origin))
+
+    def get_width(self):
+        return EndlessSettings.WORLD_CHUNKS * self.chunk_size
+
+    def get_height(self):
+        return EndlessSettings.WORLD_CHUNKS * self.chunk_size
+
+    def get_start_position(self):
+        return self.start
+
+    def chunk_key(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def load_chunk(self, key):
+        # Used when a player steps into a chunk the worker has not delivered
+        # yet, so movement never depends on the worker's timing
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.install(key, Chunk(generate_chunk(self.seed, *key, self.chunk_size)))
+            self.generated_on_demand += 1
+        return chunk
+
+    def install(self, key, chunk):
+        if key in self.chunks:
+            return self.chunks[key]
+        if key in self.collected:
+            chunk.stars -= self.collected[key]
+        if key == (self.origin, self.origin):
+            # The start is always on a cell, so the wall grid is unaffected
+            chunk.tiles[1][1] = TileType.START
+            chunk.stars.discard((1, 1))
+        self.chunks[key] = chunk
+        self.requested.discard(key)
+        if key not in self.discovered:
+            self.discovered.add(key)
+            self.discovered_stars += len(chunk.stars)
+
+        # Seam tiles depend on the neighbours, so their masks are redone too
+        cx, cy = key
+        for neighbour in (key, (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if neighbour in self.chunks:
+                self.update_masks(neighbour)
+        self.version += 1
+        return chunk
+
+    def update_masks(self, key):
+        size = self.chunk_size
+        cx, cy = key
+        walls = np.ones((size + 2, size + 2), dtype=bool)
+        walls[1:-1, 1:-1] = self.chunks[key].walls
+        for (dx, dy), target, source in (
+                ((-1, 0), (slice(1, -1), 0), (slice(None), -1)),
+                ((1, 0), (slice(1, -1), -1), (slice(None), 0)),
+                ((0, -1), (0, slice(1, -1)), (-1, slice(None))),
+                ((0, 1), (-1, slice(1, -1)), (0, slice(None)))):
+            neighbour = self.chunks.get((cx + dx, cy + dy))
+            if neighbour is not None:
+                walls[target] = neighbour.walls[source]
+        self.chunks[key].masks = masks_from_padded(walls)
+
+    def stream(self, players, view_margin):
+        # Called once per tick: installs what the worker finished, then asks
+        # for the chunks around and ahead of each player
+        installed = False
+        for _ in range(EndlessSettings.INSTALL_BUDGET):
+            try:
+                key, chunk = self.worker.results.get_nowait()
+            except queue.Empty:
+                break
+            self.generated_in_background += 1
+            if key not in self.keep:
+                # Players moved on before it was done
+                self.requested.discard(key)
+                continue
+            self.install(key, chunk)
+            installed = True
+
+        window = tuple((self.chunk_key(p.x, p.y), ((p.x > p.prev_x) - (p.x < p.prev_x), (p.y > p.prev_y) - (p.y < p.prev_y)))
+                       for p in players)
+        if window != self.window:
+            self.window = window
+            self.request_window(window, view_margin)
+        if installed:
+            self.evict()
+        return installed
+
+    def request_window(self, window, view_margin):
+        radius = math.ceil(view_margin / self.chunk_size)
+        ring = sorted(((dx, dy) for dx in range(-radius, radius + 1) for dy in range(-radius, radius + 1)),
+                      key=lambda d: abs(d[0]) + abs(d[1]))
+        wanted = []
+        for (cx, cy), (hx, hy) in window:
+            wanted.extend((cx + dx, cy + dy) for dx, dy in ring)
+            # A fan of chunks past the view in the direction of travel
+            for step in range(radius + 1, radius + 1 + EndlessSettings.LOOKAHEAD):
+                for side in (0, -1, 1):
+                    wanted.append((cx + hx * step + hy * side, cy + hy * step + hx * side))
+
+        for key in wanted:
+            if key in self.chunks:
+                self.chunks.move_to_end(key)
+            elif key not in self.requested:
+                self.requested.add(key)
+                self.worker.requests.put(key)
+        self.keep = set(wanted)
+        self.evict()
+
+    def evict(self):
+        # Least recently wanted first; chunks still in view are never dropped,
+        # so the bound grows rather than the screen going blank
+        limit = max(self.max_chunks, len(self.keep))
+        while len(self.chunks) > limit:
+            key, chunk = self.chunks.popitem(last=False)
+            if key in self.keep:
+                self.chunks[key] = chunk
+                continue
+            self.evicted += 1
+
+    def can_move_to(self, x, y):
+        chunk = self.load_chunk(self.chunk_key(x, y))
+        return chunk.tiles[y % self.chunk_size][x % self.chunk_size] in WALKABLE_TILES
+
+    def get_tile_type(self, x, y):
+        chunk = self.load_chunk(self.chunk_key(x, y))
+        return chunk.tiles[y % self.chunk_size][x % self.chunk_size]
+
+    def collect_star(self, x, y):
+        key = self.chunk_key(x, y)
+        chunk = self.chunks.get(key)
+        local = (x % self.chunk_size, y % self.chunk_size)
+        if chunk is None or local not in chunk.stars:
+            return False
+        chunk.stars.discard(local)
+        self.collected.setdefault(key, set()).add(local)
+        self.version += 1
+        return True
+
+    def has_star_at(self, x, y):
+        chunk = self.chunks.get(self.chunk_key(x, y))
+        return chunk is not None and (x % self.chunk_size, y % self.chunk_size) in chunk.stars
+
+    @property
+    def stars_positions(self):
+        size = self.chunk_size
+        return [(cx * size + x, cy * size + y) for (cx, cy), chunk in self.chunks.items() for x, y in chunk.stars]
+
+    def get_stars_count(self):
+        return sum(len(chunk.stars) for chunk in self.chunks.values())
+
+    def get_total_stars_count(self):
+        # Stars in every chunk seen so far; grows as the world is explored
+        return self.discovered_stars
+
+    def is_goal_position(self, x, y):
+        return False
+
+    def generate_item_positions(self, theme_name, asset_manager, rng=random):
+        pass
+
+    def get_stats(self):
+        return {
+            "loaded_chunks": len(self.chunks),
+            "discovered_chunks": len(self.discovered),
+            "background": self.generated_in_background,
+            "on_demand": self.generated_on_demand,
+            "evicted": self.evicted,
+        }
+
+    def close(self):
+        self.worker.close()
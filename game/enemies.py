@@ -0,0 +1,126 @@
+import numpy as np
+from config import TileType, EnemySettings
+
+UNREACHED = np.iinfo(np.int32).max
+WALKABLE_TILES = [TileType.PATH, TileType.GOAL, TileType.STAR]
+
+
+class FlowField:
+    # Distance in steps from every walkable tile to the nearest target tile,
+    # on a grid padded with a wall border so neighbours never go out of range
+    def __init__(self, maze, max_distance=EnemySettings.FIELD_RADIUS):
+        self.width = maze.get_width()
+        self.height = maze.get_height()
+        self.stride = self.width + 2
+        self.max_distance = max_distance
+        grid = np.zeros((self.height + 2, self.stride), dtype=bool)
+        grid[1:-1, 1:-1] = np.isin(np.array(maze.data), WALKABLE_TILES)
+        self.walkable = grid.ravel()
+        self.offsets = np.array([1, -1, self.stride, -self.stride])
+        self.distance = np.full(self.walkable.size, UNREACHED, dtype=np.int32)
+        self.targets = None
+
+    def to_index(self, x, y):
+        return (y + 1) * self.stride + (x + 1)
+
+    def to_tile(self, index):
+        return index % self.stride - 1, index // self.stride - 1
+
+    def update(self, targets):
+        targets = tuple(targets)
+        if targets == self.targets:
+            return False
+        self.targets = targets
+        self.compute([self.to_index(x, y) for x, y in targets])
+        return True
+
+    def compute(self, sources):
+        # Breadth-first wavefront where each ring is expanded as one array
+        # operation, so the cost follows the reached area, not the maze size
+        self.distance.fill(UNREACHED)
+        frontier = np.unique(np.array(sources, dtype=np.int64))
+        self.distance[frontier] = 0
+        for step in range(1, self.max_distance + 1):
+            neighbours = (frontier[:, None] + self.offsets).ravel()
+            neighbours = neighbours[self.walkable[neighbours] & (self.distance[neighbours] == UNREACHED)]
+            if not neighbours.size:
+                break
+            frontier = np.unique(neighbours)
+            self.distance[frontier] = step
+
+
+class EnemySwarm:
+    # All enemies live in flat arrays and step together down the flow field
+    def __init__(self, maze, count, rng, avoid=(), move_delay_ticks=EnemySettings.MOVE_DELAY_TICKS):
+        self.field = FlowField(maze)
+        self.move_delay_ticks = max(1, move_delay_ticks)
+        self.spawns = self.pick_spawns(count, rng, avoid)
+        self.positions = self.spawns.copy()
+        self.previous = self.positions.copy()
+        self.cooldown = np.array([rng.randrange(self.move_delay_ticks) for _ in range(len(self.positions))],
+                                 dtype=np.int32)
+        self.ticks_since_move = np.full(len(self.positions), self.move_delay_ticks, dtype=np.int32)
+
+    @property
+    def count(self):
+        return len(self.positions)
+
+    def pick_spawns(self, count, rng, avoid):
+        # Keep enemies away from where the players start
+        candidates = np.flatnonzero(self.field.walkable)
+        if avoid:
+            self.field.compute([self.field.to_index(x, y) for x, y in avoid])
+            far = self.field.distance[candidates] >= EnemySettings.SPAWN_MIN_DISTANCE
+            if far.any():
+                candidates = candidates[far]
+        if not candidates.size or not count:
+            return np.zeros(0, dtype=np.int64)
+        return np.array([candidates[rng.randrange(candidates.size)] for _ in range(count)], dtype=np.int64)
+
+    def tick(self, targets):
+        if not self.count:
+            return
+        self.field.update(targets)
+        self.cooldown -= 1
+        self.ticks_since_move += 1
+
+        ready = np.flatnonzero(self.cooldown <= 0)
+        if not ready.size:
+            return
+        current = self.positions[ready]
+        neighbours = current[:, None] + self.field.offsets
+        # Sources may be unwalkable (the start tile), which makes it a safe zone
+        distances = np.where(self.field.walkable[neighbours], self.field.distance[neighbours], UNREACHED)
+        best = distances.argmin(axis=1)
+        best_distance = distances[np.arange(ready.size), best]
+
+        # Only step when it gets closer; agents outside the field wait
+        moving = best_distance < self.field.distance[current]
+        movers = ready[moving]
+        self.previous[movers] = self.positions[movers]
+        self.positions[movers] = neighbours[moving, best[moving]]
+        self.ticks_since_move[movers] = 0
+        self.cooldown[ready] = self.move_delay_ticks
+
+    def collisions(self, x, y, came_from=None):
+        # came_from: the tile a player left this tick. An enemy that stepped
+        # the opposite way this tick passed through them, which also counts.
+        here = self.field.to_index(x, y)
+        hit = self.positions == here
+        if came_from is not None:
+            there = self.field.to_index(*came_from)
+            hit |= (self.positions == there) & (self.previous == here) & (self.ticks_since_move == 0)
+        return np.flatnonzero(hit)
+
+    def respawn(self, indices):
+        self.positions[indices] = self.spawns[indices]
+        self.previous[indices] = self.spawns[indices]
+        self.ticks_since_move[indices] = self.move_delay_ticks
+
+    def get_render_positions(self, alpha=1.0):
+        # Same slide as Player.get_render_position, for every enemy at once
+        t = np.minimum(1.0, (self.ticks_since_move + alpha) / self.move_delay_ticks)
+        stride = self.field.stride
+        x = self.previous % stride - 1 + (self.positions % stride - self.previous % stride) * t
+        y = self.previous // stride - 1 + (self.positions // stride - self.previous // stride) * t
+        return x, y
@@ -0,0 +1,103 @@
+import numpy as np
+from config import TileType, FogSettings
+
+# Octant transforms for shadowcasting: (xx, xy, yx, yy)
+OCTANTS = [
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+]
+
+
+class FieldOfView:
+    # Tiles in line of sight of the players, recomputed only when one of them
+    # changes tile. Walls block sight; everything else is see-through.
+    def __init__(self, maze, radius=FogSettings.RADIUS):
+        self.width = maze.get_width()
+        self.height = maze.get_height()
+        self.radius = radius
+        self.opaque = [[tile == TileType.WALL for tile in row] for row in maze.data]
+        self.visible = set()
+        self.explored = np.zeros((self.height, self.width), dtype=bool)
+        self.origins = None
+        self.changed = []
+        self.version = 0
+
+    def update(self, origins):
+        origins = tuple(origins)
+        if origins == self.origins:
+            return False
+        self.origins = origins
+
+        visible = set()
+        for x, y in origins:
+            visible |= self.compute(x, y)
+
+        # Only tiles whose visibility flipped need redrawing
+        self.changed.extend(visible ^ self.visible)
+        self.visible = visible
+        if visible:
+            xs, ys = zip(*visible)
+            self.explored[list(ys), list(xs)] = True
+        self.version += 1
+        return True
+
+    def pop_changes(self):
+        changed, self.changed = self.changed, []
+        return changed
+
+    def is_visible(self, x, y):
+        return (x, y) in self.visible
+
+    def is_explored(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.explored[y, x])
+
+    def is_opaque(self, x, y):
+        return not (0 <= x < self.width and 0 <= y < self.height) or self.opaque[y][x]
+
+    def compute(self, origin_x, origin_y):
+        visible = {(origin_x, origin_y)}
+        for octant in OCTANTS:
+            self.cast_light(origin_x, origin_y, 1, 1.0, 0.0, octant, visible)
+        return visible
+
+    def cast_light(self, cx, cy, row, start, end, octant, visible):
+        # Recursive shadowcasting: scan one octant row by row, narrowing the
+        # lit slope range at every wall and recursing past its edges
+        if start < end:
+            return
+        xx, xy, yx, yy = octant
+        radius = self.radius
+        radius_sq = radius * radius
+        new_start = start
+        for distance in range(row, radius + 1):
+            dx = -distance - 1
+            dy = -distance
+            blocked = False
+            while dx <= 0:
+                dx += 1
+                left_slope = (dx - 0.5) / (dy + 0.5)
+                right_slope = (dx + 0.5) / (dy - 0.5)
+                if start < right_slope:
+                    continue
+                if end > left_slope:
+                    break
+
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                in_bounds = 0 <= x < self.width and 0 <= y < self.height
+                if in_bounds and dx * dx + dy * dy <= radius_sq:
+                    visible.add((x, y))
+
+                opaque = not in_bounds or self.opaque[y][x]
+                if blocked:
+                    if opaque:
+                        new_start = right_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif opaque and distance < radius:
+                    blocked = True
+                    self.cast_light(cx, cy, distance + 1, start, left_slope, octant, visible)
+                    new_start = right_slope
+            if blocked:
+                break
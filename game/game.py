@@ -1,61 +1,163 @@
 import pygame
+import random
 import sys
+import time
 from config import *
+from game.endless import EndlessMaze
+from game.enemies import EnemySwarm
+from game.fog import FieldOfView
 from game.game_state import GameState
+from game.hot_reload import MazeWatcher
+from game.layout import Layout
 from game.maze import MazeLoader
+from game.particles import ParticleSystem
 from game.player import Player
+from game.profiler import FrameProfiler
+from game.replay import InputFrame, KEY_LEFT, KEY_RIGHT, KEY_UP, KEY_DOWN, HELP_ON
+from game.rules import apply_move
+from game.scheduler import IdleScheduler
+from game.telemetry import Telemetry
+from net.protocol import unpack_stars
 from game.ui import UI, CharacterSelection
 from assets.asset_manager import AssetManager
-from controllers.hand_controller import HandGestureController, CameraManager
+from controllers.frame_sources import CameraManager
+from controllers.hand_controller import HandGestureController
+from controllers.latency import LatencyTracker
 
 class Game:
-    def __init__(self):
+    def __init__(self, recorder=None, replayer=None, replay_fast=False, profile=False, two_player=False,
+                 frame_source=None, net_client=None, fog=FogSettings.ENABLED,
+                 enemies=EnemySettings.COUNT, watch=False, video_recorder=None,
+                 predict_gestures=HandGestureSettings.PREDICTION_ENABLED, endless=False):
         pygame.init()
         pygame.mixer.init()
         
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        self.window_flags = pygame.RESIZABLE if DisplaySettings.RESIZABLE else 0
+        self.windowed_size = (WIDTH, HEIGHT)
+        self.fullscreen = False
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), self.window_flags)
         pygame.display.set_caption("Maze Adventure")
         
+        self.layout = Layout(WIDTH, HEIGHT)
         self.asset_manager = AssetManager()
         self.game_state = GameState()
-        self.ui = UI(self.screen, self.asset_manager)
+        self.ui = UI(self.screen, self.asset_manager, self.layout)
         self.character_selection = CharacterSelection(self.screen, self.asset_manager)
-        self.hand_controller = HandGestureController()
-        self.camera_manager = CameraManager()
+        self.two_player = two_player
+        self.hand_controller = HandGestureController(2 if two_player else HandGestureSettings.MAX_NUM_HANDS,
+                                                     predict=predict_gestures)
+        self.camera_manager = frame_source or CameraManager()
+        self.external_source = frame_source is not None
         
-        self.asset_manager.load_all_assets()
+        self.asset_manager.load_all_assets(self.layout.tile_size)
         
         self.mazes = []
         self.current_maze = None
         self.player = None
+        self.players = []
         self.selected_character = None
+        self.second_character = None
+        self.second_gesture = (0, 0)
+        self.net_client = net_client
+        self.remote_players = {}
+        self.star_order = []
+        self.fog_enabled = fog
+        self.fog = None
+        self.enemy_count = enemies
+        self.enemies = None
+        self.watch = watch
+        self.maze_watcher = None
+        self.endless = endless
         
         self.clock = pygame.time.Clock()
         self.current_camera_frame = None 
         
+        self.recorder = recorder
+        self.video_recorder = video_recorder
+        self.replayer = replayer
+        self.replay_fast = replay_fast
+        if replayer:
+            seed = replayer.seed
+        elif recorder:
+            seed = recorder.seed
+        else:
+            seed = None
+        self.rng = random.Random(seed)
+        
+        self.latency_tracker = LatencyTracker()
+        self.pending_gesture = None
+        
+        self.profiler = FrameProfiler()
+        self.profiler.set_enabled(profile)
+        self.telemetry = Telemetry()
+        self.scheduler = IdleScheduler()
+        self.particles = ParticleSystem()
+        
     def initialize_game(self):
-        self.selected_character = self.character_selection.show_selection()
+        if not self.replayer:
+            self.selected_character = self.character_selection.show_selection()
+            # The selection screen handles its own resize events, so catch
+            # the game's layout and sprites up with the window it left
+            size = pygame.display.get_surface().get_size()
+            if size != (self.layout.width, self.layout.height):
+                self.windowed_size = size
+                self.apply_window_size()
         if not self.selected_character:
-            self.selected_character = self.asset_manager.get_character()
+            self.selected_character = self.asset_manager.get_random_character_name()
+        if self.two_player or self.net_client:
+            others = [name for name in self.asset_manager.characters if name != self.selected_character]
+            self.second_character = random.choice(others) if others else self.selected_character
+            self.game_state.set_player_count(2 if self.two_player else 1)
+        
+        # A video, image or synthetic source stands in for the webcam, so
+        # start it straight away
+        if self.external_source and self.camera_manager.start_camera():
+            self.game_state.camera_on = True
         
         self.mazes = MazeLoader.load_mazes_from_file()
         if not self.mazes:
             print("No mazes loaded!")
             return False
+        if self.watch:
+            self.maze_watcher = MazeWatcher()
         
-        self.start_level(0)
+        if self.net_client:
+            if not self.net_client.connect():
+                return False
+            print(f"Joined room {self.net_client.room_id} as player {self.net_client.player_id + 1}")
+        
+        self.start_level(self.net_client.level if self.net_client else 0)
         return True
     
     def start_level(self, level_index):
-        if level_index >= len(self.mazes):
+        if self.endless:
+            # One level that never ends; the seed comes from the game's rng
+            # so recordings replay the same world
+            if self.current_maze:
+                self.current_maze.close()
+            self.current_maze = EndlessMaze(self.rng.randrange(2 ** 32))
+        elif level_index >= len(self.mazes):
             self.game_state.win_game()
             return
-        
-        self.current_maze = self.mazes[level_index]
+        else:
+            self.current_maze = self.mazes[level_index]
+        if self.net_client:
+            # The server owns the stars; keep a pristine copy so its bitmap
+            # lines up with the original star order
+            self.current_maze = self.current_maze.copy()
+            self.star_order = list(self.current_maze.stars_positions)
+            self.remote_players = {}
         self.game_state.current_level = level_index
         
         start_x, start_y = self.current_maze.get_start_position()
-        self.player = Player(start_x, start_y)
+        self.players = [Player(start_x, start_y) for _ in range(2 if self.two_player else 1)]
+        self.player = self.players[0]
+        
+        # Sight is precomputed over the whole grid, so an endless maze has none
+        self.fog = FieldOfView(self.current_maze) if self.fog_enabled and self.current_maze.bounded else None
+        self.enemies = None
+        if self.enemy_count and not self.net_client:
+            self.enemies = EnemySwarm(self.current_maze, self.enemy_count, self.rng, [(start_x, start_y)])
         
         total_stars = self.current_maze.get_total_stars_count()
         self.game_state.reset_for_new_level(total_stars)
@@ -64,38 +166,86 @@ class Game:
         new_theme = themes_list[level_index % len(themes_list)]
         self.game_state.change_theme(new_theme)
         self.asset_manager.play_theme_music(new_theme)
-        self.current_maze.generate_item_positions(new_theme, self.asset_manager)
-        print(f"Level {level_index + 1} started! Theme: {THEMES[new_theme]['name']}")
+        self.current_maze.generate_item_positions(new_theme, self.asset_manager, self.rng)
+        self.telemetry.emit("level_start", level=level_index + 1, theme=THEMES[new_theme]['name'],
+                            stars=total_stars, width=self.current_maze.get_width(),
+                            height=self.current_maze.get_height())
     
-    def handle_input(self):
-        dx, dy = 0, 0
+    def read_input(self):
+        timestamp = time.perf_counter()
+        if self.game_state.help_on:
+            return InputFrame(HELP_ON, timestamp=timestamp)
+        
+        gesture = (0, 0)
+        landmarks = None
+        self.second_gesture = (0, 0)
+        
+        if self.game_state.camera_on and getattr(self.camera_manager, "probe_failed", False):
+            # The background probe could not open the camera after all
+            self.camera_manager.stop_camera()
+            self.game_state.camera_on = False
+            self.telemetry.emit("camera_toggled", on=False)
         
         if self.game_state.camera_on:
             frame = self.camera_manager.get_frame()
+            stamp = self.camera_manager.last_stamp
+            self.profiler.lap("camera")
             if frame is not None:
-                processed_frame, results = self.hand_controller.process_frame(frame)
+                processed_frame, results = self.hand_controller.process_frame(frame, stamp)
+                self.profiler.lap("inference")
                 self.current_camera_frame = processed_frame
-                dx, dy = self.hand_controller.get_direction(results, frame.shape[1], frame.shape[0])
+                if self.two_player:
+                    # Both hands come out of the same inference pass
+                    gesture, self.second_gesture = self.hand_controller.get_directions(
+                        results, frame.shape[1], frame.shape[0])
+                else:
+                    gesture = self.hand_controller.get_direction(results, frame.shape[1], frame.shape[0], stamp)
+                
+                committed_stamp = self.hand_controller.pop_committed_stamp()
+                if committed_stamp:
+                    self.pending_gesture = (committed_stamp, gesture)
+                elif gesture == (0, 0):
+                    self.pending_gesture = None
+                if self.recorder and self.recorder.record_landmarks and results.multi_hand_landmarks:
+                    landmarks = [(lm.x, lm.y, lm.z) for lm in results.multi_hand_landmarks[0].landmark]
             else:
                 self.current_camera_frame = None
         else:
             self.current_camera_frame = None
         
-        # Keyboard input (overrides hand gesture)
         keys = pygame.key.get_pressed()
+        key_bits = 0
         if keys[pygame.K_LEFT]:
-            dx = -1
-        elif keys[pygame.K_RIGHT]:
-            dx = 1
-        elif keys[pygame.K_UP]:
-            dy = -1
-        elif keys[pygame.K_DOWN]:
-            dy = 1
+            key_bits |= KEY_LEFT
+        if keys[pygame.K_RIGHT]:
+            key_bits |= KEY_RIGHT
+        if keys[pygame.K_UP]:
+            key_bits |= KEY_UP
+        if keys[pygame.K_DOWN]:
+            key_bits |= KEY_DOWN
         
-        return dx, dy
+        return InputFrame(key_bits, gesture, landmarks, timestamp)
+    
+    def read_second_direction(self):
+        # Player two uses WASD, which replaces the right-hand gesture; one key
+        # wins so the move is always along a single axis
+        if self.game_state.help_on:
+            return 0, 0
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_a]:
+            return -1, 0
+        elif keys[pygame.K_d]:
+            return 1, 0
+        elif keys[pygame.K_w]:
+            return 0, -1
+        elif keys[pygame.K_s]:
+            return 0, 1
+        return self.second_gesture
     
     def handle_events(self):
         for event in pygame.event.get():
+            self.scheduler.mark_dirty()
+            
             if event.type == pygame.QUIT:
                 self.cleanup()
                 return False
@@ -106,13 +256,56 @@ class Game:
                 elif event.key == pygame.K_ESCAPE:
                     self.cleanup()
                     return False
+                elif event.key == pygame.K_F11:
+                    self.toggle_fullscreen()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                elif event.key == pygame.K_F4 and self.profiler.enabled:
+                    print(f"Profile exported to {self.profiler.export()}.*")
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not self.game_state.help_on:
                     self.handle_mouse_click(pygame.mouse.get_pos())
+            
+            elif event.type == pygame.VIDEORESIZE and not self.fullscreen:
+                self.windowed_size = (event.w, event.h)
+                self.apply_window_size()
+            
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.scheduler.set_focused(False)
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.scheduler.set_focused(True)
         
         return True
     
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode(self.windowed_size, self.window_flags)
+        self.apply_window_size()
+    
+    def apply_window_size(self):
+        # Sprites are rescaled here, once per size change, never while rendering
+        self.screen = pygame.display.get_surface()
+        self.ui.set_screen(self.screen)
+        self.character_selection.screen = self.screen
+        self.asset_manager.set_tile_size(self.layout.tile_size)
+        self.scheduler.mark_dirty()
+    
+    def is_frame_active(self, direction, second_direction=(0, 0)):
+        if self.game_state.camera_on or self.profiler.overlay_on or self.net_client:
+            return True
+        if direction != (0, 0) or second_direction != (0, 0):
+            return True
+        if self.particles.alive_count or self.enemies:
+            return True
+        return any(player.is_sliding() for player in self.players)
+    
+    def is_animating(self):
+        return not self.game_state.help_on and self.current_maze.get_stars_count() > 0
+    
     def handle_mouse_click(self, mouse_pos):
         cam_rect, exit_rect, help_rect = self.get_ui_rects()
         
@@ -124,6 +317,7 @@ class Game:
             else:
                 if self.camera_manager.start_camera():
                     self.game_state.camera_on = True
+            self.telemetry.emit("camera_toggled", on=self.game_state.camera_on)
                     
         elif exit_rect.collidepoint(mouse_pos):
             self.cleanup()
@@ -133,31 +327,149 @@ class Game:
             self.game_state.toggle_help()
     
     def get_ui_rects(self):
-        camera_pos = (10, HEIGHT-130)
-        exit_pos = (70, HEIGHT-130)
-        help_pos = (140, HEIGHT-130)
-        
-        return (
-            pygame.Rect(*camera_pos, 50, 50),
-            pygame.Rect(*exit_pos, 50, 50),
-            pygame.Rect(*help_pos, 50, 50)
-        )
+        return self.layout.get_ui_rects()
     
-    def update_game_logic(self):
+    def update_game_logic(self, direction, second_direction=(0, 0)):
+        if self.net_client:
+            # Snapshots keep coming while help is open, so the socket is
+            # drained either way; the player just stands still
+            if self.game_state.help_on:
+                self.update_network((0, 0))
+                return
+            self.particles.update(1.0 / GameSettings.TICK_RATE)
+            self.update_network(direction)
+            return
+        
         if self.game_state.help_on:
             return
         
-        dx, dy = self.handle_input()
+        self.particles.update(1.0 / GameSettings.TICK_RATE)
         
-        if (dx != 0 or dy != 0):
-            if self.player.try_move(dx, dy, self.current_maze, GameSettings.MOVE_DELAY):
-                if self.player.collect_star_at_position(self.current_maze):
-                    self.game_state.collect_star()
-                    self.asset_manager.play_sound('star_collect')
-                    print(f"Star collected! Total: {self.game_state.stars_collected}")
-                
-                if self.player.is_at_goal(self.current_maze):
-                    self.complete_level()
+        directions = [direction, second_direction]
+        for index, player in enumerate(self.players):
+            # A goal restarts the level and replaces the player list
+            if self.move_player(index, player, directions[index]):
+                return
+        
+        if self.enemies:
+            self.update_enemies()
+        if self.endless:
+            self.stream_chunks()
+    
+    def stream_chunks(self):
+        # Keep the chunks under the view loaded and queue the ones ahead
+        view_margin = max(self.layout.width, self.layout.height) // self.layout.tile_size // 2 + 1
+        if self.current_maze.stream(self.players, view_margin):
+            # Newly explored chunks bring more stars to find
+            self.game_state.set_total_stars(self.current_maze.get_total_stars_count())
+            self.scheduler.mark_dirty()
+    
+    def update_enemies(self):
+        # One shared field toward the players, rebuilt only when one of them
+        # reaches a new tile, moves every enemy in a single step
+        self.enemies.tick([player.get_position() for player in self.players])
+        for index, player in enumerate(self.players):
+            came_from = (player.prev_x, player.prev_y) if player.ticks_since_move == 0 else None
+            caught = self.enemies.collisions(player.x, player.y, came_from)
+            if caught.size:
+                self.enemies.respawn(caught)
+                self.game_state.add_score(-EnemySettings.COLLISION_PENALTY)
+                self.game_state.add_player_score(index, -EnemySettings.COLLISION_PENALTY)
+                player.set_position(*self.current_maze.get_start_position())
+                self.telemetry.emit("enemy_caught", player=index, penalty=EnemySettings.COLLISION_PENALTY)
+    
+    def move_player(self, index, player, direction):
+        player.tick()
+        dx, dy = direction
+        
+        moved, star_collected, reached_goal = apply_move(
+            player, self.current_maze, self.game_state, dx, dy, GameSettings.MOVE_DELAY_TICKS)
+        
+        # The first move acting on a committed gesture closes its latency sample
+        if index == 0 and moved and self.pending_gesture and self.pending_gesture[1] == direction:
+            self.latency_tracker.record_move(self.pending_gesture[0])
+            self.pending_gesture = None
+        
+        if moved:
+            self.telemetry.emit("move", player=index, x=player.x, y=player.y)
+        if moved or player.is_sliding():
+            self.emit_player_trail(player)
+        
+        if star_collected:
+            self.game_state.add_player_score(index, GameSettings.STAR_POINTS)
+            self.emit_star_burst(player.x, player.y)
+            self.asset_manager.play_sound('star_collect')
+            self.telemetry.emit("star_collected", player=index, x=player.x, y=player.y,
+                                stars=self.game_state.stars_collected)
+        
+        if reached_goal:
+            self.game_state.add_player_score(index, GameSettings.LEVEL_COMPLETE_POINTS)
+            self.complete_level()
+        return reached_goal
+    
+    def update_network(self, direction):
+        # The server is authoritative: send our input, then take positions,
+        # scores and stars from its snapshots
+        self.net_client.send_input(*direction)
+        self.player.tick()
+        for player in self.remote_players.values():
+            player.tick()
+        
+        for tick, level, players, left, star_bits in self.net_client.poll():
+            self.apply_snapshot(level, players, left, star_bits)
+        
+        if not self.net_client.connected:
+            print("Disconnected from server")
+            self.game_state.quit_game()
+    
+    def apply_snapshot(self, level, players, left, star_bits):
+        if level != self.game_state.current_level:
+            self.asset_manager.play_sound('done')
+            self.emit_fireworks()
+            self.start_level(level)
+        
+        for player_id, x, y, score in players:
+            if player_id == self.net_client.player_id:
+                player = self.player
+                self.game_state.score = score
+            else:
+                player = self.remote_players.setdefault(player_id, Player(x, y))
+            if (x, y) != (player.x, player.y):
+                # Slide between server positions like a local move
+                player.prev_x, player.prev_y = player.x, player.y
+                player.x, player.y = x, y
+                player.move_ticks = max(1, GameSettings.MOVE_DELAY_TICKS)
+                player.ticks_since_move = 0
+                self.emit_player_trail(player)
+        
+        for player_id in left:
+            self.remote_players.pop(player_id, None)
+        
+        if star_bits:
+            present = unpack_stars(star_bits, len(self.star_order))
+            stars = [position for position, on in zip(self.star_order, present) if on]
+            for x, y in set(self.current_maze.stars_positions) - set(stars):
+                self.emit_star_burst(x, y)
+                self.asset_manager.play_sound('star_collect')
+            self.current_maze.set_stars(stars)
+            self.game_state.stars_collected = len(self.star_order) - len(stars)
+    
+    def emit_player_trail(self, player):
+        x, y = self.layout.tile_world_center(*player.get_render_position())
+        self.particles.emit(ParticleSettings.PLAYER_TRAIL, x, y + self.layout.tile_size // 4,
+                            speed=(5.0, 25.0), life=(0.2, 0.4), colors=[Colors.WHITE], sizes=[0])
+    
+    def emit_star_burst(self, x, y):
+        self.particles.emit(ParticleSettings.STAR_BURST, *self.layout.tile_world_center(x, y),
+                            colors=[(255, 215, 0), (255, 140, 0)])
+    
+    def emit_fireworks(self):
+        width, height = self.layout.width, self.layout.height
+        for _ in range(ParticleSettings.FIREWORK_BURSTS):
+            self.particles.emit(ParticleSettings.FIREWORK_PARTICLES,
+                                self.layout.view_x + random.randint(width // 5, width * 4 // 5),
+                                self.layout.view_y + random.randint(height // 8, height // 2),
+                                speed=(60.0, 220.0), life=(0.8, 1.6))
     
     def update_camera_preview(self):
         if self.game_state.camera_on:
@@ -167,10 +479,12 @@ class Game:
                 self.ui.draw_camera_preview(processed_frame)
     
     def complete_level(self):
-        print(f"Level {self.game_state.current_level + 1} completed! Score: {self.game_state.score}")
+        self.telemetry.emit("level_complete", level=self.game_state.current_level + 1, score=self.game_state.score,
+                            stars=self.game_state.stars_collected)
         
         self.game_state.complete_level()
         self.asset_manager.play_sound('done')
+        self.emit_fireworks()
         
         next_level = self.game_state.current_level
         if next_level < len(self.mazes):
@@ -179,45 +493,203 @@ class Game:
         else:
             self.game_state.win_game()
     
-    def render(self):
+    def render(self, alpha=1.0):
         if self.game_state.help_on:
             self.ui.draw_help_screen()
         else:
             theme = self.game_state.get_current_theme()
             self.screen.fill(theme["bg"])
             
+            positions = [player.get_render_position(alpha) for player in self.players]
+            focus_x = sum(x for x, _ in positions) / len(positions)
+            focus_y = sum(y for _, y in positions) / len(positions)
+            self.layout.follow(focus_x, focus_y, self.current_maze.get_width(), self.current_maze.get_height())
             self.ui.draw_maze(self.current_maze, theme, self.game_state.current_theme)
+            if self.fog:
+                # Sight is from the tiles the players stand on, so this is a
+                # no-op until one of them reaches a new tile
+                self.fog.update(player.get_position() for player in self.players)
+                self.ui.draw_fog(self.fog)
+            self.profiler.lap("draw_maze")
             
-            self.ui.draw_player(self.player, self.selected_character)
+            if self.enemies:
+                self.ui.draw_enemies(self.enemies, alpha, self.fog)
+            self.ui.draw_player(self.player, self.asset_manager.get_character(self.selected_character), alpha)
+            if self.two_player:
+                self.ui.draw_player(self.players[1], self.asset_manager.get_character(self.second_character), alpha)
+            for player in self.remote_players.values():
+                if not self.fog or self.fog.is_visible(player.x, player.y):
+                    self.ui.draw_player(player, self.asset_manager.get_character(self.second_character), alpha)
+            self.ui.draw_particles(self.particles)
+            self.ui.draw_minimap(self.current_maze, self.game_state.current_theme, self.players, alpha, self.fog)
             
             self.ui.draw_game_ui(self.game_state)
             self.ui.draw_icons(self.game_state)
             
             if self.game_state.camera_on and hasattr(self, 'current_camera_frame') and self.current_camera_frame is not None:
                 self.ui.draw_camera_preview(self.current_camera_frame)
+                self.ui.draw_latency(self.latency_tracker.get_live_text())
+        
+        if self.profiler.overlay_on:
+            self.ui.draw_profiler_overlay(self.profiler)
+        self.profiler.lap("hud")
     
     def run(self):
         if not self.initialize_game():
             print("Failed to initialize game!")
             return
         
+        if self.replayer:
+            self.run_replay()
+        else:
+            self.run_loop()
+        
+        if self.game_state.game_won:
+            self.ui.show_game_over(self.game_state.score)
+        
+        self.cleanup()
+    
+    def run_loop(self):
+        tick_duration = 1.0 / GameSettings.TICK_RATE
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        
+        spike_seconds = TelemetrySettings.SPIKE_MS / 1000.0
+        
         while self.game_state.game_running:
+            frame_start = time.perf_counter()
+            self.profiler.begin_frame()
             if not self.handle_events():
                 break
+            self.profiler.lap("events")
+            
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, GameSettings.MAX_FRAME_TIME)
+            previous_time = current_time
+            
+            # Input is sampled once per frame and held for every tick it covers
+            frame_input = self.read_input()
+            direction = frame_input.get_direction()
+            second_direction = self.read_second_direction() if self.two_player else (0, 0)
+            self.profiler.lap("input")
             
-            self.update_game_logic()
+            while accumulator >= tick_duration and self.game_state.game_running:
+                if self.recorder:
+                    self.recorder.record_tick(frame_input)
+                self.update_game_logic(direction, second_direction)
+                accumulator -= tick_duration
+            self.profiler.lap("logic")
+            
+            if not self.game_state.game_running:
+                break
             
-            self.render()
+            if self.maze_watcher:
+                self.check_hot_reload()
             
-            pygame.display.update()
-            self.clock.tick(GameSettings.FPS)
+            # Only redraw when something visible changed, otherwise sleep
+            # until the next event or animation step
+            animating = self.is_animating()
+            if self.scheduler.needs_render(self.is_frame_active(direction, second_direction), animating):
+                self.render(accumulator / tick_duration)
+                
+                pygame.display.update()
+                if self.video_recorder:
+                    self.video_recorder.capture(self.screen)
+                self.profiler.lap("display")
+                # Work time only: idle waits are expected to be long
+                frame_time = time.perf_counter() - frame_start
+                if frame_time > spike_seconds:
+                    self.telemetry.emit("frame_spike", ms=round(frame_time * 1000.0, 2),
+                                        level=self.game_state.current_level + 1)
+                self.clock.tick(GameSettings.FPS)
+            else:
+                self.scheduler.wait(animating)
+                # Nothing was moving while we slept, so the wait is not
+                # simulated; otherwise the next input would run for a
+                # burst of catch-up ticks
+                previous_time = time.perf_counter()
+                if self.video_recorder:
+                    # Nothing was redrawn, but the video still needs frames
+                    self.video_recorder.capture(self.screen)
+            self.profiler.lap("wait")
+            self.profiler.end_frame()
+    
+    def check_hot_reload(self):
+        # Swap edited levels in between frames; the level being played only
+        # restarts when its own block changed
+        changes = self.maze_watcher.poll()
+        if not changes or not changes.level_count:
+            return
         
-        if self.game_state.game_won:
-            self.ui.show_game_over(self.game_state.score)
+        for index, maze in changes.updated.items():
+            if index < len(self.mazes):
+                self.mazes[index] = maze
+            else:
+                self.mazes.append(maze)
+        del self.mazes[changes.level_count:]
         
-        self.cleanup()
+        current = self.game_state.current_level
+        if current >= len(self.mazes):
+            self.start_level(len(self.mazes) - 1)
+        elif current in changes.updated:
+            self.start_level(current)
+        self.scheduler.mark_dirty()
+        print(f"Reloaded {len(changes.updated)} of {changes.level_count} levels in {changes.elapsed_ms:.2f} ms")
+    
+    def run_replay(self):
+        start_time = time.perf_counter()
+        last_timestamp = None
+        
+        for frame_input in self.replayer:
+            if not self.game_state.game_running:
+                break
+            
+            # Ticks sampled in the same frame share a timestamp
+            if frame_input.timestamp != last_timestamp:
+                if last_timestamp is not None:
+                    self.render()
+                    pygame.display.update()
+                    if self.video_recorder:
+                        # Recorded time, so fast replays still make real-time videos
+                        self.video_recorder.capture(self.screen, last_timestamp)
+                if not self.handle_events():
+                    return
+                if not self.replay_fast:
+                    delay = start_time + frame_input.timestamp - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                last_timestamp = frame_input.timestamp
+            
+            self.game_state.help_on = frame_input.help_on
+            self.update_game_logic(frame_input.get_direction())
+        
+        if self.replayer.matches(self.game_state):
+            print("Replay finished: final state matches the recording")
+        elif self.replayer.final_state is not None:
+            print(f"Replay finished: final state differs from the recording {self.replayer.final_state}")
     
     def cleanup(self):
+        if self.profiler.enabled and self.profiler.frames:
+            print(f"Profile exported to {self.profiler.export()}.*")
+            self.profiler.set_enabled(False)
+        summary_file = self.latency_tracker.write_summary()
+        if summary_file:
+            print(f"Gesture latency summary written to {summary_file}")
+        if self.recorder:
+            self.recorder.close(self.game_state)
+        self.telemetry.close()
+        if self.video_recorder:
+            self.video_recorder.close()
+        if self.two_player:
+            print(f"Hand tracking cost: {self.hand_controller.get_cost_summary()}")
+        prediction_stats = self.hand_controller.get_prediction_stats()
+        if prediction_stats and prediction_stats["predictions"]:
+            print(f"Gesture prediction: {prediction_stats}")
         self.camera_manager.stop_camera()
         self.hand_controller.close()
+        if self.net_client:
+            self.net_client.close()
+        if self.endless and self.current_maze:
+            print(f"Endless world: {self.current_maze.get_stats()}")
+            self.current_maze.close()
         pygame.quit()
\ No newline at end of file
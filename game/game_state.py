@@ -11,6 +11,14 @@ class GameState:
         self.help_on = False
         self.game_running = True
         self.game_won = False
+        self.player_scores = []
+        
+    def set_player_count(self, count):
+        self.player_scores = [0] * count
+        
+    def add_player_score(self, index, points):
+        if index < len(self.player_scores):
+            self.player_scores[index] += points
         
     def add_score(self, points):
         self.score += points
@@ -0,0 +1,80 @@
+import random
+import time
+from config import MAZE_FILE
+from game.game_state import GameState
+from game.maze import MazeLoader
+from game.player import Player
+from game.rules import apply_move
+
+# Action indices shared by every headless environment
+NOOP, UP, DOWN, LEFT, RIGHT = range(5)
+ACTIONS = [(0, 0), (0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+class HeadlessEnv:
+    def __init__(self, maze_file=MAZE_FILE):
+        self.mazes = MazeLoader.load_mazes_from_file(maze_file)
+        self.maze = None
+        self.player = None
+        self.game_state = None
+        self.done = False
+        self.steps = 0
+        
+    def get_level_count(self):
+        return len(self.mazes)
+    
+    def reset(self, level=0):
+        self.maze = self.mazes[level].copy()
+        self.game_state = GameState()
+        self.game_state.current_level = level
+        self.game_state.reset_for_new_level(self.maze.get_total_stars_count())
+        
+        start_x, start_y = self.maze.get_start_position()
+        self.player = Player(start_x, start_y)
+        self.done = False
+        return self.get_observation()
+    
+    def get_observation(self):
+        return (self.player.x, self.player.y,
+                self.game_state.stars_collected, self.game_state.total_stars)
+    
+    def step(self, action):
+        if self.done:
+            return self.get_observation(), 0, True
+        
+        dx, dy = ACTIONS[action]
+        score_before = self.game_state.score
+        
+        # Every step is a move opportunity, so no tick cooldown applies
+        moved, star_collected, reached_goal = apply_move(
+            self.player, self.maze, self.game_state, dx, dy, move_delay_ticks=0)
+        
+        if reached_goal:
+            self.game_state.complete_level()
+            self.done = True
+        
+        self.steps += 1
+        return self.get_observation(), self.game_state.score - score_before, self.done
+
+
+def measure_steps_per_second(env, num_steps=100000, seed=0):
+    rng = random.Random(seed)
+    actions = [rng.randrange(len(ACTIONS)) for _ in range(num_steps)]
+    levels = env.get_level_count()
+    episode = 0
+    
+    env.reset(0)
+    start_time = time.perf_counter()
+    for action in actions:
+        _, _, done = env.step(action)
+        if done:
+            episode += 1
+            env.reset(episode % levels)
+    elapsed = time.perf_counter() - start_time
+    
+    return num_steps / elapsed if elapsed > 0 else float("inf")
+
+
+if __name__ == "__main__":
+    env = HeadlessEnv()
+    print(f"Headless env: {measure_steps_per_second(env):,.0f} steps/second")
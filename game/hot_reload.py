@@ -0,0 +1,104 @@
+import hashlib
+import os
+import re
+import time
+from config import HotReloadSettings, MAZE_FILE
+from game.maze import Maze
+
+# Same rule as MazeLoader: any line starting with "#" begins a new level
+SEPARATOR = re.compile(rb"^[ \t]*#[^\n]*(?:\n|$)", re.MULTILINE)
+
+
+def split_blocks(data):
+    return [block for block in SEPARATOR.split(data) if block.strip()]
+
+
+def block_hash(block):
+    return hashlib.blake2b(block, digest_size=16).digest()
+
+
+def parse_block(block):
+    rows = [list(map(int, line.split())) for line in block.decode().splitlines() if line.strip()]
+    # A block cut off mid-row by a save in progress is ragged
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError("maze rows differ in length")
+    return Maze(rows)
+
+
+class MazeChanges:
+    def __init__(self, level_count, updated, elapsed_ms):
+        self.level_count = level_count
+        self.updated = updated  # {level index: new Maze}
+        self.elapsed_ms = elapsed_ms
+
+
+class MazeWatcher:
+    # Polls the maze file's stat and, when it changes, reparses only the
+    # level blocks whose hash differs from the last good read
+    def __init__(self, filename=MAZE_FILE, interval=HotReloadSettings.POLL_INTERVAL):
+        self.filename = filename
+        self.interval = interval
+        self.next_poll = 0.0
+        self.signature = None
+        self.changed_at = 0.0
+        self.settling = False
+        self.hashes = []
+        self.prime()
+
+    def stat_signature(self):
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read_blocks(self):
+        with open(self.filename, "rb") as f:
+            return split_blocks(f.read())
+
+    def prime(self):
+        self.signature = self.stat_signature()
+        try:
+            self.hashes = [block_hash(block) for block in self.read_blocks()]
+        except OSError:
+            self.hashes = []
+
+    def poll(self):
+        # Returns None unless the file changed; cheap enough to call per frame
+        now = time.perf_counter()
+        if now < self.next_poll:
+            return None
+        self.next_poll = now + self.interval
+
+        signature = self.stat_signature()
+        if signature is None:
+            return None
+        if signature != self.signature:
+            self.signature = signature
+            self.changed_at = now
+        elif not self.settling:
+            return None
+
+        start = time.perf_counter()
+        try:
+            blocks = self.read_blocks()
+            # Fewer levels may just be a save caught between blocks, so a
+            # drop only counts once the file has stopped changing
+            self.settling = (len(blocks) < len(self.hashes) and
+                             now - self.changed_at < HotReloadSettings.SETTLE_TIME)
+            if self.settling:
+                return None
+            hashes = [block_hash(block) for block in blocks]
+            updated = {}
+            for index, (block, digest) in enumerate(zip(blocks, hashes)):
+                if index >= len(self.hashes) or self.hashes[index] != digest:
+                    updated[index] = parse_block(block)
+        except (OSError, ValueError) as e:
+            # Likely caught mid-save; the next write will trigger a retry
+            print(f"Maze reload skipped: {e}")
+            return None
+
+        if not updated and len(hashes) == len(self.hashes):
+            return None
+        self.hashes = hashes
+        return MazeChanges(len(blocks), updated, (time.perf_counter() - start) * 1000.0)
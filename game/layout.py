@@ -0,0 +1,59 @@
+import pygame
+from config import DisplaySettings, GRID_WIDTH, GRID_HEIGHT, WIDTH, HEIGHT
+
+
+class Layout:
+    def __init__(self, width=WIDTH, height=HEIGHT):
+        self.view_x = 0
+        self.view_y = 0
+        self.resize(width, height)
+        
+    def resize(self, width, height):
+        self.width = width
+        self.height = height
+        # The window always shows GRID_WIDTH x GRID_HEIGHT tiles, like the
+        # original fixed 800x720 layout did
+        self.tile_size = max(DisplaySettings.MIN_TILE_SIZE,
+                             min(width // GRID_WIDTH, height // GRID_HEIGHT))
+        
+    def get_ui_rects(self):
+        camera_pos = (10, self.height-130)
+        exit_pos = (70, self.height-130)
+        help_pos = (140, self.height-130)
+        
+        return (
+            pygame.Rect(*camera_pos, 50, 50),
+            pygame.Rect(*exit_pos, 50, 50),
+            pygame.Rect(*help_pos, 50, 50)
+        )
+    
+    def follow(self, x, y, maze_width, maze_height):
+        # Keeps the tile at (x, y) centred once the maze outgrows the window
+        self.view_x = self.clamp_view(x * self.tile_size + self.tile_size // 2 - self.width // 2,
+                                      maze_width * self.tile_size - self.width)
+        self.view_y = self.clamp_view(y * self.tile_size + self.tile_size // 2 - self.height // 2,
+                                      maze_height * self.tile_size - self.height)
+        
+    @staticmethod
+    def clamp_view(offset, limit):
+        if limit <= 0:
+            return 0
+        return int(min(max(offset, 0), limit))
+    
+    def get_visible_tiles(self, maze_width, maze_height):
+        tile = self.tile_size
+        x0 = max(0, self.view_x // tile)
+        y0 = max(0, self.view_y // tile)
+        x1 = min(maze_width, (self.view_x + self.width) // tile + 1)
+        y1 = min(maze_height, (self.view_y + self.height) // tile + 1)
+        return x0, y0, x1, y1
+    
+    def tile_to_screen(self, x, y):
+        return int(x * self.tile_size) - self.view_x, int(y * self.tile_size) - self.view_y
+    
+    def tile_world_center(self, x, y):
+        return int(x * self.tile_size) + self.tile_size // 2, int(y * self.tile_size) + self.tile_size // 2
+    
+    def tile_center(self, x, y):
+        sx, sy = self.tile_to_screen(x, y)
+        return sx + self.tile_size // 2, sy + self.tile_size // 2
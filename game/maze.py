@@ -1,10 +1,16 @@
 from config import TileType, MAZE_FILE
+from game.autotile import compute_wall_masks, update_wall_masks
+import os
 import random
 class Maze:
+    bounded = True  # The whole grid is in memory
+    
     def __init__(self, maze_data):
         self.data = maze_data
         self.item_positions = {}
         self.stars_positions = self._find_stars()
+        self.wall_masks = None
+        self.version = 0  # Bumped whenever a tile or star changes
         
     def _find_stars(self):
         stars = []
@@ -33,12 +39,29 @@ class Maze:
             return self.data[y][x]
         return TileType.WALL
     
+    def get_wall_masks(self):
+        # Built on first draw; edits through set_tile keep it current
+        if self.wall_masks is None:
+            self.wall_masks = compute_wall_masks(self.data)
+        return self.wall_masks
+    
+    def set_tile(self, x, y, tile):
+        self.data[y][x] = tile
+        self.version += 1
+        if self.wall_masks is not None:
+            update_wall_masks(self.wall_masks, self.data, x, y)
+    
     def collect_star(self, x, y):
         if (x, y) in self.stars_positions:
             self.stars_positions.remove((x, y))
+            self.version += 1
             return True
         return False
     
+    def set_stars(self, stars_positions):
+        self.stars_positions = stars_positions
+        self.version += 1
+    
     def has_star_at(self, x, y):
         return (x, y) in self.stars_positions
     
@@ -61,18 +84,23 @@ class Maze:
     
     def get_height(self):
         return len(self.data)
+    
+    def copy(self):
+        # Fresh maze with every star back in place
+        return Maze([row[:] for row in self.data])
 
-    def generate_item_positions(self, theme_name, asset_manager):
-        items = asset_manager.get_theme_assets(theme_name)['items']
-        if not items:
+    def generate_item_positions(self, theme_name, asset_manager, rng=random):
+        # Positions map to item indices so sprites can be rescaled freely
+        item_count = asset_manager.get_item_count(theme_name)
+        if not item_count:
             return
         
         for y, row in enumerate(self.data):
             for x, tile in enumerate(row):
-                if random.random() < 0.1:
-                    if tile == TileType.WALL and len(self.item_positions) < len(items): 
+                if rng.random() < 0.1:
+                    if tile == TileType.WALL and len(self.item_positions) < item_count: 
                         if (x, y) not in self.item_positions:
-                            self.item_positions[(x, y)] = random.choice(items)
+                            self.item_positions[(x, y)] = rng.randrange(item_count)
 
 class MazeLoader:
     @staticmethod
@@ -108,6 +136,19 @@ class MazeLoader:
             
         return mazes
     
+    @staticmethod
+    def save_mazes_to_file(mazes, filename=MAZE_FILE):
+        # Written to a temporary file first so a crash never leaves a
+        # half-written level pack behind
+        temp_file = filename + ".tmp"
+        with open(temp_file, "w") as f:
+            for maze in mazes:
+                f.write("#\n")
+                for row in maze.data:
+                    f.write(" ".join(map(str, row)) + "\n")
+                f.write("\n")
+        os.replace(temp_file, filename)
+    
     @staticmethod
     def get_sample_maze():
         sample_data = [
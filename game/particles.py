@@ -0,0 +1,118 @@
+import math
+import numpy as np
+import pygame
+from config import ParticleSettings
+
+
+class ParticleSystem:
+    def __init__(self, capacity=ParticleSettings.CAPACITY, palette=ParticleSettings.PALETTE,
+                 sizes=ParticleSettings.SIZES, gravity=ParticleSettings.GRAVITY):
+        self.capacity = capacity
+        self.palette = list(palette)
+        self.sizes = list(sizes)
+        self.gravity = gravity
+        self.fade_levels = ParticleSettings.FADE_LEVELS
+        
+        # Struct of arrays: one slot per particle, dead slots have life <= 0
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.alive_count = 0
+        
+        self.sprites = []
+        self.sprite_offsets = []
+        self.build_sprites()
+        self.rng = np.random.default_rng()
+        
+    def build_sprites(self):
+        # One pre-rendered sprite per (color, size, fade level)
+        for color in self.palette:
+            for radius in self.sizes:
+                for fade in range(self.fade_levels):
+                    alpha = int(255 * (fade + 1) / self.fade_levels)
+                    sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                    pygame.draw.circle(sprite, (*color[:3], alpha), (radius, radius), radius)
+                    self.sprites.append(sprite)
+                    self.sprite_offsets.append(radius)
+        self.sprite_offsets = np.array(self.sprite_offsets, dtype=np.float32)
+    
+    def get_color_index(self, color):
+        if color not in self.palette:
+            return 0
+        return self.palette.index(color)
+    
+    def emit(self, count, x, y, speed=(40.0, 160.0), spread=(0.0, 2 * math.pi),
+             life=(0.5, 1.2), colors=None, sizes=None):
+        # Recycle dead slots from the fixed pool; excess particles are dropped
+        slots = np.flatnonzero(self.life <= 0)[:count]
+        n = len(slots)
+        if n == 0:
+            return 0
+        
+        angles = self.rng.uniform(spread[0], spread[1], n)
+        speeds = self.rng.uniform(speed[0], speed[1], n)
+        self.position[slots, 0] = x
+        self.position[slots, 1] = y
+        self.velocity[slots, 0] = np.cos(angles) * speeds
+        self.velocity[slots, 1] = np.sin(angles) * speeds
+        lifetimes = self.rng.uniform(life[0], life[1], n)
+        self.life[slots] = lifetimes
+        self.max_life[slots] = lifetimes
+        
+        color_choices = [self.get_color_index(c) for c in colors] if colors else range(len(self.palette))
+        self.color[slots] = self.rng.choice(list(color_choices), n)
+        size_choices = sizes if sizes is not None else range(len(self.sizes))
+        self.size[slots] = self.rng.choice(list(size_choices), n)
+        
+        self.alive_count += n
+        return n
+    
+    def emit_area(self, count, rect, velocity=(0.0, 0.0), jitter=30.0, life=(2.0, 4.0), colors=None):
+        slots = np.flatnonzero(self.life <= 0)[:count]
+        n = len(slots)
+        if n == 0:
+            return 0
+        
+        self.position[slots, 0] = self.rng.uniform(rect[0], rect[0] + rect[2], n)
+        self.position[slots, 1] = self.rng.uniform(rect[1], rect[1] + rect[3], n)
+        self.velocity[slots] = self.rng.uniform(-jitter, jitter, (n, 2)) + velocity
+        lifetimes = self.rng.uniform(life[0], life[1], n)
+        self.life[slots] = lifetimes
+        self.max_life[slots] = lifetimes
+        color_choices = [self.get_color_index(c) for c in colors] if colors else range(len(self.palette))
+        self.color[slots] = self.rng.choice(list(color_choices), n)
+        self.size[slots] = self.rng.integers(0, len(self.sizes), n)
+        
+        self.alive_count += n
+        return n
+    
+    def update(self, dt):
+        if self.alive_count == 0:
+            return
+        alive = self.life > 0
+        self.velocity[alive, 1] += self.gravity * dt
+        self.position[alive] += self.velocity[alive] * dt
+        self.life[alive] -= dt
+        self.alive_count = int(np.count_nonzero(self.life > 0))
+    
+    def draw(self, surface, offset=(0, 0)):
+        if self.alive_count == 0:
+            return
+        alive = np.flatnonzero(self.life > 0)
+        
+        fade = np.minimum((self.life[alive] / self.max_life[alive] * self.fade_levels).astype(np.int32),
+                          self.fade_levels - 1)
+        keys = (self.color[alive] * len(self.sizes) + self.size[alive]) * self.fade_levels + fade
+        offsets = self.sprite_offsets[keys]
+        xs = (self.position[alive, 0] - offsets + offset[0]).astype(np.int32).tolist()
+        ys = (self.position[alive, 1] - offsets + offset[1]).astype(np.int32).tolist()
+        
+        sprites = self.sprites
+        surface.blits([(sprites[k], (x, y)) for k, x, y in zip(keys.tolist(), xs, ys)], doreturn=False)
+    
+    def clear(self):
+        self.life[:] = 0
+        self.alive_count = 0
@@ -1,39 +1,68 @@
-import time
+from config import GameSettings
 
 class Player:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.last_move_time = 0
+        self.prev_x = x
+        self.prev_y = y
+        self.move_cooldown = 0
+        self.move_ticks = 1
+        self.ticks_since_move = 1
         
     def set_position(self, x, y):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.ticks_since_move = self.move_ticks
         
     def get_position(self):
         return self.x, self.y
         
-    def can_move(self, move_delay=0.2):
-        current_time = time.time()
-        return current_time - self.last_move_time > move_delay
+    def tick(self):
+        # Advance one fixed simulation step
+        if self.move_cooldown > 0:
+            self.move_cooldown -= 1
+        self.ticks_since_move += 1
         
-    def try_move(self, dx, dy, maze, move_delay=0.2):
-        if not self.can_move(move_delay):
+    def can_move(self):
+        return self.move_cooldown <= 0
+        
+    def try_move(self, dx, dy, maze, move_delay_ticks=GameSettings.MOVE_DELAY_TICKS):
+        if not self.can_move():
             return False
             
         new_x = self.x + dx
         new_y = self.y + dy
         
         if maze.can_move_to(new_x, new_y):
+            self.prev_x = self.x
+            self.prev_y = self.y
             self.x = new_x
             self.y = new_y
-            self.last_move_time = time.time()
+            self.move_cooldown = move_delay_ticks
+            self.move_ticks = max(1, move_delay_ticks)
+            self.ticks_since_move = 0
             return True
             
         return False
+    
+    def is_sliding(self):
+        # True until a frame has been drawn with the move fully finished
+        return self.ticks_since_move <= self.move_ticks
+    
+    def get_render_position(self, alpha=1.0):
+        # alpha is the fraction of a tick elapsed since the last simulation step
+        if self.ticks_since_move >= self.move_ticks:
+            return float(self.x), float(self.y)
+        
+        t = min(1.0, (self.ticks_since_move + alpha) / self.move_ticks)
+        return (self.prev_x + (self.x - self.prev_x) * t,
+                self.prev_y + (self.y - self.prev_y) * t)
         
     def is_at_goal(self, maze):
         return maze.is_goal_position(self.x, self.y)
         
     def collect_star_at_position(self, maze):
-        return maze.collect_star(self.x, self.y)
\ No newline at end of file
+        return maze.collect_star(self.x, self.y)
@@ -0,0 +1,118 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+import numpy as np
+from config import ProfilerSettings
+
+PHASES = ["events", "camera", "inference", "input", "logic", "draw_maze", "hud", "display", "wait"]
+
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    def __init__(self, history_frames=ProfilerSettings.HISTORY_FRAMES,
+                 trace_events=ProfilerSettings.TRACE_EVENTS):
+        self.phase_index = {phase: i for i, phase in enumerate(PHASES)}
+        self.frames = deque(maxlen=history_frames)
+        self.trace = deque(maxlen=trace_events)
+        self.frame_count = 0
+        self.enabled = False
+        self.overlay_on = False
+        self._current = [0.0] * len(PHASES)
+        self._last_time = 0.0
+        self._origin = time.perf_counter()
+        self.set_enabled(False)
+        
+    def set_enabled(self, enabled):
+        # Disabled profiling swaps every hook for a no-op so the game loop
+        # pays one empty call per phase and nothing else.
+        self.enabled = enabled
+        if enabled:
+            # Usually switched on mid-frame (F3 is handled in the events
+            # phase), so measuring starts with the next full frame
+            self.begin_frame = self._start
+            self.lap = _noop
+            self.end_frame = _noop
+        else:
+            self.begin_frame = _noop
+            self.lap = _noop
+            self.end_frame = _noop
+            self.overlay_on = False
+    
+    def toggle_overlay(self):
+        self.overlay_on = not self.overlay_on
+        if self.overlay_on and not self.enabled:
+            self.set_enabled(True)
+        return self.overlay_on
+    
+    def _start(self):
+        self.begin_frame = self._begin_frame
+        self.lap = self._lap
+        self.end_frame = self._end_frame
+        self._begin_frame()
+    
+    def _begin_frame(self):
+        self._current = [0.0] * len(PHASES)
+        self._last_time = time.perf_counter()
+    
+    def _lap(self, phase):
+        # Charges the time since the previous lap to this phase
+        now = time.perf_counter()
+        duration = now - self._last_time
+        self._current[self.phase_index[phase]] += duration
+        self.trace.append((phase, self._last_time - self._origin, duration))
+        self._last_time = now
+    
+    def _end_frame(self):
+        self.frames.append(tuple(self._current))
+        self.frame_count += 1
+    
+    def get_stats(self):
+        if not self.frames:
+            return {}
+        ms = np.array(self.frames) * 1000.0
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99], axis=0)
+        
+        stats = {}
+        for i, phase in enumerate(PHASES):
+            stats[phase] = {
+                "last_ms": float(ms[-1, i]),
+                "p50_ms": float(p50[i]),
+                "p95_ms": float(p95[i]),
+                "p99_ms": float(p99[i]),
+            }
+        total = ms.sum(axis=1)
+        stats["frame"] = {
+            "last_ms": float(total[-1]),
+            "p50_ms": float(np.percentile(total, 50)),
+            "p95_ms": float(np.percentile(total, 95)),
+            "p99_ms": float(np.percentile(total, 99)),
+        }
+        return stats
+    
+    def export(self, directory=ProfilerSettings.EXPORT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, time.strftime("profile_%Y%m%d_%H%M%S"))
+        
+        with open(base + ".csv", "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame"] + [f"{phase}_ms" for phase in PHASES])
+            first_frame = self.frame_count - len(self.frames)
+            for i, frame in enumerate(self.frames):
+                writer.writerow([first_frame + i] + [f"{t * 1000.0:.4f}" for t in frame])
+        
+        with open(base + ".json", "w") as f:
+            json.dump({"phases": PHASES, "stats": self.get_stats()}, f, indent=2)
+        
+        # Chrome trace format, viewable in chrome://tracing or Perfetto
+        events = [{"name": phase, "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                   "ts": round(start * 1e6, 1), "dur": round(duration * 1e6, 1)}
+                  for phase, start, duration in self.trace]
+        with open(base + ".trace.json", "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        
+        return base
@@ -0,0 +1,150 @@
+import heapq
+from collections import deque
+from config import TileType
+
+WALKABLE_TILES = (TileType.PATH, TileType.GOAL, TileType.STAR)
+UNREACHED = -1
+
+
+class Reachability:
+    # Step distance from the start tile to every walkable tile. Edits go
+    # through set_tile, which repairs only the distances the edit can change.
+    def __init__(self, maze):
+        self.maze = maze
+        self.width = maze.get_width()
+        self.height = maze.get_height()
+        self.tiles = [tile for row in maze.data for tile in row]
+        self.dist = [UNREACHED] * len(self.tiles)
+        self.stars = {i for i, tile in enumerate(self.tiles) if tile == TileType.STAR}
+        self.goals = {i for i, tile in enumerate(self.tiles) if tile == TileType.GOAL}
+        self.start = None
+        self.last_touched = 0
+        self.recompute()
+
+    def neighbours(self, i):
+        x = i % self.width
+        if x > 0:
+            yield i - 1
+        if x < self.width - 1:
+            yield i + 1
+        if i >= self.width:
+            yield i - self.width
+        if i < len(self.tiles) - self.width:
+            yield i + self.width
+
+    def is_walkable(self, i):
+        return self.tiles[i] in WALKABLE_TILES
+
+    def recompute(self):
+        self.dist = [UNREACHED] * len(self.tiles)
+        self.start = next((i for i, tile in enumerate(self.tiles) if tile == TileType.START), None)
+        if self.start is None:
+            self.last_touched = len(self.tiles)
+            return
+        self.dist[self.start] = 0
+        self.last_touched = self.spread([self.start])
+
+    def spread(self, queue):
+        # Breadth-first relaxation from tiles whose distance just improved
+        queue = deque(queue)
+        dist = self.dist
+        touched = 0
+        while queue:
+            u = queue.popleft()
+            next_dist = dist[u] + 1
+            for n in self.neighbours(u):
+                if self.tiles[n] in WALKABLE_TILES and (dist[n] == UNREACHED or dist[n] > next_dist):
+                    dist[n] = next_dist
+                    queue.append(n)
+                    touched += 1
+        return touched
+
+    def set_tile(self, x, y, tile):
+        i = y * self.width + x
+        old = self.tiles[i]
+        if old == tile:
+            return False
+        self.tiles[i] = tile
+        self.maze.set_tile(x, y, tile)
+
+        for kind, positions in ((TileType.STAR, self.stars), (TileType.GOAL, self.goals)):
+            if old == kind:
+                positions.discard(i)
+            if tile == kind:
+                positions.add(i)
+        if old == TileType.STAR:
+            self.maze.collect_star(x, y)
+        if tile == TileType.STAR:
+            self.maze.stars_positions.append((x, y))
+
+        if old == TileType.START or tile == TileType.START:
+            self.recompute()
+        elif old in WALKABLE_TILES and tile not in WALKABLE_TILES:
+            self.remove(i)
+        elif tile in WALKABLE_TILES and old not in WALKABLE_TILES:
+            self.add(i)
+        else:
+            self.last_touched = 0
+        return True
+
+    def add(self, i):
+        reached = [self.dist[n] for n in self.neighbours(i) if self.dist[n] != UNREACHED]
+        if not reached:
+            self.last_touched = 1
+            return
+        self.dist[i] = min(reached) + 1
+        self.last_touched = 1 + self.spread([i])
+
+    def remove(self, i):
+        dist = self.dist
+        if dist[i] == UNREACHED:
+            self.last_touched = 1
+            return
+
+        # Tiles lose their distance only if every neighbour one step closer
+        # to the start was itself affected. Walking outward in distance order
+        # means each level's affected set is final before the next is tested.
+        affected = {i}
+        queue = deque([i])
+        while queue:
+            u = queue.popleft()
+            child_dist = dist[u] + 1
+            for n in self.neighbours(u):
+                if dist[n] != child_dist or n in affected:
+                    continue
+                supported = any(dist[v] == child_dist - 1 and v not in affected for v in self.neighbours(n))
+                if not supported:
+                    affected.add(n)
+                    queue.append(n)
+
+        for u in affected:
+            dist[u] = UNREACHED
+        affected.discard(i)
+
+        # Re-seed the affected region from its unaffected border and settle
+        # it in distance order
+        heap = []
+        for u in affected:
+            border = [dist[v] for v in self.neighbours(u) if dist[v] != UNREACHED]
+            if border:
+                heap.append((min(border) + 1, u))
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if dist[u] != UNREACHED and dist[u] <= d:
+                continue
+            dist[u] = d
+            for n in self.neighbours(u):
+                if n in affected and (dist[n] == UNREACHED or dist[n] > d + 1):
+                    heapq.heappush(heap, (d + 1, n))
+        self.last_touched = len(affected) + 1
+
+    def get_distance(self, x, y):
+        return self.dist[y * self.width + x]
+
+    def goal_distance(self):
+        reached = [self.dist[i] for i in self.goals if self.dist[i] != UNREACHED]
+        return min(reached) if reached else None
+
+    def unreachable_stars(self):
+        return [(i % self.width, i // self.width) for i in self.stars if self.dist[i] == UNREACHED]
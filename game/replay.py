@@ -0,0 +1,128 @@
+import random
+import struct
+import time
+
+# Keyboard state is packed into one byte per tick
+KEY_LEFT = 1
+KEY_RIGHT = 2
+KEY_UP = 4
+KEY_DOWN = 8
+HELP_ON = 16
+
+MAGIC = b"MAZR"
+VERSION = 2
+HEADER = struct.Struct("<4sHQBH")  # magic, version, seed, flags, enemies
+HEADER_V1 = struct.Struct("<4sHQB")  # Logs from before enemies were recorded
+HEADER_PREFIX = struct.Struct("<4sH")
+FLAG_LANDMARKS = 1
+FLAG_ENDLESS = 2
+TICK_RECORD = struct.Struct("<cIdBbbB")
+LANDMARK = struct.Struct("<3f")
+END_RECORD = struct.Struct("<ciii")
+TICK_TAG = b"T"
+END_TAG = b"E"
+
+
+class InputFrame:
+    __slots__ = ("key_bits", "gesture", "landmarks", "timestamp")
+    
+    def __init__(self, key_bits=0, gesture=(0, 0), landmarks=None, timestamp=0.0):
+        self.key_bits = key_bits
+        self.gesture = gesture
+        self.landmarks = landmarks
+        self.timestamp = timestamp
+        
+    @property
+    def help_on(self):
+        return bool(self.key_bits & HELP_ON)
+    
+    def get_direction(self):
+        dx, dy = self.gesture
+        
+        # Keyboard input (overrides hand gesture)
+        if self.key_bits & KEY_LEFT:
+            dx = -1
+        elif self.key_bits & KEY_RIGHT:
+            dx = 1
+        elif self.key_bits & KEY_UP:
+            dy = -1
+        elif self.key_bits & KEY_DOWN:
+            dy = 1
+        
+        return dx, dy
+
+
+class InputRecorder:
+    def __init__(self, filename, seed=None, record_landmarks=False, enemies=0, endless=False):
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.record_landmarks = record_landmarks
+        self.enemies = enemies
+        self.endless = endless
+        self.tick = 0
+        self.start_time = time.perf_counter()
+        self.file = open(filename, "wb")
+        flags = (FLAG_LANDMARKS if record_landmarks else 0) | (FLAG_ENDLESS if endless else 0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.seed, flags, enemies))
+        
+    def record_tick(self, frame_input):
+        landmarks = frame_input.landmarks if self.record_landmarks and frame_input.landmarks else ()
+        dx, dy = frame_input.gesture
+        
+        self.file.write(TICK_RECORD.pack(TICK_TAG, self.tick, frame_input.timestamp - self.start_time,
+                                         frame_input.key_bits, dx, dy, len(landmarks)))
+        for point in landmarks:
+            self.file.write(LANDMARK.pack(*point))
+        self.tick += 1
+        
+    def close(self, game_state=None):
+        if self.file.closed:
+            return
+        if game_state is not None:
+            self.file.write(END_RECORD.pack(END_TAG, game_state.score,
+                                            game_state.current_level, game_state.stars_collected))
+        self.file.close()
+
+
+class InputReplayer:
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            self.data = f.read()
+        
+        magic, version = HEADER_PREFIX.unpack_from(self.data, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{filename} is not a Maze Adventure input log")
+        if version == 1:
+            _, _, self.seed, flags = HEADER_V1.unpack_from(self.data, 0)
+            self.enemies = 0
+            self.header_size = HEADER_V1.size
+        else:
+            _, _, self.seed, flags, self.enemies = HEADER.unpack_from(self.data, 0)
+            self.header_size = HEADER.size
+        self.has_landmarks = bool(flags & FLAG_LANDMARKS)
+        self.endless = bool(flags & FLAG_ENDLESS)
+        self.final_state = None
+        
+    def __iter__(self):
+        data = self.data
+        offset = self.header_size
+        
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            if tag == END_TAG:
+                _, score, level, stars = END_RECORD.unpack_from(data, offset)
+                self.final_state = (score, level, stars)
+                return
+            
+            _, _, timestamp, key_bits, dx, dy, count = TICK_RECORD.unpack_from(data, offset)
+            offset += TICK_RECORD.size
+            landmarks = None
+            if count:
+                landmarks = [LANDMARK.unpack_from(data, offset + i * LANDMARK.size) for i in range(count)]
+                offset += count * LANDMARK.size
+            
+            yield InputFrame(key_bits, (dx, dy), landmarks, timestamp)
+            
+    def matches(self, game_state):
+        if self.final_state is None:
+            return False
+        return self.final_state == (game_state.score, game_state.current_level, game_state.stars_collected)
@@ -0,0 +1,17 @@
+from config import GameSettings
+
+def apply_move(player, maze, game_state, dx, dy, move_delay_ticks=GameSettings.MOVE_DELAY_TICKS):
+    # Shared by the interactive game and the headless environments so that
+    # star collection, goal detection and scoring can never drift apart.
+    # Returns (moved, star_collected, reached_goal).
+    if dx == 0 and dy == 0:
+        return False, False, False
+    
+    if not player.try_move(dx, dy, maze, move_delay_ticks):
+        return False, False, False
+    
+    star_collected = player.collect_star_at_position(maze)
+    if star_collected:
+        game_state.collect_star()
+    
+    return True, star_collected, player.is_at_goal(maze)
@@ -0,0 +1,64 @@
+import pygame
+from config import IdleSettings
+
+
+class IdleScheduler:
+    def __init__(self):
+        self.enabled = IdleSettings.ENABLED
+        self.dirty = True
+        self.focused = True
+        self.animation_phase = None
+        self.music_busy = None
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+        
+    def mark_dirty(self):
+        self.dirty = True
+        
+    def set_focused(self, focused):
+        self.focused = focused
+        self.dirty = True
+    
+    def get_animation_fps(self):
+        return IdleSettings.ANIMATION_FPS if self.focused else IdleSettings.UNFOCUSED_ANIMATION_FPS
+    
+    def get_animation_phase(self):
+        return pygame.time.get_ticks() * self.get_animation_fps() // 1000
+    
+    def needs_render(self, active, animating):
+        # active: something visible changes every frame (input, movement, camera)
+        # animating: idle animations such as pulsing stars are on screen
+        if not self.enabled:
+            return True
+        
+        render = self.dirty or active
+        
+        if animating:
+            phase = self.get_animation_phase()
+            if phase != self.animation_phase:
+                self.animation_phase = phase
+                render = True
+        
+        music_busy = pygame.mixer.get_init() is not None and pygame.mixer.music.get_busy()
+        if music_busy != self.music_busy:
+            self.music_busy = music_busy
+            render = True
+        
+        self.dirty = False
+        if render:
+            self.rendered_frames += 1
+        else:
+            self.skipped_frames += 1
+        return render
+    
+    def wait(self, animating):
+        # Blocks until an event arrives or the next animation phase is due
+        if animating:
+            fps = self.get_animation_fps()
+            timeout = 1000 // fps - pygame.time.get_ticks() % (1000 // fps)
+        else:
+            timeout = IdleSettings.IDLE_TIMEOUT_MS
+        
+        event = pygame.event.wait(max(1, timeout))
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from config import TelemetrySettings
+
+# Console lines for events that used to be printed from the game loop
+MESSAGES = {
+    "level_start": "Level {level} started! Theme: {theme}",
+    "level_complete": "Level {level} completed! Score: {score}",
+    "star_collected": "Star collected! Total: {stars}",
+    "enemy_caught": "Caught by an enemy! -{penalty} points",
+}
+
+
+def _noop(*args, **fields):
+    pass
+
+
+class Telemetry:
+    # Events go into a preallocated ring buffer; a background thread turns
+    # them into newline-delimited JSON. Emitting never formats, allocates a
+    # slot or touches a file, and a writer that falls behind loses the
+    # oldest events (counted) instead of stalling the game.
+    def __init__(self, enabled=TelemetrySettings.ENABLED, directory=TelemetrySettings.DIRECTORY,
+                 capacity=TelemetrySettings.CAPACITY, echo=TelemetrySettings.ECHO):
+        self.directory = directory
+        self.path = os.path.join(directory, TelemetrySettings.FILE_NAME)
+        self.capacity = capacity
+        self.echo = echo
+        self.times = [0.0] * capacity
+        self.kinds = [None] * capacity
+        self.fields = [None] * capacity
+        self.head = 0  # Events emitted so far
+        self.tail = 0  # Events handed to the writer so far
+        self.dropped = 0
+        self.written = 0
+        self.file = None
+        self.session = int(time.time() * 1000)
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.enabled = False
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.emit = self._emit
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.write_loop, name="telemetry-writer", daemon=True)
+                self.thread.start()
+        else:
+            self.emit = _noop
+
+    def _emit(self, kind, **fields):
+        slot = self.head % self.capacity
+        self.times[slot] = time.time()
+        self.kinds[slot] = kind
+        self.fields[slot] = fields
+        self.head += 1
+
+    def take(self):
+        # Copies out everything emitted since the last call; slots the game
+        # overwrote before we got to them are counted as dropped
+        head = self.head
+        start = max(self.tail, head - self.capacity)
+        self.dropped += start - self.tail
+        events = []
+        for i in range(start, head):
+            slot = i % self.capacity
+            events.append((self.times[slot], self.kinds[slot], self.fields[slot]))
+        lapped = self.head - self.capacity - start
+        if lapped > 0:
+            # Overwritten while copying
+            del events[:lapped]
+            self.dropped += lapped
+        self.tail = head
+        return events
+
+    def write_loop(self):
+        while True:
+            self.wake.wait(TelemetrySettings.FLUSH_INTERVAL)
+            self.wake.clear()
+            self.flush()
+            if self.stopping:
+                break
+
+    def flush(self):
+        events = self.take()
+        if not events:
+            return
+        lines = []
+        for timestamp, kind, fields in events:
+            record = {"t": round(timestamp, 6), "session": self.session, "event": kind}
+            record.update(fields)
+            lines.append(json.dumps(record, separators=(",", ":")))
+            if self.echo and kind in MESSAGES:
+                print(MESSAGES[kind].format(**fields))
+        if self.dropped:
+            lines.append(json.dumps({"t": round(time.time(), 6), "session": self.session,
+                                     "event": "telemetry_dropped", "count": self.dropped}))
+            self.dropped = 0
+        try:
+            self.write("\n".join(lines) + "\n")
+            self.written += len(events)
+        except OSError as e:
+            print(f"Telemetry write failed: {e}")
+
+    def write(self, text):
+        if self.file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(text)
+        self.file.flush()
+        if self.file.tell() >= TelemetrySettings.MAX_BYTES:
+            self.rotate()
+
+    def rotate(self):
+        # events.ndjson -> events.ndjson.1 -> ... -> events.ndjson.N
+        self.file.close()
+        self.file = None
+        for index in range(TelemetrySettings.BACKUP_COUNT - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        if TelemetrySettings.BACKUP_COUNT:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
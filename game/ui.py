@@ -3,34 +3,66 @@ import math
 import cv2
 import random
 import sys
+import numpy as np
+from operator import itemgetter
 from config import *
+from game.layout import Layout
+from game.particles import ParticleSystem
 
 class UI:
-    def __init__(self, screen, asset_manager):
+    def __init__(self, screen, asset_manager, layout=None):
         self.screen = screen
         self.asset_manager = asset_manager
+        self.layout = layout if layout else Layout(*screen.get_size())
         self.font_small = pygame.font.SysFont("arial", 16)
         self.font_medium = pygame.font.SysFont("arial", 20)
         self.font_large = pygame.font.SysFont("arial", 32)
         self.font_xlarge = pygame.font.SysFont("arial", 64, bold=True)
+        self.font_mono = pygame.font.SysFont("couriernew,monospace", 14)
+        self.profiler_panel = None
+        self.profiler_panel_frame = 0
+        self.fog_owner = None
+        self.fog_layer = None
+        self.fog_key = None
+        self.fog_scaled = None
+        self.enemy_sprite = None
+        self.minimap_palettes = {}
+        self.minimap_owner = None
+        self.minimap_goals = []
+        self.minimap_key = None
+        self.minimap = None
+        
+    def set_screen(self, screen):
+        self.screen = screen
+        self.layout.resize(*screen.get_size())
         
     def draw_gradient_background(self, color):
-        for y in range(HEIGHT):
-            factor = y / HEIGHT
+        width, height = self.layout.width, self.layout.height
+        for y in range(height):
+            factor = y / height
             r = int(color[0] + factor * 10)
             g = int(color[1] + factor * 15)
             b = int(color[2] + factor * 20)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+            pygame.draw.line(self.screen, (r, g, b), (0, y), (width, y))
     
     def draw_maze(self, maze, theme, theme_name):
-        for y, row in enumerate(maze.data):
-            for x, tile in enumerate(row):
-                rect = pygame.Rect(x*TILE_SIZE, y*TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        tile_size = self.layout.tile_size
+        x0, y0, x1, y1 = self.layout.get_visible_tiles(maze.get_width(), maze.get_height())
+        star_img = self.asset_manager.get_star_frame(theme_name, pygame.time.get_ticks())
+        wall_tiles = self.asset_manager.get_wall_tiles(theme_name)
+        wall_masks = maze.get_wall_masks()
+        
+        for y in range(y0, y1):
+            row = maze.data[y]
+            mask_row = wall_masks[y]
+            for x in range(x0, x1):
+                tile = row[x]
+                rect = pygame.Rect(*self.layout.tile_to_screen(x, y), tile_size, tile_size)
                 
                 if tile == TileType.WALL:
-                    pygame.draw.rect(self.screen, theme["wall"], rect)
+                    self.screen.blit(wall_tiles[mask_row[x]], rect)
                     if (x, y) in maze.item_positions:
-                        item = maze.item_positions[(x, y)]
+                        item = self.asset_manager.get_item(theme_name, maze.item_positions[(x, y)])
                         item_rect = item.get_rect()
                         item_rect.center = rect.center
                         self.screen.blit(item, item_rect)
@@ -43,23 +75,167 @@ class UI:
                 elif tile == TileType.STAR:
                     pygame.draw.rect(self.screen, theme["path"], rect)
                     if maze.has_star_at(x, y):
-                        star_img = self.asset_manager.get_theme_assets(theme_name)['star']
-                        scale_factor = 0.5 + 0.1 * math.sin(pygame.time.get_ticks() * 0.01)
-                        star_img = pygame.transform.scale(star_img, (int(TILE_SIZE * scale_factor), int(TILE_SIZE * scale_factor)))
                         star_rect = star_img.get_rect()
-                        star_rect.center = (x*TILE_SIZE + TILE_SIZE//2, y*TILE_SIZE + TILE_SIZE//2)
+                        star_rect.center = rect.center
                         self.screen.blit(star_img, star_rect)
 
+    def update_fog_layer(self, fog):
+        # One pixel per tile, so only tiles whose visibility changed are
+        # touched; a new level rebuilds the whole layer once
+        if self.fog_owner is not fog:
+            self.fog_owner = fog
+            self.fog_layer = pygame.Surface((fog.width, fog.height), pygame.SRCALPHA)
+            self.fog_layer.fill((0, 0, 0, FogSettings.UNEXPLORED_ALPHA))
+            fog.pop_changes()
+            for y, x in zip(*fog.explored.nonzero()):
+                self.fog_layer.set_at((int(x), int(y)), (0, 0, 0, FogSettings.EXPLORED_ALPHA))
+            for x, y in fog.visible:
+                self.fog_layer.set_at((x, y), (0, 0, 0, 0))
+            self.fog_key = None
+            return
+        
+        for x, y in fog.pop_changes():
+            if fog.is_visible(x, y):
+                alpha = 0
+            elif fog.is_explored(x, y):
+                alpha = FogSettings.EXPLORED_ALPHA
+            else:
+                alpha = FogSettings.UNEXPLORED_ALPHA
+            self.fog_layer.set_at((x, y), (0, 0, 0, alpha))
+    
+    def draw_fog(self, fog):
+        self.update_fog_layer(fog)
+        tile_size = self.layout.tile_size
+        x0, y0, x1, y1 = self.layout.get_visible_tiles(fog.width, fog.height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        
+        # The scaled darkness is reused until visibility or the visible tile
+        # range changes; scrolling within a tile only moves the blit
+        key = (fog.version, x0, y0, x1, y1, tile_size)
+        if key != self.fog_key:
+            visible_part = self.fog_layer.subsurface((x0, y0, x1 - x0, y1 - y0))
+            self.fog_scaled = pygame.transform.scale(visible_part, ((x1 - x0) * tile_size, (y1 - y0) * tile_size))
+            self.fog_key = key
+        self.screen.blit(self.fog_scaled, self.layout.tile_to_screen(x0, y0))
+    
+    def get_minimap_palette(self, theme_name):
+        # Tile type -> RGB lookup table, indexed with the whole sampled grid
+        if theme_name not in self.minimap_palettes:
+            theme = THEMES[theme_name]
+            colors = {
+                TileType.WALL: theme["wall"],
+                TileType.PATH: theme["path"],
+                TileType.START: theme["start"],
+                TileType.GOAL: theme["goal"],
+                TileType.STAR: MinimapSettings.STAR_COLOR,
+            }
+            palette = np.zeros((max(colors) + 1, 3), dtype=np.uint8)
+            for tile, color in colors.items():
+                palette[tile] = color
+            self.minimap_palettes[theme_name] = palette
+        return self.minimap_palettes[theme_name]
+    
+    def build_minimap(self, maze, theme_name, fog):
+        width, height = maze.get_width(), maze.get_height()
+        scale = MinimapSettings.MAX_SIZE / max(width, height)
+        map_width, map_height = max(1, int(width * scale)), max(1, int(height * scale))
+        
+        # Nearest-neighbour sample, so the cost follows the minimap size
+        # rather than the maze size
+        xs = [x * width // map_width for x in range(map_width)]
+        ys = [y * height // map_height for y in range(map_height)]
+        pick = itemgetter(*xs)
+        sampled = np.array([pick(maze.data[y]) for y in ys], dtype=np.intp).reshape(map_height, map_width)
+        
+        # Single-tile features would mostly fall between samples, so the
+        # remaining stars and the goals are stamped in afterwards
+        sampled[sampled == TileType.STAR] = TileType.PATH
+        for positions, tile in ((maze.stars_positions, TileType.STAR), (self.minimap_goals, TileType.GOAL)):
+            if positions:
+                px, py = np.array(positions).T
+                sampled[py * map_height // height, px * map_width // width] = tile
+        
+        pixels = self.get_minimap_palette(theme_name)[sampled]
+        if fog:
+            pixels[~fog.explored[np.ix_(ys, xs)]] = MinimapSettings.UNEXPLORED_COLOR
+        
+        if self.minimap is None or self.minimap.get_size() != (map_width, map_height):
+            self.minimap = pygame.Surface((map_width, map_height))
+        pygame.surfarray.blit_array(self.minimap, pixels.transpose(1, 0, 2))
+    
+    def draw_minimap(self, maze, theme_name, players, alpha=1.0, fog=None):
+        if not maze.bounded:
+            return
+        width, height = maze.get_width(), maze.get_height()
+        tile_size = self.layout.tile_size
+        if not MinimapSettings.ENABLED or (width * tile_size <= self.layout.width and
+                                           height * tile_size <= self.layout.height):
+            return
+        
+        if self.minimap_owner is not maze:
+            # Goal tiles do not move during play, so they are found once
+            self.minimap_owner = maze
+            self.minimap_key = None  # A new maze can share the old one's version
+            self.minimap_goals = [(x, y) for y, row in enumerate(maze.data) if TileType.GOAL in row
+                                  for x, tile in enumerate(row) if tile == TileType.GOAL]
+        # The fog object itself is part of the key: a restarted level gets a
+        # fresh one whose version starts over
+        key = (maze.version, theme_name, fog, fog.version if fog else None)
+        if key != self.minimap_key:
+            self.build_minimap(maze, theme_name, fog)
+            self.minimap_key = key
+        
+        map_width, map_height = self.minimap.get_size()
+        left = self.layout.width - map_width - MinimapSettings.MARGIN
+        top = MinimapSettings.TOP
+        self.screen.blit(self.minimap, (left, top))
+        
+        sx, sy = map_width / width, map_height / height
+        view = pygame.Rect(left + self.layout.view_x / tile_size * sx, top + self.layout.view_y / tile_size * sy,
+                           self.layout.width / tile_size * sx, self.layout.height / tile_size * sy)
+        pygame.draw.rect(self.screen, MinimapSettings.VIEW_COLOR, view.clip((left, top, map_width, map_height)), 1)
+        for player in players:
+            x, y = player.get_render_position(alpha)
+            pygame.draw.circle(self.screen, MinimapSettings.PLAYER_COLOR,
+                               (int(left + (x + 0.5) * sx), int(top + (y + 0.5) * sy)), 2)
+        pygame.draw.rect(self.screen, MinimapSettings.VIEW_COLOR, (left - 1, top - 1, map_width + 2, map_height + 2), 1)
+    
+    def get_enemy_sprite(self):
+        tile_size = self.layout.tile_size
+        if self.enemy_sprite is None or self.enemy_sprite.get_width() != tile_size:
+            sprite = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+            center = tile_size // 2
+            pygame.draw.circle(sprite, EnemySettings.COLOR, (center, center), tile_size // 3)
+            eye = max(2, tile_size // 12)
+            for side in (-1, 1):
+                pygame.draw.circle(sprite, Colors.WHITE, (center + side * tile_size // 8, center - eye), eye)
+            self.enemy_sprite = sprite
+        return self.enemy_sprite
+    
+    def draw_enemies(self, enemies, alpha=1.0, fog=None):
+        if not enemies.count:
+            return
+        sprite = self.get_enemy_sprite()
+        tile_size = self.layout.tile_size
+        xs, ys = enemies.get_render_positions(alpha)
+        screen_x = (xs * tile_size).astype(int) - self.layout.view_x
+        screen_y = (ys * tile_size).astype(int) - self.layout.view_y
+        on_screen = np.flatnonzero((screen_x > -tile_size) & (screen_x < self.layout.width) &
+                                   (screen_y > -tile_size) & (screen_y < self.layout.height))
+        if fog:
+            on_screen = [i for i in on_screen if fog.is_visible(int(round(xs[i])), int(round(ys[i])))]
+        self.screen.blits([(sprite, (int(screen_x[i]), int(screen_y[i]))) for i in on_screen], doreturn=False)
     
-    def draw_player(self, player, character_img):
-        x, y = player.get_position()
+    def draw_player(self, player, character_img, alpha=1.0):
+        x, y = player.get_render_position(alpha)
+        center = self.layout.tile_center(x, y)
         if character_img:
             img_rect = character_img.get_rect()
-            img_rect.center = (x*TILE_SIZE + TILE_SIZE//2, y*TILE_SIZE + TILE_SIZE//2)
+            img_rect.center = center
             self.screen.blit(character_img, img_rect)
         else:
-            center = (x*TILE_SIZE + TILE_SIZE//2, y*TILE_SIZE + TILE_SIZE//2)
-            pygame.draw.circle(self.screen, Colors.RED, center, TILE_SIZE//3)
+            pygame.draw.circle(self.screen, Colors.RED, center, self.layout.tile_size//3)
     
     def draw_game_ui(self, game_state):
         status_text = "Camera: ON" if game_state.camera_on else "Camera: OFF"
@@ -73,19 +249,25 @@ class UI:
         self.screen.blit(self.font_medium.render(theme_text, True, Colors.WHITE), (10, 70))
         
         score_text = f"Score: {game_state.score}"
-        self.screen.blit(self.font_medium.render(score_text, True, Colors.WHITE), (WIDTH - 150, 10))
+        self.screen.blit(self.font_medium.render(score_text, True, Colors.WHITE), (self.layout.width - 150, 10))
         
         stars_text = f"Stars: {game_state.get_stars_progress()}"
-        self.screen.blit(self.font_medium.render(stars_text, True, Colors.WHITE), (WIDTH - 150, 40))
+        self.screen.blit(self.font_medium.render(stars_text, True, Colors.WHITE), (self.layout.width - 150, 40))
+        
+        if len(game_state.player_scores) > 1:
+            for i, player_score in enumerate(game_state.player_scores):
+                player_text = f"P{i + 1}: {player_score}"
+                self.screen.blit(self.font_medium.render(player_text, True, Colors.WHITE),
+                                 (self.layout.width - 150, 70 + i * 30))
     
     def draw_icons(self, game_state):
-        camera_pos = (10, HEIGHT-130)
-        exit_pos = (70, HEIGHT-130)
-        help_pos = (140, HEIGHT-130)
+        cam_rect, exit_rect, help_rect = self.layout.get_ui_rects()
+        camera_pos = cam_rect.topleft
+        exit_pos = exit_rect.topleft
+        help_pos = help_rect.topleft
         
         camera_img = self.asset_manager.get_ui_image('camera')
         self.screen.blit(camera_img, camera_pos)
-        cam_rect = pygame.Rect(*camera_pos, 50, 50)
         
         if not game_state.camera_on:
             pygame.draw.line(self.screen, Colors.RED, camera_pos, 
@@ -96,11 +278,9 @@ class UI:
         
         exit_img = self.asset_manager.get_ui_image('exit')
         self.screen.blit(exit_img, exit_pos)
-        exit_rect = pygame.Rect(*exit_pos, 50, 50)
         
         help_img = self.asset_manager.get_ui_image('help')
         self.screen.blit(help_img, help_pos)
-        help_rect = pygame.Rect(*help_pos, 50, 50)
         
         return cam_rect, exit_rect, help_rect
     
@@ -109,18 +289,52 @@ class UI:
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
             frame_resized = cv2.resize(frame_rgb, (CameraSettings.PREVIEW_WIDTH, CameraSettings.PREVIEW_HEIGHT))
             pygame_surface = pygame.surfarray.make_surface(frame_resized.swapaxes(0, 1))
-            self.screen.blit(pygame_surface, (WIDTH - CameraSettings.PREVIEW_WIDTH, HEIGHT - CameraSettings.PREVIEW_HEIGHT))
+            self.screen.blit(pygame_surface, (self.layout.width - CameraSettings.PREVIEW_WIDTH,
+                                              self.layout.height - CameraSettings.PREVIEW_HEIGHT))
+    
+    def draw_particles(self, particles):
+        particles.draw(self.screen, (-self.layout.view_x, -self.layout.view_y))
+    
+    def draw_latency(self, text):
+        if text:
+            surface = self.font_small.render(text, True, Colors.WHITE)
+            self.screen.blit(surface, (self.layout.width - CameraSettings.PREVIEW_WIDTH,
+                                       self.layout.height - CameraSettings.PREVIEW_HEIGHT - surface.get_height() - 4))
+    
+    def draw_profiler_overlay(self, profiler):
+        # Re-rendering text is itself costly, so the panel is refreshed periodically
+        if (self.profiler_panel is None or
+                profiler.frame_count - self.profiler_panel_frame >= ProfilerSettings.OVERLAY_REFRESH_FRAMES):
+            self.profiler_panel = self.render_profiler_panel(profiler.get_stats())
+            self.profiler_panel_frame = profiler.frame_count
+        self.screen.blit(self.profiler_panel, (self.layout.width - self.profiler_panel.get_width() - 10, 70))
+    
+    def render_profiler_panel(self, stats):
+        lines = [f"{'phase':<10}{'last':>7}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, values in stats.items():
+            lines.append(f"{phase:<10}{values['last_ms']:7.2f}{values['p50_ms']:7.2f}"
+                         f"{values['p95_ms']:7.2f}{values['p99_ms']:7.2f}")
+        
+        line_height = self.font_mono.get_linesize()
+        width = max(self.font_mono.size(line)[0] for line in lines) + 16
+        panel = pygame.Surface((width, line_height * len(lines) + 12), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            color = Colors.ACCENT_COLOR if i == 0 else Colors.TEXT_COLOR
+            panel.blit(self.font_mono.render(line, True, color), (8, 6 + i * line_height))
+        return panel
     
     def draw_help_screen(self):
-        for y in range(HEIGHT):
-            color_ratio = y / HEIGHT
+        width, height = self.layout.width, self.layout.height
+        for y in range(height):
+            color_ratio = y / height
             r = int(240 - (color_ratio * 40))
             g = int(240 - (color_ratio * 60))
             b = int(255 - (color_ratio * 55))
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+            pygame.draw.line(self.screen, (r, g, b), (0, y), (width, y))
         
-        main_rect = pygame.Rect(30, 30, WIDTH-60, HEIGHT-60)
-        shadow_rect = pygame.Rect(35, 35, WIDTH-60, HEIGHT-60)
+        main_rect = pygame.Rect(30, 30, width-60, height-60)
+        shadow_rect = pygame.Rect(35, 35, width-60, height-60)
         
         pygame.draw.rect(self.screen, (100, 100, 100, 100), shadow_rect, border_radius=15)
         pygame.draw.rect(self.screen, (255, 255, 255, 230), main_rect, border_radius=15)
@@ -128,14 +342,14 @@ class UI:
         
         title_text = "Game Instructions"
         title_shadow = self.font_xlarge.render(title_text, True, (100, 100, 100))
-        title_rect_shadow = title_shadow.get_rect(center=(WIDTH//2 + 2, 72))
+        title_rect_shadow = title_shadow.get_rect(center=(width//2 + 2, 72))
         self.screen.blit(title_shadow, title_rect_shadow)
         
         title_surface = self.font_xlarge.render(title_text, True, (25, 25, 112))
-        title_rect = title_surface.get_rect(center=(WIDTH//2, 70))
+        title_rect = title_surface.get_rect(center=(width//2, 70))
         self.screen.blit(title_surface, title_rect)
         
-        pygame.draw.line(self.screen, (70, 130, 180), (60, 100), (WIDTH-60, 100), 3)
+        pygame.draw.line(self.screen, (70, 130, 180), (60, 100), (width-60, 100), 3)
         
         sections = [
             {
@@ -179,7 +393,7 @@ class UI:
             
             current_y += 10
         
-        tips_rect = pygame.Rect(50, current_y, WIDTH-100, 80)
+        tips_rect = pygame.Rect(50, current_y, width-100, 80)
         pygame.draw.rect(self.screen, (255, 248, 220), tips_rect, border_radius=10)
         pygame.draw.rect(self.screen, (255, 165, 0), tips_rect, 2, border_radius=10)
         
@@ -196,7 +410,7 @@ class UI:
             tip_surface = tip_font.render(tip, True, color)
             self.screen.blit(tip_surface, (90, current_y + 12 + i*18))
         
-        button_rect = pygame.Rect(WIDTH//2 - 100, HEIGHT - 80, 200, 40)
+        button_rect = pygame.Rect(width//2 - 100, height - 80, 200, 40)
         mouse_pos = pygame.mouse.get_pos()
         
         if button_rect.collidepoint(mouse_pos):
@@ -213,48 +427,35 @@ class UI:
         self.screen.blit(button_text, button_text_rect)
     
     def show_game_over(self, final_score):
-        particles = []
-        
-        for _ in range(30):
-            particles.append({
-                'x': random.randint(0, WIDTH),
-                'y': random.randint(0, HEIGHT),
-                'vx': random.uniform(-1, 1),
-                'vy': random.uniform(-2, 0),
-                'color': random.choice([(255, 215, 0), (255, 20, 147), (0, 191, 255)]),
-                'size': random.randint(2, 4)
-            })
+        width, height = self.layout.width, self.layout.height
+        particles = ParticleSystem()
+        particles.emit_area(300, (0, 0, width, height), velocity=(0, 40), life=(1.5, 3.0))
         
         clock = pygame.time.Clock()
         
         for frame in range(180):
             self.screen.fill((0, 0, 50))
             
-            for particle in particles:
-                particle['x'] += particle['vx']
-                particle['y'] += particle['vy']
-                particle['vy'] += 0.1
-                
-                pygame.draw.circle(self.screen, particle['color'], 
-                                 (int(particle['x']), int(particle['y'])), 
-                                 particle['size'])
-                
-                if particle['y'] > HEIGHT:
-                    particle['y'] = 0
-                    particle['x'] = random.randint(0, WIDTH)
+            if frame % 20 == 0:
+                particles.emit(ParticleSettings.FIREWORK_PARTICLES,
+                               random.randint(width // 5, width * 4 // 5),
+                               random.randint(height // 8, height // 2))
+            particles.emit_area(8, (0, -10, width, 10), velocity=(0, 60), life=(2.0, 4.0))
+            particles.update(1 / 60)
+            particles.draw(self.screen)
             
             text_shadow = self.font_xlarge.render("YOU WON!", True, (50, 50, 50))
-            self.screen.blit(text_shadow, (WIDTH//2 - text_shadow.get_width()//2 + 3, HEIGHT//2 - 80 + 3))
+            self.screen.blit(text_shadow, (width//2 - text_shadow.get_width()//2 + 3, height//2 - 80 + 3))
             
             text = self.font_xlarge.render("YOU WON!", True, (255, 215, 0))
-            self.screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 - 80))
+            self.screen.blit(text, (width//2 - text.get_width()//2, height//2 - 80))
             
             score_text = self.font_large.render(f"Final Score: {final_score}", True, Colors.WHITE)
-            self.screen.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//2 + 20))
+            self.screen.blit(score_text, (width//2 - score_text.get_width()//2, height//2 + 20))
             
             if frame > 120:
                 continue_text = self.font_medium.render("Press any key to continue...", True, (200, 200, 200))
-                self.screen.blit(continue_text, (WIDTH//2 - continue_text.get_width()//2, HEIGHT//2 + 80))
+                self.screen.blit(continue_text, (width//2 - continue_text.get_width()//2, height//2 + 80))
             
             pygame.display.update()
             clock.tick(60)
@@ -271,8 +472,10 @@ class CharacterSelection:
     def __init__(self, screen, asset_manager):
         self.screen = screen
         self.asset_manager = asset_manager
+        self.card_images = {}
         
     def calculate_positions(self, num_items):
+        width, height = self.screen.get_size()
         item_size = 100
         spacing = 135
         
@@ -282,8 +485,8 @@ class CharacterSelection:
         total_width = cols * spacing - (spacing - item_size)
         total_height = rows * spacing - (spacing - item_size)
         
-        start_x = (WIDTH - total_width) // 2
-        start_y = (HEIGHT - total_height) // 2 + 30
+        start_x = (width - total_width) // 2
+        start_y = (height - total_height) // 2 + 30
         
         positions = []
         for i in range(num_items):
@@ -315,7 +518,7 @@ class CharacterSelection:
         border_rect = pygame.Rect(draw_x - 5, draw_y - 5, scaled_size + 10, scaled_size + 10)
         pygame.draw.rect(self.screen, color, border_rect, 3, border_radius=10)
         
-        scaled_image = pygame.transform.scale(image, (scaled_size, scaled_size))
+        scaled_image = self.get_card_image(image, name, scaled_size)
         self.screen.blit(scaled_image, (draw_x, draw_y))
         
         # clean_name = name.replace('.png', '').replace('.jpg', '').replace('.jpeg', '')
@@ -326,13 +529,21 @@ class CharacterSelection:
         
         return pygame.Rect(x, y, size, size)
     
+    def get_card_image(self, image, name, size):
+        # Cards only come in two sizes, so each is scaled once
+        key = (name, size)
+        if key not in self.card_images:
+            self.card_images[key] = pygame.transform.smoothscale(image, (size, size))
+        return self.card_images[key]
+    
     def draw_gradient_background(self):
-        for y in range(HEIGHT):
-            factor = y / HEIGHT
+        width, height = self.screen.get_size()
+        for y in range(height):
+            factor = y / height
             r = int(Colors.BG_COLOR[0] + factor * 10)
             g = int(Colors.BG_COLOR[1] + factor * 15)
             b = int(Colors.BG_COLOR[2] + factor * 20)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+            pygame.draw.line(self.screen, (r, g, b), (0, y), (width, y))
     
     def show_selection(self):
         characters = self.asset_manager.get_all_characters()
@@ -359,12 +570,16 @@ class CharacterSelection:
                         pygame.quit()
                         sys.exit()
                 
+                elif event.type == pygame.VIDEORESIZE:
+                    self.screen = pygame.display.get_surface()
+                    positions = self.calculate_positions(len(characters))
+                
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     for i, (img, name) in enumerate(characters):
                         x, y = positions[i]
                         rect = pygame.Rect(x, y, char_size, char_size)
                         if rect.collidepoint(mouse_pos):
-                            selected_character = img
+                            selected_character = name
                             running = False
                             break
             
@@ -0,0 +1,115 @@
+import cv2
+import numpy as np
+import pygame
+import queue
+import threading
+import time
+from config import VideoSettings
+
+STOP = None
+
+
+class VideoRecorder:
+    # Grabs the display at a fixed rate and hands the pixels to an encoder
+    # thread. cv2 releases the GIL while resizing and encoding, so the game
+    # loop only pays for the pixel copy; when the queue is full the frame is
+    # dropped instead of waiting.
+    def __init__(self, filename, fps=VideoSettings.FPS, scale=VideoSettings.SCALE,
+                 queue_size=VideoSettings.QUEUE_SIZE):
+        self.filename = filename
+        self.fps = fps
+        self.scale = scale
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.start_time = None
+        self.next_index = 0
+        self.captured = 0
+        self.dropped = 0
+        self.written = 0
+        self.repeated = 0
+        self.writer = None
+        self.error = None
+        self.thread = threading.Thread(target=self.encode_loop, name="video-encoder", daemon=True)
+        self.thread.start()
+
+    def capture(self, surface, timestamp=None):
+        # Safe to call every loop iteration: frames are taken on the video's
+        # own clock, so idle stretches without redraws still fill the timeline
+        if self.error:
+            return False
+        now = time.perf_counter() if timestamp is None else timestamp
+        if self.start_time is None:
+            self.start_time = now
+        index = int((now - self.start_time) * self.fps)
+        if index < self.next_index:
+            return False
+        self.next_index = index + 1
+
+        try:
+            # RGBX is a straight copy for the usual 32-bit display, far
+            # cheaper than repacking to RGB on the game thread
+            self.frames.put_nowait((index, surface.get_size(), pygame.image.tobytes(surface, "RGBX")))
+            self.captured += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def open_writer(self, size):
+        width, height = size
+        # Most codecs want even dimensions
+        size = (max(2, int(width * self.scale) // 2 * 2), max(2, int(height * self.scale) // 2 * 2))
+        writer = cv2.VideoWriter(self.filename, cv2.VideoWriter_fourcc(*VideoSettings.FOURCC), self.fps, size)
+        if not writer.isOpened():
+            raise IOError(f"cannot open video writer for {self.filename}")
+        return writer, size
+
+    def encode_loop(self):
+        size = None
+        last_frame = None
+        last_index = -1
+        while True:
+            item = self.frames.get()
+            if item is STOP:
+                break
+            if self.error:
+                continue
+            index, surface_size, pixels = item
+            try:
+                if self.writer is None:
+                    self.writer, size = self.open_writer(surface_size)
+                frame = np.frombuffer(pixels, dtype=np.uint8).reshape(surface_size[1], surface_size[0], 4)
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
+                if surface_size != size:
+                    # Scaled output, or the window was resized mid-recording
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+                # Gaps left by dropped frames repeat the previous picture so
+                # the video keeps real-time pacing
+                self.repeat(last_frame, index - last_index - 1)
+                self.writer.write(frame)
+                self.written += 1
+                last_frame, last_index = frame, index
+            except (IOError, cv2.error) as e:
+                self.error = e
+        if not self.error:
+            self.repeat(last_frame, self.next_index - 1 - last_index)
+
+    def repeat(self, frame, count):
+        if frame is None:
+            return
+        for _ in range(count):
+            self.writer.write(frame)
+            self.repeated += 1
+
+    def close(self):
+        if not self.thread.is_alive():
+            return
+        self.frames.put(STOP)
+        self.thread.join()
+        if self.writer is not None:
+            self.writer.release()
+        if self.error:
+            print(f"Video recording failed: {self.error}")
+        else:
+            print(f"Video saved to {self.filename}: {self.written} frames at {self.fps} fps, "
+                  f"{self.dropped} dropped, {self.repeated} repeated")
@@ -1,13 +1,109 @@
 import sys
 import os
+import argparse
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from game.editor import LevelEditor
 from game.game import Game
+from game.replay import InputRecorder, InputReplayer
+from game.video_recorder import VideoRecorder
+from config import NetworkSettings, FogSettings, EnemySettings, VideoSettings, HandGestureSettings, MAZE_FILE
+from net.client import NetworkClient
+from net.protocol import ANY_ROOM
+from controllers.frame_sources import VideoFileSource, ImageDirectorySource, SyntheticSource
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Maze Adventure")
+    parser.add_argument("--record", metavar="FILE", help="record per-tick input to a replay log")
+    parser.add_argument("--record-landmarks", action="store_true", help="include raw hand landmarks in the log")
+    parser.add_argument("--seed", type=int, help="seed for item placement when recording")
+    parser.add_argument("--replay", metavar="FILE", help="drive the game from a replay log")
+    parser.add_argument("--fast", action="store_true", help="replay as fast as possible instead of in real time")
+    parser.add_argument("--two-player", action="store_true", help="two players on one camera, split left/right")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--video", metavar="FILE", help="feed gestures from a video file instead of the webcam")
+    source.add_argument("--images", metavar="DIR", help="feed gestures from a directory of images")
+    source.add_argument("--synthetic", action="store_true", help="feed gestures from a rendered moving fingertip")
+    parser.add_argument("--unpaced", action="store_true", help="read source frames as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="restart the video or image source at the end")
+    parser.add_argument("--fog", action="store_true", default=FogSettings.ENABLED,
+                        help="fog of war: only tiles in line of sight are shown")
+    parser.add_argument("--enemies", type=int, default=EnemySettings.COUNT, metavar="N",
+                        help="number of enemies chasing the player on each level")
+    parser.add_argument("--connect", metavar="HOST[:PORT]", help="race on a multiplayer server (see net/server.py)")
+    parser.add_argument("--room", type=int, default=ANY_ROOM, help="server room to join, default: any free one")
+    parser.add_argument("--edit", nargs="?", const=MAZE_FILE, metavar="FILE",
+                        help="open the level editor on a maze file (default: mazes.txt)")
+    parser.add_argument("--record-video", metavar="FILE", help="save the gameplay as a video (e.g. session.mp4)")
+    parser.add_argument("--video-fps", type=int, default=VideoSettings.FPS, help="frame rate of the recorded video")
+    parser.add_argument("--video-scale", type=float, default=VideoSettings.SCALE,
+                        help="size of the recorded video relative to the window")
+    parser.add_argument("--predict-gestures", action="store_true", default=HandGestureSettings.PREDICTION_ENABLED,
+                        help="commit gesture directions early from fingertip velocity")
+    parser.add_argument("--watch", action="store_true", help="reload levels from the maze file whenever it is saved")
+    parser.add_argument("--endless", action="store_true", help="explore an endless generated maze instead of the levels")
+    parser.add_argument("--profile", action="store_true", help="profile every frame and export traces on exit")
+    args = parser.parse_args()
+    if args.two_player and (args.record or args.replay):
+        parser.error("--two-player cannot be combined with --record or --replay")
+    if args.connect and (args.two_player or args.record or args.replay):
+        parser.error("--connect cannot be combined with --two-player, --record or --replay")
+    if not 0 <= args.room <= ANY_ROOM:
+        parser.error(f"--room must be between 0 and {ANY_ROOM - 1}")
+    if not 0 <= args.enemies <= 0xFFFF:
+        parser.error("--enemies must be between 0 and 65535")
+    if args.connect and args.enemies:
+        parser.error("--enemies is not available in multiplayer races")
+    if args.watch and (args.connect or args.record or args.replay):
+        parser.error("--watch cannot be combined with --connect, --record or --replay")
+    if args.endless and (args.connect or args.watch or args.fog or args.enemies):
+        parser.error("--endless cannot be combined with --connect, --watch, --fog or --enemies")
+    return args
+
+def make_frame_source(args):
+    paced = not args.unpaced
+    if args.video:
+        return VideoFileSource(args.video, paced, args.loop)
+    if args.images:
+        return ImageDirectorySource(args.images, paced=paced, loop=args.loop)
+    if args.synthetic:
+        return SyntheticSource(paced=paced)
+    return None
+
+def make_net_client(args):
+    if not args.connect:
+        return None
+    host, _, port = args.connect.partition(":")
+    return NetworkClient(host or NetworkSettings.HOST, int(port) if port else NetworkSettings.PORT, args.room)
 
 def main():
+    args = parse_args()
+    if args.edit:
+        LevelEditor(args.edit).run()
+        return
+    
+    recorder = None
+    replayer = None
+    video_recorder = None
+    
     try:
-        game = Game()
+        if args.replay:
+            replayer = InputReplayer(args.replay)
+            # Enemies use the replay's rng and change the score, so the run
+            # only reproduces with the count it was recorded with
+            args.enemies = replayer.enemies
+            args.endless = replayer.endless
+        elif args.record:
+            recorder = InputRecorder(args.record, args.seed, args.record_landmarks, args.enemies, args.endless)
+        if args.record_video:
+            video_recorder = VideoRecorder(args.record_video, args.video_fps, args.video_scale)
+        
+        game = Game(recorder=recorder, replayer=replayer, replay_fast=args.fast, profile=args.profile,
+                    two_player=args.two_player, frame_source=make_frame_source(args),
+                    net_client=make_net_client(args), fog=args.fog,
+                    enemies=args.enemies, watch=args.watch, video_recorder=video_recorder,
+                    predict_gestures=args.predict_gestures, endless=args.endless)
         game.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user")
@@ -16,7 +112,11 @@ def main():
         # import traceback
         # traceback.print_exc()
     finally:
+        if recorder:
+            recorder.close()
+        if video_recorder:
+            video_recorder.close()
         print("Game ended")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,8 @@
+from .client import NetworkClient
+from .server import GameServer, Room
+
+__all__ = [
+    'NetworkClient',
+    'GameServer',
+    'Room',
+]
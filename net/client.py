@@ -0,0 +1,87 @@
+import socket
+import time
+from config import NetworkSettings
+from net import protocol
+
+
+class NetworkClient:
+    # Non-blocking client polled once per frame from the game loop
+    def __init__(self, host=NetworkSettings.HOST, port=NetworkSettings.PORT, room_id=protocol.ANY_ROOM):
+        self.host = host
+        self.port = port
+        self.room_id = room_id
+        self.sock = None
+        self.reader = protocol.FrameReader()
+        self.pending = []
+        self.player_id = None
+        self.level = 0
+        self.connected = False
+        self.last_input = None
+        self.bytes_received = 0
+
+    def connect(self):
+        try:
+            self.sock = socket.create_connection((self.host, self.port), NetworkSettings.CONNECT_TIMEOUT)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.sock.sendall(protocol.encode_join(self.room_id))
+
+            deadline = time.perf_counter() + NetworkSettings.CONNECT_TIMEOUT
+            while self.player_id is None and time.perf_counter() < deadline:
+                data = self.sock.recv(4096)
+                if not data:
+                    break
+                self.bytes_received += len(data)
+                for payload in self.reader.feed(data):
+                    if payload[:1] == protocol.WELCOME_TAG and self.player_id is None:
+                        _, self.player_id, self.room_id, self.level = protocol.WELCOME.unpack(payload)
+                    else:
+                        self.pending.append(payload)
+        except OSError as e:
+            print(f"Could not connect to {self.host}:{self.port}: {e}")
+            self.close()
+            return False
+
+        if self.player_id is None:
+            print("Server did not accept the connection")
+            self.close()
+            return False
+        self.sock.setblocking(False)
+        self.connected = True
+        return True
+
+    def send_input(self, dx, dy):
+        # Inputs are level-triggered on the server, so only changes are sent
+        if not self.connected or (dx, dy) == self.last_input:
+            return
+        try:
+            self.sock.sendall(protocol.encode_input(dx, dy))
+            self.last_input = (dx, dy)
+        except BlockingIOError:
+            pass
+        except OSError:
+            self.close()
+
+    def poll(self):
+        # Returns every snapshot received since the last call
+        payloads, self.pending = self.pending, []
+        while self.connected:
+            try:
+                data = self.sock.recv(65536)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.close()
+                break
+            if not data:
+                self.close()
+                break
+            self.bytes_received += len(data)
+            payloads.extend(self.reader.feed(data))
+        return [protocol.decode_snapshot(payload) for payload in payloads
+                if payload[:1] == protocol.SNAPSHOT_TAG]
+
+    def close(self):
+        self.connected = False
+        if self.sock:
+            self.sock.close()
+            self.sock = None
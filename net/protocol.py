@@ -0,0 +1,87 @@
+import struct
+
+# Every message is a little-endian length prefix followed by a one byte tag.
+# The stream is TCP, so snapshots can be deltas against the previous one.
+FRAME = struct.Struct("<H")
+
+JOIN = struct.Struct("<cH")          # tag, room id (ANY_ROOM to be placed)
+INPUT = struct.Struct("<cbb")        # tag, dx, dy
+WELCOME = struct.Struct("<cBHH")     # tag, player id, room id, level
+SNAPSHOT = struct.Struct("<cIHBBH")  # tag, tick, level, changed players, left players, star bytes
+PLAYER = struct.Struct("<BhhI")      # id, x, y, score
+
+JOIN_TAG = b"J"
+INPUT_TAG = b"I"
+WELCOME_TAG = b"W"
+SNAPSHOT_TAG = b"S"
+
+ANY_ROOM = 0xFFFF
+
+
+def frame(payload):
+    return FRAME.pack(len(payload)) + payload
+
+
+def encode_join(room_id=ANY_ROOM):
+    return frame(JOIN.pack(JOIN_TAG, room_id))
+
+
+def encode_input(dx, dy):
+    return frame(INPUT.pack(INPUT_TAG, dx, dy))
+
+
+def encode_welcome(player_id, room_id, level):
+    return frame(WELCOME.pack(WELCOME_TAG, player_id, room_id, level))
+
+
+def pack_stars(present):
+    # One bit per star of the level, in the maze's original star order
+    bits = bytearray((len(present) + 7) // 8)
+    for i, on in enumerate(present):
+        if on:
+            bits[i >> 3] |= 1 << (i & 7)
+    return bytes(bits)
+
+
+def unpack_stars(bits, count):
+    return [bool(bits[i >> 3] & (1 << (i & 7))) for i in range(count)]
+
+
+def encode_snapshot(tick, level, players, left, star_bits):
+    # players: (id, x, y, score) for every player that changed since the last
+    # snapshot; star_bits is empty when no star was collected
+    parts = [SNAPSHOT.pack(SNAPSHOT_TAG, tick, level, len(players), len(left), len(star_bits))]
+    parts.extend(PLAYER.pack(*player) for player in players)
+    parts.append(bytes(left))
+    parts.append(star_bits)
+    return frame(b"".join(parts))
+
+
+def decode_snapshot(payload):
+    _, tick, level, changed, left_count, star_len = SNAPSHOT.unpack_from(payload)
+    offset = SNAPSHOT.size
+    players = []
+    for _ in range(changed):
+        players.append(PLAYER.unpack_from(payload, offset))
+        offset += PLAYER.size
+    left = list(payload[offset:offset + left_count])
+    offset += left_count
+    return tick, level, players, left, payload[offset:offset + star_len]
+
+
+class FrameReader:
+    # Splits a byte stream into message payloads
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        self.buffer.extend(data)
+        messages = []
+        while len(self.buffer) >= FRAME.size:
+            (length,) = FRAME.unpack_from(self.buffer)
+            end = FRAME.size + length
+            if len(self.buffer) < end:
+                break
+            messages.append(bytes(self.buffer[FRAME.size:end]))
+            del self.buffer[:end]
+        return messages
@@ -0,0 +1,276 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameSettings, NetworkSettings, MAZE_FILE
+from game.game_state import GameState
+from game.maze import MazeLoader
+from game.player import Player
+from game.rules import apply_move
+from net import protocol
+
+
+class RoomPlayer:
+    def __init__(self, player_id, x, y, writer):
+        self.player_id = player_id
+        self.player = Player(x, y)
+        self.game_state = GameState()
+        self.direction = (0, 0)
+        self.writer = writer
+        self.needs_full = True
+
+
+class Room:
+    # One shared maze raced by up to ROOM_SIZE players. The first player to
+    # reach the goal scores the level bonus and everyone moves on together.
+    def __init__(self, room_id, mazes):
+        self.room_id = room_id
+        self.mazes = mazes
+        self.players = {}
+        self.left = []
+        self.tick_count = 0
+        self.tick_ms = deque(maxlen=NetworkSettings.STATS_HISTORY)
+        self.bytes_sent = 0
+        self.start_level(0)
+
+    def start_level(self, level):
+        self.level = level
+        if self.is_finished():
+            # Past the last maze: the race is over and the level number in
+            # the snapshots tells clients so; the board stays as it was
+            return
+        self.maze = self.mazes[self.level].copy()
+        self.star_order = list(self.maze.stars_positions)
+        self.stars_changed = True
+        self.sent = {}
+        start_x, start_y = self.maze.get_start_position()
+        for room_player in self.players.values():
+            room_player.player = Player(start_x, start_y)
+
+    def is_finished(self):
+        return self.level >= len(self.mazes)
+
+    def is_full(self):
+        return len(self.players) >= NetworkSettings.ROOM_SIZE
+
+    def add_player(self, writer):
+        for player_id in range(NetworkSettings.ROOM_SIZE):
+            if player_id not in self.players:
+                room_player = RoomPlayer(player_id, *self.maze.get_start_position(), writer)
+                self.players[player_id] = room_player
+                return room_player
+        return None
+
+    def remove_player(self, player_id):
+        if self.players.pop(player_id, None):
+            self.sent.pop(player_id, None)
+            self.left.append(player_id)
+
+    def tick(self):
+        self.tick_count += 1
+        if self.is_finished():
+            return
+        for room_player in list(self.players.values()):
+            player = room_player.player
+            player.tick()
+            dx, dy = room_player.direction
+            _, star_collected, reached_goal = apply_move(player, self.maze, room_player.game_state, dx, dy)
+            if star_collected:
+                self.stars_changed = True
+            if reached_goal:
+                room_player.game_state.add_score(GameSettings.LEVEL_COMPLETE_POINTS)
+                self.start_level(self.level + 1)
+                break
+
+    def star_bits(self):
+        present = set(self.maze.stars_positions)
+        return protocol.pack_stars([position in present for position in self.star_order])
+
+    def build_delta(self):
+        # Only players whose position or score changed since the last
+        # broadcast, and the star bitmap only when a star was taken
+        changed = []
+        for player_id, room_player in self.players.items():
+            state = (room_player.player.x, room_player.player.y, room_player.game_state.score)
+            if self.sent.get(player_id) != state:
+                self.sent[player_id] = state
+                changed.append((player_id,) + state)
+        stars = self.star_bits() if self.stars_changed else b""
+        if not changed and not self.left and not stars:
+            return None
+        delta = protocol.encode_snapshot(self.tick_count, self.level, changed, self.left, stars)
+        self.stars_changed = False
+        self.left = []
+        return delta
+
+    def build_full(self):
+        players = [(player_id, rp.player.x, rp.player.y, rp.game_state.score)
+                   for player_id, rp in self.players.items()]
+        return protocol.encode_snapshot(self.tick_count, self.level, players, [], self.star_bits())
+
+    def broadcast(self):
+        # The delta is encoded once per room and shared by every client;
+        # newcomers get one full snapshot to start from
+        delta = self.build_delta()
+        full = None
+        dropped = []
+        for room_player in self.players.values():
+            if room_player.needs_full:
+                if full is None:
+                    full = self.build_full()
+                data = full
+                room_player.needs_full = False
+            elif delta:
+                data = delta
+            else:
+                continue
+            if room_player.writer.transport.get_write_buffer_size() > NetworkSettings.MAX_WRITE_BUFFER:
+                dropped.append(room_player)
+                continue
+            room_player.writer.write(data)
+            self.bytes_sent += len(data)
+        for room_player in dropped:
+            room_player.writer.close()
+
+
+class GameServer:
+    def __init__(self, host=NetworkSettings.HOST, port=NetworkSettings.PORT, maze_file=MAZE_FILE):
+        self.host = host
+        self.port = port
+        self.mazes = MazeLoader.load_mazes_from_file(maze_file)
+        self.rooms = {}
+        self.next_room_id = 0
+        self.late_ticks = 0
+        self.started = asyncio.Event()
+
+    def find_room(self, room_id):
+        if room_id == protocol.ANY_ROOM:
+            for room in self.rooms.values():
+                if not room.is_full() and not room.is_finished():
+                    return room
+            while self.next_room_id in self.rooms:
+                self.next_room_id += 1
+            room_id = self.next_room_id
+        if room_id not in self.rooms:
+            self.rooms[room_id] = Room(room_id, self.mazes)
+        return self.rooms[room_id]
+
+    async def handle_client(self, reader, writer):
+        room = None
+        room_player = None
+        try:
+            while True:
+                header = await reader.readexactly(protocol.FRAME.size)
+                (length,) = protocol.FRAME.unpack(header)
+                payload = await reader.readexactly(length)
+                tag = payload[:1]
+
+                if tag == protocol.INPUT_TAG and room_player:
+                    if len(payload) != protocol.INPUT.size:
+                        break  # Malformed frame: drop the client
+                    _, dx, dy = protocol.INPUT.unpack(payload)
+                    if dx and dy:
+                        # Diagonals would cut through wall corners
+                        dx = dy = 0
+                    room_player.direction = (max(-1, min(1, dx)), max(-1, min(1, dy)))
+                elif tag == protocol.JOIN_TAG and room_player is None:
+                    if len(payload) != protocol.JOIN.size:
+                        break
+                    _, room_id = protocol.JOIN.unpack(payload)
+                    room = self.find_room(room_id)
+                    room_player = room.add_player(writer)
+                    if room_player is None:
+                        break
+                    writer.write(protocol.encode_welcome(room_player.player_id, room.room_id, room.level))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if room_player:
+                room.remove_player(room_player.player_id)
+                if not room.players:
+                    self.rooms.pop(room.room_id, None)
+            writer.close()
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        tick_duration = 1.0 / GameSettings.TICK_RATE
+        next_tick = loop.time()
+        while True:
+            for room in list(self.rooms.values()):
+                start = time.perf_counter()
+                room.tick()
+                if room.tick_count % NetworkSettings.SNAPSHOT_INTERVAL == 0:
+                    room.broadcast()
+                room.tick_ms.append((time.perf_counter() - start) * 1000.0)
+
+            next_tick += tick_duration
+            delay = next_tick - loop.time()
+            # Too far behind to catch up: skip the missed ticks instead of
+            # running them back to back
+            if delay < -GameSettings.MAX_FRAME_TIME:
+                self.late_ticks += 1
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(max(0.0, delay))
+
+    def get_stats(self, elapsed=None):
+        rooms = list(self.rooms.values())
+        tick_ms = [ms for room in rooms for ms in room.tick_ms]
+        stats = {
+            "rooms": len(rooms),
+            "players": sum(len(room.players) for room in rooms),
+            "room_tick_ms_mean": sum(tick_ms) / len(tick_ms) if tick_ms else 0.0,
+            "room_tick_ms_max": max(tick_ms) if tick_ms else 0.0,
+            "late_ticks": self.late_ticks,
+            "bytes_sent": sum(room.bytes_sent for room in rooms),
+        }
+        if elapsed and rooms:
+            stats["bytes_per_room_per_s"] = stats["bytes_sent"] / len(rooms) / elapsed
+        return stats
+
+    async def report_stats(self):
+        last_time = time.perf_counter()
+        last_bytes = 0
+        while True:
+            await asyncio.sleep(NetworkSettings.STATS_INTERVAL)
+            now = time.perf_counter()
+            stats = self.get_stats()
+            rate = (stats["bytes_sent"] - last_bytes) / (now - last_time) / max(1, stats["rooms"])
+            print(f"{stats['rooms']} rooms, {stats['players']} players, "
+                  f"tick {stats['room_tick_ms_mean']:.3f} ms/room (max {stats['room_tick_ms_max']:.3f}), "
+                  f"{rate / 1024:.1f} KiB/s per room")
+            last_time, last_bytes = now, stats["bytes_sent"]
+
+    async def serve(self, report=True):
+        server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        self.started.set()
+        tasks = [server.serve_forever(), self.run_ticks()]
+        if report:
+            tasks.append(self.report_stats())
+        async with server:
+            await asyncio.gather(*tasks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maze Adventure authoritative race server")
+    parser.add_argument("--host", default=NetworkSettings.HOST)
+    parser.add_argument("--port", type=int, default=NetworkSettings.PORT)
+    parser.add_argument("--mazes", default=MAZE_FILE, help="maze pack every room races through")
+    args = parser.parse_args()
+
+    server = GameServer(args.host, args.port, args.mazes)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()